@@ -13,6 +13,8 @@ from datetime import datetime
 # Configuration base de données unifiée
 from config.database import init_database, get_db_session, database_health, close_database
 from models.ai_models import AISession, AgentMemory, AISuggestion, SemanticAnalysis, AIQueryCache, AIMetric
+from services.unified_db_service import unified_db
+from services.compression import install_flask_compression
 
 # Configuration de l'application Flask
 app = Flask(__name__)
@@ -24,6 +26,9 @@ if os.environ.get('FLASK_ENV') == 'development':
 else:
     CORS(app, origins=["*"])  # Permettre toutes les origines pour Cloud Run
 
+# Compression gzip/brotli des réponses JSON volumineuses
+install_flask_compression(app)
+
 # Configuration du logging pour Cloud Run
 logging.basicConfig(
     level=logging.INFO,
@@ -42,6 +47,8 @@ def initialize_app():
         if init_database():
             database_initialized = True
             logger.info("✅ Base de données PostgreSQL connectée")
+            # Écriture différée des métriques et compteurs
+            unified_db.start_background_flush()
         else:
             logger.error("❌ Erreur connexion PostgreSQL - Mode dégradé")
     return database_initialized
@@ -79,6 +86,7 @@ def health_check():
         'environment': os.environ.get('ENVIRONMENT', 'production'),
         'port': os.environ.get('PORT', '8081'),
         'database': db_status,
+        'query_cache': unified_db.get_query_cache_stats() if database_initialized else None,
         'features': {
             'postgresql': database_initialized,
             'ai_suggestions': True,
@@ -292,4 +300,6 @@ if __name__ == '__main__':
         app.run(host='0.0.0.0', port=port, debug=debug_mode)
     finally:
         # Nettoyage à la fermeture
+        if database_initialized:
+            unified_db.stop_background_flush()
         close_database()
@@ -0,0 +1,4 @@
+"""
+⏱️ BENCHMARKS DU SERVICE IA
+Générateur de missions synthétiques et mesure des latences par taille de mission
+"""
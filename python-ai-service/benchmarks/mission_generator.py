@@ -0,0 +1,198 @@
+"""
+🎲 GÉNÉRATEUR DE MISSIONS EBIOS RM SYNTHÉTIQUES
+Données Workshop 1 reproductibles (graine) avec descriptions réalistes en français:
+valeurs métier, biens essentiels rattachés, biens supports et événements redoutés
+"""
+
+import random
+from typing import Any, Dict, List, Optional
+
+# Répartition par défaut des éléments d'une mission (proportions d'un atelier 1 typique)
+DEFAULT_DISTRIBUTION = {
+    'business_values': 0.1,
+    'essential_assets': 0.25,
+    'supporting_assets': 0.4,
+    'dreaded_events': 0.25
+}
+
+SECTORS = [
+    "santé", "banque", "assurance", "énergie", "transport", "collectivité territoriale",
+    "industrie pharmaceutique", "commerce en ligne", "télécommunications", "défense"
+]
+
+BUSINESS_PROCESSES = [
+    "Facturation clients", "Gestion des dossiers patients", "Traitement des paiements",
+    "Pilotage de la production", "Relation client", "Gestion de la paie",
+    "Conformité réglementaire", "Logistique et approvisionnement", "Recherche et développement",
+    "Continuité d'activité", "Gestion des sinistres", "Octroi de crédits"
+]
+
+BUSINESS_OBJECTIVES = [
+    "garantir la continuité du service rendu aux usagers",
+    "respecter les obligations légales et contractuelles",
+    "préserver la confiance des clients et partenaires",
+    "maîtriser les délais de traitement des demandes",
+    "assurer la traçabilité des opérations sensibles",
+    "protéger le savoir-faire de l'entreprise"
+]
+
+INFORMATION_ASSETS = [
+    "Base de données clients", "Dossiers médicaux", "Données de facturation",
+    "Référentiel des fournisseurs", "Plans de fabrication", "Contrats commerciaux",
+    "Historique des transactions", "Données de paie", "Secrets industriels",
+    "Journaux d'audit", "Données de géolocalisation", "Annuaire des collaborateurs"
+]
+
+INFORMATION_QUALIFIERS = [
+    "contenant des données à caractère personnel",
+    "relevant du secret professionnel",
+    "servant au pilotage quotidien",
+    "faisant l'objet d'échanges avec des partenaires externes",
+    "relevant d'obligations d'archivage",
+    "faisant l'objet de mises à jour en temps réel par les équipes métier"
+]
+
+SUPPORTING_ASSETS = [
+    ("Serveur applicatif", "hébergé dans le centre de données principal"),
+    ("Cluster PostgreSQL", "répliqué sur deux sites"),
+    ("Poste de travail", "utilisé par les gestionnaires"),
+    ("Application mobile", "publiée sur les magasins d'applications"),
+    ("Réseau local", "segmenté par VLAN"),
+    ("Service cloud IaaS", "opéré par un prestataire externe"),
+    ("Annuaire Active Directory", "centralisant les comptes utilisateurs"),
+    ("Passerelle VPN", "utilisée pour le télétravail"),
+    ("Équipe d'exploitation", "assurant l'astreinte 24h/24"),
+    ("Prestataire d'infogérance", "ayant des accès administrateur"),
+    ("Sauvegardes hors ligne", "stockées sur bandes"),
+    ("API de paiement", "exposée aux partenaires")
+]
+
+DREADED_EVENTS = [
+    ("Fuite de {asset}", "Divulgation non autorisée de {asset_lower} à un tiers malveillant"),
+    ("Indisponibilité de {asset}", "Perte d'accès prolongée à {asset_lower} bloquant l'activité"),
+    ("Altération de {asset}", "Modification frauduleuse ou accidentelle de {asset_lower}"),
+    ("Destruction de {asset}", "Perte définitive de {asset_lower} sans restauration possible"),
+    ("Usurpation via {asset}", "Utilisation illégitime de {asset_lower} pour réaliser une fraude")
+]
+
+IMPACTS = [
+    "impact financier important", "atteinte à l'image de l'organisme",
+    "sanction de l'autorité de contrôle", "mise en danger des personnes",
+    "perte de clients", "interruption de la chaîne de production"
+]
+
+SECURITY_CRITERIA = ["confidentialité", "intégrité", "disponibilité", "traçabilité"]
+
+
+class MissionGenerator:
+    """Générateur déterministe de données Workshop 1 (même graine, mêmes données)"""
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+        self.random = random.Random(seed)
+
+    def split_counts(self, total_elements: int,
+                     distribution: Optional[Dict[str, float]] = None) -> Dict[str, int]:
+        """Répartit un nombre total d'éléments entre les catégories (au moins un par catégorie)"""
+        distribution = distribution or DEFAULT_DISTRIBUTION
+        counts = {category: max(1, int(total_elements * share)) for category, share in distribution.items()}
+        # Le reste d'arrondi va aux biens supports, la catégorie la plus nombreuse
+        counts['supporting_assets'] += max(0, total_elements - sum(counts.values()))
+        return counts
+
+    def generate_workshop_data(self, business_values: int = 2, essential_assets: int = 5,
+                               supporting_assets: int = 8, dreaded_events: int = 5) -> Dict[str, Any]:
+        """Données Workshop 1 avec le nombre d'éléments demandé par catégorie"""
+        sector = self.random.choice(SECTORS)
+        values = [self._business_value(index, sector) for index in range(business_values)]
+        essentials = [self._essential_asset(index, values) for index in range(essential_assets)]
+        supports = [self._supporting_asset(index, essentials) for index in range(supporting_assets)]
+        events = [self._dreaded_event(index, essentials) for index in range(dreaded_events)]
+
+        return {
+            'business_values': values,
+            'essential_assets': essentials,
+            'supporting_assets': supports,
+            'dreaded_events': events,
+            'current_step': 'dreaded-events',
+            'sector': sector
+        }
+
+    def generate_for_size(self, total_elements: int,
+                          distribution: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Données Workshop 1 d'environ `total_elements` éléments"""
+        return self.generate_workshop_data(**self.split_counts(total_elements, distribution))
+
+    def knowledge_query(self, workshop_data: Dict[str, Any]) -> str:
+        """Question RAG réaliste portant sur un élément de la mission"""
+        asset = self.random.choice(workshop_data['essential_assets'])
+        criterion = self.random.choice(SECURITY_CRITERIA)
+        return (f"Comment évaluer la gravité d'une atteinte à la {criterion} de "
+                f"« {asset['name']} » dans le secteur {workshop_data['sector']} ?")
+
+    @staticmethod
+    def flatten(workshop_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Liste plate des éléments (entrée de l'analyse sémantique)"""
+        return [
+            {**element, 'category': category}
+            for category in DEFAULT_DISTRIBUTION
+            for element in workshop_data.get(category, [])
+        ]
+
+    # === ÉLÉMENTS ===
+
+    def _business_value(self, index: int, sector: str) -> Dict[str, Any]:
+        process = self.random.choice(BUSINESS_PROCESSES)
+        return {
+            'id': f"bv{index + 1}",
+            'name': f"{process} ({sector})" if index >= len(BUSINESS_PROCESSES) else process,
+            'description': (f"{process} permettant de {self.random.choice(BUSINESS_OBJECTIVES)} "
+                            f"dans un organisme du secteur {sector}"),
+            'criticality': self.random.choice(['faible', 'moyenne', 'élevée', 'critique'])
+        }
+
+    def _essential_asset(self, index: int, values: List[Dict[str, Any]]) -> Dict[str, Any]:
+        name = self.random.choice(INFORMATION_ASSETS)
+        value = self.random.choice(values)
+        return {
+            'id': f"ea{index + 1}",
+            'name': name,
+            'description': (f"{name} {self.random.choice(INFORMATION_QUALIFIERS)}, "
+                            f"support du processus « {value['name']} »"),
+            'type': self.random.choice(['information', 'processus']),
+            'businessValueId': value['id'],
+            'securityNeeds': {
+                criterion: self.random.randint(1, 4) for criterion in SECURITY_CRITERIA
+            }
+        }
+
+    def _supporting_asset(self, index: int, essentials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        name, detail = self.random.choice(SUPPORTING_ASSETS)
+        linked = self.random.sample(essentials, k=min(len(essentials), self.random.randint(1, 3)))
+        return {
+            'id': f"sa{index + 1}",
+            'name': f"{name} {index + 1}",
+            'description': (f"{name} {detail}, traitant "
+                            + ", ".join(asset['name'].lower() for asset in linked)),
+            'type': self.random.choice(['matériel', 'logiciel', 'réseau', 'personnel', 'site', 'organisation']),
+            'essentialAssetId': linked[0]['id'],
+            'essentialAssetIds': [asset['id'] for asset in linked]
+        }
+
+    def _dreaded_event(self, index: int, essentials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        asset = self.random.choice(essentials)
+        name_template, description_template = self.random.choice(DREADED_EVENTS)
+        asset_name = asset['name'].lower()
+        impacts = self.random.sample(IMPACTS, k=2)
+        return {
+            'id': f"de{index + 1}",
+            'name': name_template.format(asset=asset_name),
+            'description': (description_template.format(asset_lower=asset_name)
+                            + f" ; conséquences: {impacts[0]}, {impacts[1]}"),
+            'essentialAssetId': asset['id'],
+            'businessValueId': asset['businessValueId'],
+            'gravity': self.random.randint(1, 4)
+        }
+
+
+__all__ = ['MissionGenerator', 'DEFAULT_DISTRIBUTION']
@@ -0,0 +1,284 @@
+"""
+⏱️ BENCHMARKS DU SERVICE IA
+Mesure analyze_ebios_elements, generate_ml_suggestions, query_ebios_knowledge
+et orchestrate_workshop_analysis sur des missions synthétiques de taille croissante
+
+Usage:
+    python -m benchmarks.runner run --sizes 10 100 1000 5000 --output benchmarks/results/run.json
+    python -m benchmarks.runner compare benchmarks/results/base.json benchmarks/results/run.json
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Exécution depuis python-ai-service/ ou depuis la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mission_generator import MissionGenerator
+from services.observability import process_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10, 100, 1000, 5000]
+PERCENTILES = (50, 90, 95, 99)
+RESULTS_FORMAT_VERSION = 1
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Percentile par interpolation linéaire (q entre 0 et 100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def latency_summary(durations_ms: List[float]) -> Dict[str, float]:
+    summary = {f"p{q}": round(percentile(durations_ms, q), 3) for q in PERCENTILES}
+    summary.update({
+        'min': round(min(durations_ms), 3),
+        'max': round(max(durations_ms), 3),
+        'mean': round(sum(durations_ms) / len(durations_ms), 3)
+    })
+    return summary
+
+
+class PeakRSSSampler:
+    """Pic de mémoire résidente pendant un bloc (échantillonnage depuis un thread)"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start_bytes = 0
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start_bytes = self.peak_bytes = process_rss_bytes()
+        self._thread = threading.Thread(target=self._sample, name='rss-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, process_rss_bytes())
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, process_rss_bytes())
+
+
+# === CIBLES ===
+
+BenchmarkTarget = Callable[[Dict[str, Any], Dict[str, Any], MissionGenerator], Awaitable[Any]]
+
+
+SERVICE_FACTORIES = {
+    'semantic': ('services.semantic_analyzer', 'SemanticAnalyzerFactory'),
+    'ml': ('services.ml_suggestion_engine', 'MLSuggestionEngineFactory'),
+    'rag': ('services.ebios_rag_service', 'EbiosRAGServiceFactory'),
+    'orchestrator': ('services.workshop1_orchestrator', 'Workshop1OrchestratorFactory')
+}
+
+
+def _create_services() -> Dict[str, Any]:
+    """Services réels créés via leurs factories (modes dégradés inclus, absents si non importables)"""
+    services = {}
+    for key, (module_name, factory_name) in SERVICE_FACTORIES.items():
+        try:
+            module = importlib.import_module(module_name)
+            services[key] = getattr(module, factory_name).create()
+        except Exception as e:
+            logger.warning(f"⚠️ Service {key} indisponible pour les benchmarks: {e}")
+    return services
+
+
+async def _semantic(services, workshop_data, generator):
+    return await services['semantic'].analyze_ebios_elements(MissionGenerator.flatten(workshop_data))
+
+
+async def _ml(services, workshop_data, generator):
+    return await services['ml'].generate_ml_suggestions(workshop_data)
+
+
+async def _rag(services, workshop_data, generator):
+    return await services['rag'].query_ebios_knowledge(generator.knowledge_query(workshop_data))
+
+
+async def _orchestration(services, workshop_data, generator):
+    return await services['orchestrator'].orchestrate_workshop_analysis(
+        mission_id=f"bench-{generator.seed}", workshop_data=workshop_data
+    )
+
+
+TARGETS: Dict[str, BenchmarkTarget] = {
+    'analyze_ebios_elements': _semantic,
+    'generate_ml_suggestions': _ml,
+    'query_ebios_knowledge': _rag,
+    'orchestrate_workshop_analysis': _orchestration
+}
+
+# Service requis par chaque cible
+TARGET_SERVICES = {
+    'analyze_ebios_elements': 'semantic',
+    'generate_ml_suggestions': 'ml',
+    'query_ebios_knowledge': 'rag',
+    'orchestrate_workshop_analysis': 'orchestrator'
+}
+
+
+# === EXÉCUTION ===
+
+async def run_benchmarks(sizes: List[int], target_names: List[str], iterations: int = 5,
+                         warmup: int = 1, seed: int = 42,
+                         services: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Exécute chaque cible pour chaque taille et retourne les résultats sérialisables"""
+    services = services or _create_services()
+    skipped = [name for name in target_names if TARGET_SERVICES[name] not in services]
+    target_names = [name for name in target_names if name not in skipped]
+    results = []
+
+    for size in sizes:
+        generator = MissionGenerator(seed)
+        workshop_data = generator.generate_for_size(size)
+
+        for name in target_names:
+            target = TARGETS[name]
+            for _ in range(warmup):
+                await target(services, workshop_data, generator)
+
+            durations_ms = []
+            with PeakRSSSampler() as rss:
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    await target(services, workshop_data, generator)
+                    durations_ms.append((time.perf_counter() - start) * 1000)
+
+            entry = {
+                'target': name,
+                'size': size,
+                'iterations': iterations,
+                'latency_ms': latency_summary(durations_ms),
+                'peak_rss_mb': round(rss.peak_bytes / (1024 * 1024), 1),
+                'rss_growth_mb': round((rss.peak_bytes - rss.start_bytes) / (1024 * 1024), 1)
+            }
+            results.append(entry)
+            logger.warning(f"⏱️ {name} [{size}] p50={entry['latency_ms']['p50']:.1f} ms "
+                           f"p95={entry['latency_ms']['p95']:.1f} ms pic RSS={entry['peak_rss_mb']} MB")
+
+    return {
+        'version': RESULTS_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'seed': seed,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'skipped_targets': skipped,
+        'results': results
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.2,
+                    metrics: tuple = ('p50', 'p95')) -> List[Dict[str, Any]]:
+    """
+    Compare deux exécutions (même cible, même taille)
+    Retourne une ligne par métrique, marquée 'regression' au-delà du seuil relatif
+    """
+    reference = {(entry['target'], entry['size']): entry for entry in baseline['results']}
+    comparison = []
+
+    for entry in current['results']:
+        base = reference.get((entry['target'], entry['size']))
+        if base is None:
+            continue
+        for metric in metrics:
+            before = base['latency_ms'][metric]
+            after = entry['latency_ms'][metric]
+            change = (after - before) / before if before else 0.0
+            comparison.append({
+                'target': entry['target'],
+                'size': entry['size'],
+                'metric': metric,
+                'baseline_ms': before,
+                'current_ms': after,
+                'change': round(change, 4),
+                'regression': change > threshold
+            })
+
+    return comparison
+
+
+def _print_comparison(comparison: List[Dict[str, Any]], threshold: float) -> bool:
+    regressions = [row for row in comparison if row['regression']]
+    for row in comparison:
+        marker = "❌" if row['regression'] else "✅"
+        print(f"{marker} {row['target']:<32} {row['size']:>6} {row['metric']:<4} "
+              f"{row['baseline_ms']:>10.1f} -> {row['current_ms']:>10.1f} ms ({row['change']:+.1%})")
+    print(f"\n📊 {len(regressions)} régression(s) au-delà de {threshold:.0%}")
+    return not regressions
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, encoding='utf-8') as results_file:
+        return json.load(results_file)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks du service IA EBIOS RM")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Exécute les benchmarks")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    run_parser.add_argument('--targets', nargs='+', choices=list(TARGETS), default=list(TARGETS))
+    run_parser.add_argument('--iterations', type=int, default=5)
+    run_parser.add_argument('--warmup', type=int, default=1)
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--output', help="Fichier JSON des résultats")
+    run_parser.add_argument('--baseline', help="Résultats de référence à comparer après l'exécution")
+    run_parser.add_argument('--threshold', type=float, default=0.2)
+
+    compare_parser = subparsers.add_parser('compare', help="Compare deux fichiers de résultats")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.2)
+
+    args = parser.parse_args(argv)
+    # Les services journalisent chaque appel: seuls les avertissements restent visibles
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    if args.command == 'compare':
+        comparison = compare_results(_load(args.baseline), _load(args.current), args.threshold)
+        return 0 if _print_comparison(comparison, args.threshold) else 1
+
+    current = asyncio.run(run_benchmarks(
+        args.sizes, args.targets, iterations=args.iterations, warmup=args.warmup, seed=args.seed
+    ))
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(current, output, indent=2, ensure_ascii=False)
+        print(f"💾 Résultats enregistrés: {args.output}")
+
+    if args.baseline:
+        comparison = compare_results(_load(args.baseline), current, args.threshold)
+        return 0 if _print_comparison(comparison, args.threshold) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,8 @@
 Configuration PostgreSQL pour le service Python AI
 """
 
+import asyncio
+import functools
 import os
 import logging
 import time
@@ -10,14 +12,38 @@ from typing import Optional
 from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
+
+from config.pool_monitor import PoolMonitor, InstrumentedQueuePool
 
 logger = logging.getLogger(__name__)
 
+try:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    ASYNC_SQLALCHEMY_AVAILABLE = True
+except ImportError:
+    ASYNC_SQLALCHEMY_AVAILABLE = False
+    logger.warning("🔧 SQLAlchemy asyncio non disponible, sessions synchrones uniquement")
+
 # Base pour les modèles SQLAlchemy
 Base = declarative_base()
 
+def get_worker_count() -> int:
+    """Nombre de workers du serveur (un pool de connexions par worker)"""
+    return max(1, int(os.getenv('WEB_CONCURRENCY') or os.getenv('MAX_WORKERS') or '1'))
+
+# Taille de pool historique (un seul worker), conservée tant que le budget le permet
+DEFAULT_POOL_SIZE = 5
+
+def pool_budget() -> int:
+    """Connexions disponibles par worker: budget de l'instance réparti entre les workers"""
+    max_connections = int(os.getenv('DB_MAX_CONNECTIONS', '10'))
+    return max(2, max_connections // get_worker_count())
+
+def default_pool_size() -> int:
+    """Taille de pool par worker: 5 comme auparavant, réduite si le budget par worker est plus petit"""
+    return min(DEFAULT_POOL_SIZE, pool_budget())
+
 class DatabaseConfig:
     """Configuration unifiée de la base de données"""
     
@@ -30,32 +56,41 @@ class DatabaseConfig:
         self.db_password = os.getenv('DB_PASSWORD', 'postgres')
         
         # URL de connexion
-        self.database_url = f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+        credentials = f"{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+        self.database_url = f"postgresql://{credentials}"
+        self.async_database_url = f"postgresql+asyncpg://{credentials}"
         
-        # Configuration du pool de connexions
-        self.pool_size = int(os.getenv('DB_POOL_SIZE', '5'))
+        # Configuration du pool de connexions (par worker, voir default_pool_size)
+        self.pool_size = int(os.getenv('DB_POOL_SIZE') or default_pool_size())
         self.max_overflow = int(os.getenv('DB_MAX_OVERFLOW', '10'))
         self.pool_timeout = int(os.getenv('DB_POOL_TIMEOUT', '30'))
         self.pool_recycle = int(os.getenv('DB_POOL_RECYCLE', '3600'))
+        self.async_pool_size = int(os.getenv('DB_ASYNC_POOL_SIZE') or self.pool_size)
+        
+        # Instrumentation du pool et taille adaptative (off | recommend | adjust)
+        self.pool_monitor = PoolMonitor(
+            slow_query_ms=float(os.getenv('DB_SLOW_QUERY_MS', '500')),
+            wait_target_ms=float(os.getenv('DB_POOL_WAIT_TARGET_MS', '5'))
+        )
+        self.pool_adaptive_mode = os.getenv('DB_POOL_ADAPTIVE', 'off').lower()
+        self.pool_adapt_interval = float(os.getenv('DB_POOL_ADAPT_INTERVAL_SECONDS', '300'))
+        self.pool_min_size = int(os.getenv('DB_POOL_MIN_SIZE', '2'))
+        self.pool_max_size = int(os.getenv('DB_POOL_MAX_SIZE') or max(self.pool_size, pool_budget()))
         
         # Engine SQLAlchemy
         self.engine = None
         self.SessionLocal = None
         
+        # Engine asynchrone (asyncpg) pour l'application FastAPI
+        self.async_engine = None
+        self.AsyncSessionLocal = None
+        
     def initialize(self):
         """Initialise la connexion à la base de données"""
         try:
             logger.info(f"🔗 Connexion à PostgreSQL: {self.db_host}:{self.db_port}/{self.db_name}")
             
-            self.engine = create_engine(
-                self.database_url,
-                poolclass=QueuePool,
-                pool_size=self.pool_size,
-                max_overflow=self.max_overflow,
-                pool_timeout=self.pool_timeout,
-                pool_recycle=self.pool_recycle,
-                echo=os.getenv('DB_ECHO', 'false').lower() == 'true'
-            )
+            self.engine = self._create_engine(self.pool_size)
             
             # Test de connexion
             with self.engine.connect() as conn:
@@ -77,6 +112,52 @@ class DatabaseConfig:
             logger.error(f"❌ Erreur connexion base de données: {e}")
             return False
     
+    def _create_engine(self, pool_size: int):
+        """Engine synchrone avec pool instrumenté"""
+        engine = create_engine(
+            self.database_url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            echo=os.getenv('DB_ECHO', 'false').lower() == 'true'
+        )
+        self.pool_monitor.attach(engine)
+        return engine
+    
+    def adapt_pool(self) -> Optional[dict]:
+        """
+        Évalue la taille du pool à la fin de chaque fenêtre (DB_POOL_ADAPT_INTERVAL_SECONDS)
+        recommend: journalise la recommandation; adjust: remplace l'engine par un pool redimensionné
+        """
+        if self.pool_adaptive_mode not in ('recommend', 'adjust') or not self.engine:
+            return None
+        if self.pool_monitor.window_age() < self.pool_adapt_interval:
+            return None
+        
+        recommendation = self.pool_monitor.evaluate(self.pool_size, self.pool_min_size, self.pool_max_size)
+        new_size = recommendation['recommended_size']
+        if new_size == self.pool_size:
+            return recommendation
+        
+        logger.info(
+            f"📊 Pool PostgreSQL: taille recommandée {new_size} (actuelle {self.pool_size}, "
+            f"{recommendation['reason']}, attente p95 {recommendation['window_wait_p95_ms']} ms)"
+        )
+        
+        if self.pool_adaptive_mode == 'adjust':
+            # Les nouvelles sessions utilisent le nouvel engine; les connexions empruntées
+            # à l'ancien pool sont fermées à leur restitution
+            old_engine = self.engine
+            self.engine = self._create_engine(new_size)
+            self.SessionLocal.configure(bind=self.engine)
+            self.pool_size = new_size
+            old_engine.dispose()
+            recommendation['applied'] = True
+        
+        return recommendation
+    
     @contextmanager
     def get_session(self):
         """Context manager pour les sessions de base de données"""
@@ -94,6 +175,59 @@ class DatabaseConfig:
         finally:
             session.close()
     
+    async def initialize_async(self) -> bool:
+        """Initialise l'engine asynchrone (asyncpg) à côté de l'engine synchrone"""
+        if not ASYNC_SQLALCHEMY_AVAILABLE:
+            return False
+        
+        try:
+            logger.info(f"🔗 Connexion asynchrone à PostgreSQL: {self.db_host}:{self.db_port}/{self.db_name}")
+            
+            self.async_engine = create_async_engine(
+                self.async_database_url,
+                pool_size=self.async_pool_size,
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+                pool_recycle=self.pool_recycle,
+                pool_pre_ping=True,
+                echo=os.getenv('DB_ECHO', 'false').lower() == 'true'
+            )
+            
+            # Test de connexion
+            async with self.async_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            
+            self.AsyncSessionLocal = async_sessionmaker(
+                self.async_engine,
+                class_=AsyncSession,
+                autoflush=False,
+                expire_on_commit=False
+            )
+            
+            logger.info(f"✅ Engine asynchrone initialisé (pool: {self.async_pool_size}, workers: {get_worker_count()})")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur connexion asynchrone base de données: {e}")
+            self.async_engine = None
+            self.AsyncSessionLocal = None
+            return False
+    
+    @asynccontextmanager
+    async def get_async_session(self):
+        """Context manager pour les sessions asynchrones"""
+        if not self.AsyncSessionLocal:
+            raise RuntimeError("Base de données asynchrone non initialisée")
+        
+        async with self.AsyncSessionLocal() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"❌ Erreur session asynchrone base de données: {e}")
+                raise
+    
     def get_session_sync(self) -> Session:
         """Obtient une session synchrone (à fermer manuellement)"""
         if not self.SessionLocal:
@@ -122,6 +256,8 @@ class DatabaseConfig:
                     'status': 'healthy',
                     'response_time_ms': round(response_time, 2),
                     'pool_stats': pool_stats,
+                    'pool_metrics': self.pool_monitor.snapshot(),
+                    'pool_adaptive_mode': self.pool_adaptive_mode,
                     'database': self.db_name,
                     'host': self.db_host
                 }
@@ -138,6 +274,12 @@ class DatabaseConfig:
         if self.engine:
             self.engine.dispose()
             logger.info("🔒 Connexions base de données fermées")
+    
+    async def close_async(self):
+        """Ferme les connexions de l'engine asynchrone"""
+        if self.async_engine:
+            await self.async_engine.dispose()
+            logger.info("🔒 Connexions asynchrones base de données fermées")
 
 # Instance globale
 db_config = DatabaseConfig()
@@ -154,10 +296,49 @@ def get_db_session_sync():
     """Obtient une session synchrone"""
     return db_config.get_session_sync()
 
+def database_initialized() -> bool:
+    """Engine synchrone initialisé (init_database réussi)"""
+    return db_config.SessionLocal is not None
+
+def async_database_initialized() -> bool:
+    """Engine asynchrone initialisé (DB_ASYNC_ENABLED et init_async_database réussi)"""
+    return db_config.AsyncSessionLocal is not None
+
+def sync_fallback(sync_method_name: str):
+    """
+    Décorateur des variantes asynchrones d'un service: sans engine asynchrone
+    (DB_ASYNC_ENABLED=false, échec asyncpg), la méthode synchrone `sync_method_name`
+    s'exécute dans un thread plutôt que de bloquer la boucle d'événements
+    """
+    def decorator(async_method):
+        @functools.wraps(async_method)
+        async def wrapper(self, *args, **kwargs):
+            if not async_database_initialized():
+                return await asyncio.to_thread(getattr(self, sync_method_name), *args, **kwargs)
+            return await async_method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+async def init_async_database():
+    """Initialise l'engine asynchrone"""
+    return await db_config.initialize_async()
+
+def get_async_db_session():
+    """Obtient une session asynchrone (async with)"""
+    return db_config.get_async_session()
+
+async def close_async_database():
+    """Ferme l'engine asynchrone"""
+    await db_config.close_async()
+
 def close_database():
     """Ferme la base de données"""
     db_config.close()
 
+def adapt_database_pool():
+    """Évalue (et ajuste selon DB_POOL_ADAPTIVE) la taille du pool"""
+    return db_config.adapt_pool()
+
 def database_health():
     """Vérifie l'état de la base de données"""
     return db_config.health_check()
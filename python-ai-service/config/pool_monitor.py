@@ -0,0 +1,291 @@
+"""
+📊 INSTRUMENTATION DU POOL DE CONNEXIONS
+Attente au checkout, durée d'emprunt, âge des connexions, débordements,
+requêtes lentes par empreinte, et recommandation de taille de pool
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from utils.stats import MetricBucket
+
+logger = logging.getLogger(__name__)
+
+# Normalisation des requêtes: littéraux et listes de paramètres remplacés
+_NAMED_PARAMETER = re.compile(r"%\(\w+\)s")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|%s|:\w+|\$\d+)"
+_PLACEHOLDER_LIST = re.compile(
+    rf"\(\s*(?:{_PLACEHOLDER}|\((?:[^()]*)\))(?:\s*,\s*(?:{_PLACEHOLDER}|\((?:[^()]*)\)))*\s*\)"
+)
+_ROW = r"\((?:[^()]|\([^()]*\))*\)"
+_VALUES_LIST = re.compile(rf"\bVALUES\s*{_ROW}(?:\s*,\s*{_ROW})*", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+MAX_TRACKED_FINGERPRINTS = 200
+
+
+def normalize_statement(statement: str) -> str:
+    """Forme normalisée d'une requête (indépendante des valeurs et de la taille des listes)"""
+    normalized = _NAMED_PARAMETER.sub('?', statement)
+    normalized = _STRING_LITERAL.sub('?', normalized)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _VALUES_LIST.sub('VALUES (...)', normalized)
+    normalized = _PLACEHOLDER_LIST.sub('(...)', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+def statement_fingerprint(statement: str) -> str:
+    """Empreinte courte d'une requête normalisée"""
+    return hashlib.sha1(normalize_statement(statement).encode()).hexdigest()[:12]
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool qui mesure l'attente de connexion (aucun événement SQLAlchemy ne la couvre)"""
+
+    monitor: Optional['PoolMonitor'] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            if self.monitor:
+                self.monitor.record_timeout(time.perf_counter() - start)
+            raise
+
+        if self.monitor:
+            self.monitor.record_wait(time.perf_counter() - start, overflow=self.checkedout() > self.size())
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
+
+
+class PoolMonitor:
+    """
+    Métriques du pool alimentées par les événements SQLAlchemy
+    - attente au checkout (InstrumentedQueuePool), durée d'emprunt (checkout -> checkin)
+    - âge des connexions au checkout, débordements et timeouts
+    - requêtes lentes regroupées par empreinte
+    - fenêtre glissante (concurrence maximale, attente p95) pour la taille de pool adaptative
+    - observateurs notifiés de chaque mesure (exposition Prometheus: services.observability.PoolMetrics)
+    """
+
+    def __init__(self, slow_query_ms: float = 500.0, wait_target_ms: float = 5.0):
+        self.slow_query_ms = slow_query_ms
+        self.wait_target_ms = wait_target_ms
+        self._lock = threading.Lock()
+
+        self.wait_ms = MetricBucket()
+        self.checkout_ms = MetricBucket()
+        self.connection_age_s = MetricBucket()
+        self.query_ms = MetricBucket()
+        self.timeouts = 0
+        self.overflow_checkouts = 0
+        self.connections_created = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.slow_queries: Dict[str, Dict[str, Any]] = {}
+        self.last_recommendation: Optional[Dict[str, Any]] = None
+        self._observers: List[Any] = []
+
+        self._reset_window()
+
+    def _reset_window(self):
+        self._window_start = time.monotonic()
+        self._window_wait_ms = MetricBucket()
+        self._window_peak = self.in_use
+        self._window_timeouts = 0
+
+    # === ENREGISTREMENT ===
+
+    def attach(self, engine):
+        """Branche les événements du pool et de l'engine"""
+        if isinstance(engine.pool, InstrumentedQueuePool):
+            engine.pool.monitor = self
+
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def add_observer(self, observer):
+        """
+        Exporteur des mesures: observe_wait(seconds, overflow), observe_timeout(seconds),
+        observe_checkout(seconds), observe_slow_query(seconds)
+        """
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    def record_wait(self, seconds: float, overflow: bool = False):
+        elapsed_ms = seconds * 1000
+        with self._lock:
+            self.wait_ms.add(elapsed_ms)
+            self._window_wait_ms.add(elapsed_ms)
+            if overflow:
+                self.overflow_checkouts += 1
+        for observer in self._observers:
+            observer.observe_wait(seconds, overflow)
+
+    def record_timeout(self, seconds: float):
+        with self._lock:
+            self.timeouts += 1
+            self._window_timeouts += 1
+            self.wait_ms.add(seconds * 1000)
+            self._window_wait_ms.add(seconds * 1000)
+        for observer in self._observers:
+            observer.observe_timeout(seconds)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        connection_record.info['created_at'] = time.time()
+        with self._lock:
+            self.connections_created += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info['checkout_at'] = time.perf_counter()
+        created_at = connection_record.info.get('created_at')
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self._window_peak = max(self._window_peak, self.in_use)
+            if created_at is not None:
+                self.connection_age_s.add(time.time() - created_at)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checkout_at = connection_record.info.pop('checkout_at', None)
+        if checkout_at is None:
+            return
+        seconds = time.perf_counter() - checkout_at
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+            self.checkout_ms.add(seconds * 1000)
+        for observer in self._observers:
+            observer.observe_checkout(seconds)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Début porté par le contexte d'exécution: rien ne subsiste sur la connexion si l'exécution échoue
+        if context is not None:
+            context._pool_monitor_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_pool_monitor_start', None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self.query_ms.add(elapsed_ms)
+        if elapsed_ms >= self.slow_query_ms:
+            self._record_slow_query(statement, elapsed_ms)
+
+    def _record_slow_query(self, statement: str, elapsed_ms: float):
+        for observer in self._observers:
+            observer.observe_slow_query(elapsed_ms / 1000)
+
+        normalized = normalize_statement(statement)
+        fingerprint = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+        with self._lock:
+            stats = self.slow_queries.get(fingerprint)
+            if stats is None:
+                if len(self.slow_queries) >= MAX_TRACKED_FINGERPRINTS:
+                    # Oublier l'empreinte la moins coûteuse pour rester borné
+                    cheapest = min(self.slow_queries, key=lambda key: self.slow_queries[key]['total_ms'])
+                    del self.slow_queries[cheapest]
+                stats = self.slow_queries[fingerprint] = {
+                    'statement': normalized[:500], 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0
+                }
+            stats['count'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+        logger.warning(f"🐢 Requête lente [{fingerprint}] {elapsed_ms:.0f} ms: {normalized[:200]}")
+
+    # === TAILLE ADAPTATIVE ===
+
+    def window_age(self) -> float:
+        return time.monotonic() - self._window_start
+
+    def evaluate(self, current_size: int, min_size: int, max_size: int,
+                 min_checkouts: int = 20) -> Dict[str, Any]:
+        """
+        Recommande une taille de pool depuis la fenêtre écoulée, puis ouvre une nouvelle fenêtre
+        - attente p95 au-dessus de la cible ou timeouts: agrandir jusqu'à la concurrence observée
+        - concurrence maximale bien en dessous de la taille: réduire à peak + 1
+        """
+        with self._lock:
+            window_wait = self._window_wait_ms
+            peak = self._window_peak
+            timeouts = self._window_timeouts
+            window_seconds = self.window_age()
+            self._reset_window()
+
+        wait_p95 = window_wait.quantile(0.95)
+        recommended = current_size
+        reason = 'stable'
+
+        if window_wait.count >= min_checkouts or timeouts:
+            if timeouts or wait_p95 > self.wait_target_ms:
+                recommended = min(max_size, max(current_size + 1, peak))
+                reason = 'contention'
+            elif peak + 1 < current_size // 2:
+                recommended = max(min_size, peak + 1)
+                reason = 'underused'
+
+        self.last_recommendation = {
+            'current_size': current_size,
+            'recommended_size': recommended,
+            'reason': reason,
+            'window_seconds': round(window_seconds, 1),
+            'window_checkouts': window_wait.count,
+            'window_peak_in_use': peak,
+            'window_wait_p95_ms': round(wait_p95, 3),
+            'window_timeouts': timeouts
+        }
+        return self.last_recommendation
+
+    # === EXPOSITION ===
+
+    @staticmethod
+    def _summary(bucket: MetricBucket) -> Dict[str, Any]:
+        summary = bucket.to_dict()
+        summary.pop('histogram_log2')
+        if not bucket.count:
+            summary['min'] = summary['max'] = 0.0
+        return summary
+
+    def snapshot(self, top_slow_queries: int = 10) -> Dict[str, Any]:
+        """Métriques cumulées du pool (pour health check et exposition)"""
+        with self._lock:
+            slow = sorted(self.slow_queries.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+            return {
+                'wait_ms': self._summary(self.wait_ms),
+                'wait_histogram_log2_ms': self.wait_ms.to_dict()['histogram_log2'],
+                'checkout_ms': self._summary(self.checkout_ms),
+                'connection_age_s': self._summary(self.connection_age_s),
+                'query_ms': self._summary(self.query_ms),
+                'timeouts': self.timeouts,
+                'overflow_checkouts': self.overflow_checkouts,
+                'connections_created': self.connections_created,
+                'in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'slow_queries': [
+                    {'fingerprint': fingerprint, **stats} for fingerprint, stats in slow[:top_slow_queries]
+                ],
+                'recommendation': self.last_recommendation
+            }
+
+
+__all__ = ['PoolMonitor', 'InstrumentedQueuePool', 'normalize_statement', 'statement_fingerprint']
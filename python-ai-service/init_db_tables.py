@@ -126,12 +126,19 @@ def create_ai_tables():
     CREATE INDEX IF NOT EXISTS idx_agent_memory_agent_type ON agent_memory(agent_type);
     CREATE INDEX IF NOT EXISTS idx_agent_memory_memory_type ON agent_memory(memory_type);
     CREATE INDEX IF NOT EXISTS idx_agent_memory_relevance ON agent_memory(relevance_score);
+    -- Clé de tri NULL-safe de utils/keyset.py (keyset_order_by)
+    CREATE INDEX IF NOT EXISTS idx_agent_memory_mission_agent_relevance
+        ON agent_memory(mission_id, agent_type, coalesce(relevance_score, -1.0) DESC,
+                        coalesce(created_at, '1970-01-01 00:00:00+00:00') DESC, id DESC);
 
     CREATE INDEX IF NOT EXISTS idx_ai_suggestions_mission_id ON ai_suggestions(mission_id);
     CREATE INDEX IF NOT EXISTS idx_ai_suggestions_workshop_id ON ai_suggestions(workshop_id);
     CREATE INDEX IF NOT EXISTS idx_ai_suggestions_user_id ON ai_suggestions(user_id);
     CREATE INDEX IF NOT EXISTS idx_ai_suggestions_type ON ai_suggestions(suggestion_type);
     CREATE INDEX IF NOT EXISTS idx_ai_suggestions_confidence ON ai_suggestions(confidence_score);
+    CREATE INDEX IF NOT EXISTS idx_ai_suggestions_mission_confidence
+        ON ai_suggestions(mission_id, coalesce(confidence_score, -1.0) DESC,
+                          coalesce(created_at, '1970-01-01 00:00:00+00:00') DESC, id DESC);
 
     CREATE INDEX IF NOT EXISTS idx_semantic_analyses_mission_id ON semantic_analyses(mission_id);
     CREATE INDEX IF NOT EXISTS idx_semantic_analyses_content_hash ON semantic_analyses(content_hash);
@@ -139,6 +146,7 @@ def create_ai_tables():
 
     CREATE INDEX IF NOT EXISTS idx_ai_query_cache_hash ON ai_query_cache(query_hash);
     CREATE INDEX IF NOT EXISTS idx_ai_query_cache_expires_at ON ai_query_cache(expires_at);
+    CREATE INDEX IF NOT EXISTS idx_ai_query_cache_eviction ON ai_query_cache(hit_count, last_accessed);
 
     CREATE INDEX IF NOT EXISTS idx_ai_metrics_type_service ON ai_metrics(metric_type, service_name);
     CREATE INDEX IF NOT EXISTS idx_ai_metrics_recorded_at ON ai_metrics(recorded_at);
@@ -3,32 +3,119 @@
 Service Python pour l'intégration IA avancée dans Workshop 1
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request, Response, Header, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
 import uvicorn
+import asyncio
 import logging
+import time
 from datetime import datetime
 import os
 from dotenv import load_dotenv
 
-# Import des services IA (version simplifiée)
-try:
-    from services.workshop1_ai_service import Workshop1AIService
-    from services.suggestion_engine import SuggestionEngine
-    SERVICES_AVAILABLE = True
-except ImportError:
-    SERVICES_AVAILABLE = False
-    print("⚠️ Services IA non disponibles, mode simulation activé")
+from services.observability import (
+    PrometheusMiddleware, CONTENT_TYPE_LATEST, render_metrics, format_memory_usage, process_memory
+)
+from services.profiling import profiling_service, ProfilerBusyError
+from services.service_registry import ServiceRegistry, ServiceNotReadyError
+from services.job_queue import JobQueue, JobNotFoundError, FINISHED_STATES
+from services.fast_json import FastJSONResponse, MATRIX_ENCODINGS, MATRIX_LIST, dumps as dumps_json
+from services.etag import compute_etag, etag_matches, cache_headers, not_modified
+from services.admission_control import AdmissionController, AdmissionRejected, LIGHT, HEAVY, INGESTION
+from services.compression import CompressionMiddleware
+import hmac
 
 # Configuration
 load_dotenv()
 
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# === CHARGEMENT DIFFÉRÉ DES SERVICES IA ===
+# Imports et constructions lourds (SentenceTransformer, GPT-2, orchestrateur) exécutés
+# en arrière-plan après le démarrage, par priorité croissante
+
+def _load_memory_service():
+    from services.agent_memory_service import AgentMemoryServiceFactory
+    return AgentMemoryServiceFactory.create()
+
+def _load_suggestion_engine():
+    from services.suggestion_engine import SuggestionEngine
+    return SuggestionEngine()
+
+def _load_workshop1_service():
+    from services.workshop1_ai_service import Workshop1AIService
+    return Workshop1AIService()
+
+def _load_orchestrator():
+    from services.workshop1_orchestrator import Workshop1OrchestratorFactory
+    return Workshop1OrchestratorFactory.create()
+
+def _start_memory_sweeper(memory_service):
+    memory_service.start_expiry_sweeper(
+        interval_seconds=float(os.getenv("MEMORY_SWEEP_INTERVAL_SECONDS", "300"))
+    )
+
+service_registry = ServiceRegistry()
+# memory_service ouvre Redis et la base: chargé dans chaque worker, jamais avant fork (serve.py)
+service_registry.register("memory_service", _load_memory_service, priority=10,
+                          expected_seconds=2, on_ready=_start_memory_sweeper, preload=False)
+service_registry.register("suggestions", _load_suggestion_engine, priority=20, expected_seconds=2)
+service_registry.register("workshop1_ai", _load_workshop1_service, priority=30, expected_seconds=30)
+service_registry.register("orchestrator", _load_orchestrator, priority=40, expected_seconds=60)
+
+DB_ENABLED = os.getenv("DB_ENABLED", "false").lower() == "true"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Démarrage immédiat (liveness), services chargés en arrière-plan"""
+    # Base unifiée PostgreSQL (métriques, cache de requêtes) et son écriture différée
+    if DB_ENABLED:
+        from config.database import init_database
+        from services.unified_db_service import unified_db
+
+        if await asyncio.to_thread(init_database):
+            unified_db.start_background_flush()
+
+    # Engine asynchrone pour les accès base de données depuis la boucle d'événements
+    if os.getenv("DB_ASYNC_ENABLED", "false").lower() == "true":
+        from config.database import init_async_database
+        await init_async_database()
+
+    service_registry.start()
+    job_queue.start()
+    yield
+
+    await job_queue.stop()
+    await service_registry.stop()
+    memory_service = service_registry.peek("memory_service")
+    if memory_service:
+        await memory_service.stop_expiry_sweeper()
+
+    if os.getenv("DB_ASYNC_ENABLED", "false").lower() == "true":
+        from config.database import close_async_database
+        await close_async_database()
+
+    if DB_ENABLED:
+        from config.database import close_database
+        from services.unified_db_service import unified_db
+
+        # Dernière écriture des tampons avant la fermeture du pool
+        await asyncio.to_thread(unified_db.stop_background_flush)
+        close_database()
+
 app = FastAPI(
     title="EBIOS AI Manager - Python Service",
     description="Service IA avancé pour l'assistance Workshop 1 EBIOS RM",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Configuration CORS pour l'intégration avec le frontend React
@@ -40,31 +127,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-# Initialisation sécurisée des services IA
-try:
-    from services.workshop1_ai_service import Workshop1AIService
-    from services.suggestion_engine import SuggestionEngine
-    from services.workshop1_orchestrator import Workshop1OrchestratorFactory
-    from services.agent_memory_service import AgentMemoryServiceFactory
-
-    # Services principaux
-    workshop1_service = Workshop1AIService()
-    suggestion_engine = SuggestionEngine()
-
-    # Nouveaux services avancés (additifs)
-    workshop1_orchestrator = Workshop1OrchestratorFactory.create()
-    memory_service = AgentMemoryServiceFactory.create()
-
-    logger.info("✅ Services IA avancés initialisés")
-    ADVANCED_SERVICES_AVAILABLE = True
+# gzip/brotli selon Accept-Encoding (sous Prometheus: la latence mesurée inclut la compression)
+app.add_middleware(CompressionMiddleware)
 
-except ImportError as e:
-    logger.warning(f"⚠️ Services avancés non disponibles: {e}")
-    ADVANCED_SERVICES_AVAILABLE = False
+# Latence par route exposée sur /metrics
+app.add_middleware(PrometheusMiddleware)
 
 # Services temporaires pour les tests (fallback)
 class MockAIService:
@@ -76,17 +143,115 @@ class MockAIService:
     def get_memory_usage(self): return "0 MB"
     def get_capabilities(self): return {"mock": True}
 
-# Initialisation des services avec fallback
-if not ADVANCED_SERVICES_AVAILABLE:
-    workshop1_service = MockAIService()
-    suggestion_engine = MockAIService()
-    workshop1_orchestrator = MockAIService()
-    memory_service = MockAIService()
-
 # Services de compatibilité
-guidance_service = MockAIService()
 coherence_analyzer = MockAIService()
 
+# === FILE DE TÂCHES ===
+# Tâches longues hors du cycle requête/réponse (persistées, reprises après redémarrage)
+
+AUTO_COMPLETE_JOB = "workshop1.auto_complete"
+
+async def _wait_for_service(name: str):
+    """Instance du service, en attendant la fin de son chargement (tâches reprises au démarrage)"""
+    while True:
+        try:
+            return service_registry.get(name)
+        except ServiceNotReadyError as e:
+            if e.retry_after is None:
+                raise
+            await asyncio.sleep(min(e.retry_after, 5))
+
+async def _run_auto_complete(payload: Dict[str, Any], job):
+    workshop1_service = await _wait_for_service("workshop1_ai")
+    await job.report_async(0.1, "Auto-complétion en cours...")
+    return await workshop1_service.auto_complete_workshop(**payload)
+
+job_queue = JobQueue()
+job_queue.register(AUTO_COMPLETE_JOB, _run_auto_complete)
+
+def require_service(name: str):
+    """Dépendance FastAPI: service prêt, ou 503 (avec Retry-After pendant le chargement)"""
+    def dependency():
+        try:
+            return service_registry.get(name)
+        except ServiceNotReadyError as e:
+            if e.retry_after is None:
+                raise HTTPException(status_code=503, detail=f"Service {name} non disponible")
+            raise HTTPException(
+                status_code=503,
+                detail=f"Service {name} en cours de chargement",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+    return dependency
+
+# === CONTRÔLE D'ADMISSION ===
+# Concurrence bornée par classe d'endpoint: une rafale d'orchestrations ne dégrade pas
+# la latence des requêtes légères, et le surplus est rejeté vite plutôt que servi tard
+
+admission_controller = AdmissionController()
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return FastJSONResponse(
+        {"detail": exc.detail, "reason": exc.reason, "endpoint_class": exc.endpoint_class},
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+def client_identity(request: Request, x_user_id: Optional[str] = Header(None)) -> str:
+    """Identifiant pour les plafonds par utilisateur (X-User-Id, adresse du client sinon)"""
+    return x_user_id or (request.client.host if request.client else "anonymous")
+
+def admit(endpoint_class: str):
+    """Dépendance FastAPI: place dans la classe pendant toute la requête, ou 429/503"""
+    async def dependency(user_id: str = Depends(client_identity)):
+        ticket = await admission_controller.acquire(endpoint_class, user_id=user_id)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+    return dependency
+
+async def _release_after(stream, ticket):
+    """Garde la place d'admission jusqu'à la fin d'une réponse en flux"""
+    try:
+        async for chunk in stream:
+            yield chunk
+    finally:
+        ticket.release()
+
+class MatrixEncoding:
+    """
+    Encodage des matrices numpy de la réponse: ?matrix_encoding= ou en-tête X-Matrix-Encoding
+    list (défaut), float16-base64, sparse (cellules où |valeur| > matrix_threshold)
+    """
+
+    def __init__(
+        self,
+        matrix_encoding: Optional[str] = Query(None),
+        matrix_threshold: float = Query(0.0, ge=0.0),
+        x_matrix_encoding: Optional[str] = Header(None)
+    ):
+        self.encoding = matrix_encoding or x_matrix_encoding or MATRIX_LIST
+        if self.encoding not in MATRIX_ENCODINGS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Encodage de matrice inconnu: {self.encoding} ({', '.join(MATRIX_ENCODINGS)})"
+            )
+        self.threshold = matrix_threshold
+
+    def response(self, content: Any, **kwargs) -> FastJSONResponse:
+        """Réponse orjson retournée telle quelle (sans jsonable_encoder)"""
+        return FastJSONResponse(content, matrix_encoding=self.encoding, matrix_threshold=self.threshold, **kwargs)
+
+    def dumps(self, content: Any) -> bytes:
+        return dumps_json(content, self.encoding, self.threshold)
+
+    @property
+    def cache_key(self) -> Dict[str, Any]:
+        """Composante d'ETag: la représentation dépend de l'encodage choisi"""
+        return {"matrix_encoding": self.encoding, "matrix_threshold": self.threshold}
+
 # === MODÈLES DE REQUÊTE ===
 
 class AISuggestion(BaseModel):
@@ -119,6 +284,12 @@ class CoherenceRequest(BaseModel):
     mission_id: str
     workshop_data: Dict[str, Any]
 
+class BatchAnalysisRequest(BaseModel):
+    missions: List[WorkshopAnalysisRequest] = Field(..., min_length=1)
+
+# Nombre maximal de missions par appel d'analyse par lots
+BATCH_MAX_MISSIONS = int(os.getenv("AI_BATCH_MAX_MISSIONS", "200"))
+
 # === ENDPOINTS PRINCIPAUX ===
 
 @app.get("/")
@@ -140,36 +311,60 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Vérification de l'état du service"""
-    services_status = {
-        "workshop1_ai": workshop1_service.is_ready(),
-        "guidance": guidance_service.is_ready(),
-        "suggestions": suggestion_engine.is_ready(),
-        "coherence": coherence_analyzer.is_ready()
-    }
-
-    # Ajouter les services avancés si disponibles
-    if ADVANCED_SERVICES_AVAILABLE:
-        services_status.update({
-            "orchestrator": workshop1_orchestrator.is_ready(),
-            "memory_service": memory_service.is_ready(),
-            "advanced_features": True
-        })
+    """État du service et disponibilité de chaque composant"""
+    components = service_registry.status()
+    if service_registry.all_ready:
+        status = "healthy"
+    elif service_registry.loading:
+        status = "starting"
     else:
-        services_status["advanced_features"] = False
+        status = "degraded"
 
+    orchestrator = service_registry.peek("orchestrator")
     return {
-        "status": "healthy",
+        "status": status,
         "timestamp": datetime.now().isoformat(),
-        "services": services_status,
-        "capabilities": workshop1_orchestrator.get_capabilities() if ADVANCED_SERVICES_AVAILABLE else {}
+        "services": {name: component["ready"] for name, component in components.items()},
+        "components": components,
+        "jobs": job_queue.status(),
+        "admission": admission_controller.status(),
+        "process": {"pid": os.getpid(), "memory": process_memory()},
+        "capabilities": orchestrator.get_capabilities() if orchestrator else {}
     }
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness: le processus répond (disponible dès le démarrage)"""
+    return {"status": "alive", "timestamp": datetime.now().isoformat()}
+
+@app.get("/health/ready")
+async def readiness_check(response: Response):
+    """Readiness: 503 tant que tous les composants ne sont pas chargés"""
+    if not service_registry.all_ready:
+        response.status_code = 503
+        if service_registry.loading:
+            pending = [name for name in service_registry.names() if not service_registry.is_ready(name)]
+            response.headers["Retry-After"] = str(max(service_registry.retry_after(name) for name in pending))
+    return {"ready": service_registry.all_ready, "components": service_registry.status()}
+
 @app.post("/workshop1/analyze")
-async def analyze_workshop1(request: WorkshopAnalysisRequest):
+async def analyze_workshop1(
+    request: WorkshopAnalysisRequest,
+    encoding: MatrixEncoding = Depends(),
+    user_id: str = Depends(client_identity),
+    if_none_match: Optional[str] = Header(None),
+    workshop1_service=Depends(require_service("workshop1_ai"))
+):
     """
     Analyse complète de l'atelier 1 avec suggestions IA
+    ETag des données et des modèles: If-None-Match -> 304 sans recalcul
     """
+    etag = compute_etag(request.model_dump(), app.version, workshop1_service.get_model_version(),
+                        encoding.cache_key)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    ticket = await admission_controller.acquire(HEAVY, mission_id=request.mission_id, user_id=user_id)
     try:
         logger.info(f"🔍 Analyse Workshop 1 pour mission: {request.mission_id}")
         
@@ -183,19 +378,61 @@ async def analyze_workshop1(request: WorkshopAnalysisRequest):
             current_step=request.current_step
         )
         
-        return {
+        return encoding.response({
             "status": "success",
             "mission_id": request.mission_id,
             "analysis": analysis,
             "timestamp": datetime.now().isoformat()
-        }
+        }, headers=cache_headers(etag))
         
     except Exception as e:
         logger.error(f"❌ Erreur analyse Workshop 1: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur d'analyse: {str(e)}")
+    finally:
+        ticket.release()
+
+@app.post("/workshop1/analyze/batch")
+async def analyze_workshop1_batch(
+    request: BatchAnalysisRequest,
+    encoding: MatrixEncoding = Depends(),
+    user_id: str = Depends(client_identity),
+    workshop1_service=Depends(require_service("workshop1_ai"))
+):
+    """
+    📦 Analyse de plusieurs missions en un appel (encodage partagé)
+    Réponse NDJSON: une ligne par mission, émise dès que son lot est terminé
+    """
+    if len(request.missions) > BATCH_MAX_MISSIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Trop de missions: {len(request.missions)} (maximum {BATCH_MAX_MISSIONS})"
+        )
+
+    missions = [mission.model_dump() for mission in request.missions]
+    logger.info(f"📦 Analyse par lots Workshop 1: {len(missions)} missions")
+    ticket = await admission_controller.acquire(HEAVY, user_id=user_id)
+
+    async def stream_results():
+        try:
+            async for index, analysis in workshop1_service.analyze_missions_batch(missions):
+                line = {"status": "success", "index": index, "mission_id": analysis["mission_id"],
+                        "analysis": analysis}
+                yield encoding.dumps(line) + b"\n"
+        except Exception as e:
+            logger.error(f"❌ Erreur analyse par lots: {str(e)}")
+            yield encoding.dumps({"status": "error", "detail": f"Erreur d'analyse: {str(e)}"}) + b"\n"
+
+    return StreamingResponse(
+        _release_after(stream_results(), ticket),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(ticket.release)
+    )
 
-@app.post("/workshop1/suggestions")
-async def get_intelligent_suggestions(request: SuggestionRequest):
+@app.post("/workshop1/suggestions", dependencies=[Depends(admit(LIGHT))])
+async def get_intelligent_suggestions(
+    request: SuggestionRequest,
+    suggestion_engine=Depends(require_service("suggestions"))
+):
     """
     Génère des suggestions intelligentes basées sur le contexte
     """
@@ -220,7 +457,38 @@ async def get_intelligent_suggestions(request: SuggestionRequest):
         logger.error(f"❌ Erreur génération suggestions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur de suggestion: {str(e)}")
 
-@app.post("/workshop1/coherence")
+@app.get("/workshop1/suggestions/{mission_id}/history", dependencies=[Depends(admit(LIGHT))])
+async def get_suggestion_history(
+    mission_id: str,
+    suggestion_type: Optional[str] = None,
+    workshop_id: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None
+):
+    """
+    🗂️ Suggestions enregistrées d'une mission, par confiance décroissante (pagination par clé)
+    Lecture par l'engine asynchrone, ou dans un thread sans DB_ASYNC_ENABLED
+    """
+    from config.database import database_initialized, async_database_initialized
+    if not (database_initialized() or async_database_initialized()):
+        raise HTTPException(status_code=503, detail="Base de données unifiée non configurée (DB_ENABLED)")
+
+    from services.unified_db_service import unified_db
+    try:
+        page = await unified_db.get_ai_suggestions_page_async(
+            mission_id, suggestion_type, workshop_id, limit=min(limit, 100), cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "status": "success",
+        "mission_id": mission_id,
+        "suggestions": [item.to_dict() for item in page["items"]],
+        "next_cursor": page["next_cursor"]
+    }
+
+@app.post("/workshop1/coherence", dependencies=[Depends(admit(LIGHT))])
 async def analyze_coherence(request: CoherenceRequest):
     """
     Analyse la cohérence des données Workshop 1
@@ -244,52 +512,63 @@ async def analyze_coherence(request: CoherenceRequest):
         logger.error(f"❌ Erreur analyse cohérence: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur de cohérence: {str(e)}")
 
-@app.get("/workshop1/guidance/{workshop_step}")
-async def get_contextual_guidance(workshop_step: str):
+@app.get("/workshop1/guidance/{workshop_step}", dependencies=[Depends(admit(LIGHT))])
+async def get_contextual_guidance(
+    workshop_step: str,
+    if_none_match: Optional[str] = Header(None),
+    workshop1_orchestrator=Depends(require_service("orchestrator"))
+):
     """
-    Obtient la guidance contextuelle pour une étape spécifique
+    Obtient la guidance contextuelle pour une étape spécifique (base de connaissances EBIOS RM)
+    ETag par étape, version du service et génération de la base de connaissances: If-None-Match -> 304
     """
+    etag = compute_etag({"step": workshop_step}, app.version, workshop1_orchestrator.get_analysis_version())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
     try:
         logger.info(f"📚 Guidance pour étape: {workshop_step}")
         
-        guidance = await guidance_service.get_step_guidance(workshop_step)
+        guidance = await workshop1_orchestrator.get_step_guidance(workshop_step)
         
-        return {
+        return FastJSONResponse({
             "status": "success",
             "step": workshop_step,
             "guidance": guidance,
             "timestamp": datetime.now().isoformat()
-        }
+        }, headers=cache_headers(etag))
         
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Erreur guidance: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur de guidance: {str(e)}")
 
-@app.post("/workshop1/auto-complete")
+@app.post("/workshop1/auto-complete", status_code=202, dependencies=[Depends(admit(INGESTION))])
 async def auto_complete_workshop(
     request: WorkshopAnalysisRequest,
-    background_tasks: BackgroundTasks
+    workshop1_service=Depends(require_service("workshop1_ai"))
 ):
     """
     Complète automatiquement les éléments manquants du Workshop 1
+    Tâche en file: suivi et résultat via GET /jobs/{job_id}
     """
     try:
         logger.info(f"🤖 Auto-complétion Workshop 1 pour mission: {request.mission_id}")
 
-        # Lancement en arrière-plan pour les tâches longues
-        background_tasks.add_task(
-            workshop1_service.auto_complete_workshop,
-            request.mission_id,
-            request.business_values,
-            request.essential_assets,
-            request.supporting_assets,
-            request.dreaded_events
+        job = await job_queue.submit(
+            AUTO_COMPLETE_JOB,
+            request.model_dump(include={
+                "mission_id", "business_values", "essential_assets", "supporting_assets", "dreaded_events"
+            })
         )
 
         return {
-            "status": "processing",
+            "status": job.state,
+            "job_id": job.id,
+            "status_url": f"/jobs/{job.id}",
             "mission_id": request.mission_id,
-            "message": "Auto-complétion en cours...",
+            "message": "Auto-complétion en file d'attente",
             "timestamp": datetime.now().isoformat()
         }
 
@@ -297,54 +576,142 @@ async def auto_complete_workshop(
         logger.error(f"❌ Erreur auto-complétion: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur d'auto-complétion: {str(e)}")
 
+# === TÂCHES EN ARRIÈRE-PLAN ===
+
+@app.get("/jobs/{job_id}", dependencies=[Depends(admit(LIGHT))])
+async def get_job(job_id: str):
+    """📬 État, progression et résultat d'une tâche"""
+    try:
+        job = await job_queue.get(job_id)
+    except JobNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Tâche inconnue: {job_id}")
+    return job.to_dict()
+
+@app.delete("/jobs/{job_id}", dependencies=[Depends(admit(LIGHT))])
+async def cancel_job(job_id: str):
+    """🛑 Annule une tâche en file ou en cours (409 si déjà terminée)"""
+    try:
+        job = await job_queue.get(job_id)
+        if job.state in FINISHED_STATES:
+            raise HTTPException(status_code=409, detail=f"Tâche déjà terminée ({job.state})")
+        job = await job_queue.cancel(job_id)
+    except JobNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Tâche inconnue: {job_id}")
+    return job.to_dict()
+
 # === NOUVEAUX ENDPOINTS ORCHESTRATION AVANCÉE ===
 
+async def _orchestration_inputs(request: WorkshopAnalysisRequest, memory_service):
+    """Données Workshop 1 et contexte utilisateur (mémoire) pour l'orchestrateur"""
+    workshop_data = {
+        "business_values": request.business_values,
+        "essential_assets": request.essential_assets,
+        "supporting_assets": request.supporting_assets,
+        "dreaded_events": request.dreaded_events,
+        "current_step": request.current_step
+    }
+
+    # Récupérer le contexte utilisateur depuis la mémoire
+    user_context = await memory_service.retrieve_user_context(
+        user_id="current_user",  # TODO: récupérer depuis auth
+        mission_id=request.mission_id
+    )
+    return workshop_data, user_context.__dict__ if user_context else None
+
 @app.post("/workshop1/orchestrate")
-async def orchestrate_advanced_analysis(request: WorkshopAnalysisRequest):
+async def orchestrate_advanced_analysis(
+    request: WorkshopAnalysisRequest,
+    encoding: MatrixEncoding = Depends(),
+    user_id: str = Depends(client_identity),
+    workshop1_orchestrator=Depends(require_service("orchestrator")),
+    memory_service=Depends(require_service("memory_service"))
+):
     """
     🎼 Orchestration avancée avec LangChain + mémoire persistante
+    Pas d'ETag: le résultat dépend du contexte utilisateur et chaque appel sauvegarde le contexte
     """
-    if not ADVANCED_SERVICES_AVAILABLE:
-        raise HTTPException(status_code=503, detail="Services avancés non disponibles")
-
+    ticket = await admission_controller.acquire(HEAVY, mission_id=request.mission_id, user_id=user_id)
     try:
         logger.info(f"🎼 Orchestration avancée pour mission: {request.mission_id}")
 
         # Préparer les données pour l'orchestrateur
-        workshop_data = {
-            "business_values": request.business_values,
-            "essential_assets": request.essential_assets,
-            "supporting_assets": request.supporting_assets,
-            "dreaded_events": request.dreaded_events,
-            "current_step": request.current_step
-        }
-
-        # Récupérer le contexte utilisateur depuis la mémoire
-        user_context = await memory_service.retrieve_user_context(
-            user_id="current_user",  # TODO: récupérer depuis auth
-            mission_id=request.mission_id
-        )
+        workshop_data, user_context = await _orchestration_inputs(request, memory_service)
 
         # Orchestration complète
         result = await workshop1_orchestrator.orchestrate_workshop_analysis(
             mission_id=request.mission_id,
             workshop_data=workshop_data,
-            user_context=user_context.__dict__ if user_context else None
+            user_context=user_context
         )
 
-        return {
+        return encoding.response({
             "status": "success",
             "mission_id": request.mission_id,
-            "orchestration_result": result.__dict__,
+            "orchestration_result": result,
             "capabilities_used": workshop1_orchestrator.get_capabilities(),
             "timestamp": datetime.now().isoformat()
-        }
+        })
 
     except Exception as e:
         logger.error(f"❌ Erreur orchestration avancée: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur d'orchestration: {str(e)}")
+    finally:
+        ticket.release()
+
+def _format_stream_event(event: Dict[str, Any], sse: bool, encoding: Optional[MatrixEncoding] = None) -> bytes:
+    """Ligne NDJSON ou événement SSE (champ `event` = étape)"""
+    data = encoding.dumps(event) if encoding else dumps_json(event)
+    return b"event: " + event["stage"].encode() + b"\ndata: " + data + b"\n\n" if sse else data + b"\n"
 
-@app.post("/workshop1/memory/store")
+@app.post("/workshop1/orchestrate/stream")
+async def orchestrate_advanced_analysis_stream(
+    request: WorkshopAnalysisRequest,
+    format: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    encoding: MatrixEncoding = Depends(),
+    user_id: str = Depends(client_identity),
+    workshop1_orchestrator=Depends(require_service("orchestrator")),
+    memory_service=Depends(require_service("memory_service"))
+):
+    """
+    🌊 Orchestration progressive: chaque étape est émise dès qu'elle est prête
+    basic, puis semantic / ml / rag (ordre d'achèvement), puis result
+    NDJSON par défaut, Server-Sent Events avec `Accept: text/event-stream` ou `?format=sse`
+    """
+    sse = format == "sse" or (format is None and "text/event-stream" in (accept or ""))
+    logger.info(f"🌊 Orchestration progressive pour mission: {request.mission_id}")
+
+    ticket = await admission_controller.acquire(HEAVY, mission_id=request.mission_id, user_id=user_id)
+    try:
+        workshop_data, user_context = await _orchestration_inputs(request, memory_service)
+    except BaseException:
+        ticket.release()
+        raise
+    started = time.perf_counter()
+
+    async def stream_stages():
+        async for stage, payload in workshop1_orchestrator.stream_workshop_analysis(
+            mission_id=request.mission_id,
+            workshop_data=workshop_data,
+            user_context=user_context
+        ):
+            event = {
+                "stage": stage,
+                "mission_id": request.mission_id,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "data": payload
+            }
+            yield _format_stream_event(event, sse, encoding)
+
+    return StreamingResponse(
+        _release_after(stream_stages(), ticket),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        # Pas de mise en tampon par les proxies (nginx): chaque étape part immédiatement
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(ticket.release)
+    )
+
+@app.post("/workshop1/memory/store", dependencies=[Depends(admit(INGESTION))])
 async def store_agent_memory(
     mission_id: str,
     agent_id: str,
@@ -352,14 +719,12 @@ async def store_agent_memory(
     content: Dict[str, Any],
     session_id: Optional[str] = None,
     priority: int = 1,
-    expires_in_hours: Optional[int] = None
+    expires_in_hours: Optional[int] = None,
+    memory_service=Depends(require_service("memory_service"))
 ):
     """
     💾 Stocke une entrée de mémoire pour un agent
     """
-    if not ADVANCED_SERVICES_AVAILABLE:
-        raise HTTPException(status_code=503, detail="Service mémoire non disponible")
-
     try:
         session_id = session_id or f"session_{datetime.now().timestamp()}"
 
@@ -385,20 +750,18 @@ async def store_agent_memory(
         logger.error(f"❌ Erreur stockage mémoire: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur de stockage: {str(e)}")
 
-@app.get("/workshop1/memory/retrieve")
+@app.get("/workshop1/memory/retrieve", dependencies=[Depends(admit(LIGHT))])
 async def retrieve_agent_memory(
     mission_id: str,
     agent_id: Optional[str] = None,
     session_id: Optional[str] = None,
     memory_type: Optional[str] = None,
-    limit: int = 50
+    limit: int = 50,
+    memory_service=Depends(require_service("memory_service"))
 ):
     """
     🔍 Récupère les entrées de mémoire d'un agent
     """
-    if not ADVANCED_SERVICES_AVAILABLE:
-        raise HTTPException(status_code=503, detail="Service mémoire non disponible")
-
     try:
         memories = await memory_service.retrieve_memory(
             mission_id=mission_id,
@@ -408,31 +771,114 @@ async def retrieve_agent_memory(
             limit=limit
         )
 
-        return {
+        return FastJSONResponse({
             "status": "success",
             "mission_id": mission_id,
-            "memories": [memory.__dict__ for memory in memories],
+            "memories": memories,
             "count": len(memories),
             "timestamp": datetime.now().isoformat()
-        }
+        })
 
     except Exception as e:
         logger.error(f"❌ Erreur récupération mémoire: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur de récupération: {str(e)}")
 
+@app.get("/workshop1/memory/interactions", dependencies=[Depends(admit(LIGHT))])
+async def get_user_interactions(
+    user_id: str,
+    mission_id: str,
+    before: Optional[int] = None,
+    limit: int = 50,
+    memory_service=Depends(require_service("memory_service"))
+):
+    """
+    📜 Historique paginé des interactions d'un utilisateur sur une mission
+    """
+    page = await memory_service.get_interaction_history(
+        user_id=user_id,
+        mission_id=mission_id,
+        before_sequence=before,
+        limit=min(limit, 500)
+    )
+
+    return {
+        "status": "success",
+        "mission_id": mission_id,
+        "interactions": page["interactions"],
+        "next_cursor": page["next_cursor"],
+        "timestamp": datetime.now().isoformat()
+    }
+
 # === ENDPOINTS DE MONITORING ===
 
 @app.get("/metrics")
 async def get_metrics():
-    """Métriques du service IA"""
+    """Métriques du service IA au format Prometheus"""
+    payload = render_metrics()
+    if payload is None:
+        return await get_metrics_summary()
+    return Response(content=payload, media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/metrics/summary")
+async def get_metrics_summary():
+    """Résumé JSON des compteurs du service IA (zéros tant que les services chargent)"""
+    workshop1_service = service_registry.peek("workshop1_ai", MockAIService())
+    suggestion_engine = service_registry.peek("suggestions", MockAIService())
     return {
         "requests_processed": workshop1_service.get_request_count(),
         "suggestions_generated": suggestion_engine.get_suggestion_count(),
         "coherence_analyses": coherence_analyzer.get_analysis_count(),
         "uptime": workshop1_service.get_uptime(),
-        "memory_usage": workshop1_service.get_memory_usage()
+        "memory_usage": format_memory_usage()
     }
 
+# === ENDPOINTS D'ADMINISTRATION (PROFILAGE) ===
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """Protège les endpoints d'administration (désactivés sans AI_SERVICE_ADMIN_TOKEN)"""
+    expected = os.getenv("AI_SERVICE_ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Endpoint d'administration désactivé")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=403, detail="Jeton d'administration invalide")
+
+def _profile_download(content: bytes, extension: str, media_type: str) -> Response:
+    filename = f"profile-{os.getpid()}-{datetime.now().strftime('%Y%m%dT%H%M%S')}.{extension}"
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.post("/admin/profile/cpu", dependencies=[Depends(require_admin_token)])
+async def profile_cpu(seconds: float = 10):
+    """Profil CPU (cProfile) de la boucle d'événements, fichier pstats"""
+    try:
+        content = await profiling_service.capture_cpu_profile(seconds)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _profile_download(content, "pstats", "application/octet-stream")
+
+@app.post("/admin/profile/wall", dependencies=[Depends(require_admin_token)])
+async def profile_wall(seconds: float = 10, interval_ms: float = 5):
+    """Échantillonnage wall-clock de la boucle d'événements, piles repliées (flamegraph)"""
+    try:
+        content = await profiling_service.capture_wall_profile(seconds, interval_ms)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _profile_download(content.encode(), "collapsed", "text/plain")
+
+@app.post("/admin/profile/memory", dependencies=[Depends(require_admin_token)])
+async def profile_memory(seconds: float = 10, top: int = 50, raw: bool = False):
+    """Allocations tracemalloc pendant la fenêtre (rapport texte, ou dump brut avec raw=true)"""
+    try:
+        content = await profiling_service.capture_allocations(seconds, top=top, raw=raw)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if raw:
+        return _profile_download(content, "tracemalloc", "application/octet-stream")
+    return _profile_download(content, "txt", "text/plain")
+
 if __name__ == "__main__":
     port = int(os.getenv("AI_SERVICE_PORT", 8000))
     uvicorn.run(
@@ -0,0 +1,91 @@
+"""
+📦 OBJETS DE RÉSULTAT DES TABLES AI
+Objets légers (slots) construits directement depuis les lignes select(),
+indépendants de toute session SQLAlchemy
+"""
+
+import uuid
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, ClassVar, Dict, List, Optional
+
+from models.ai_models import AISession, AgentMemory, AISuggestion
+
+
+class _RowDTO:
+    """Correspondance champs du DTO <-> colonnes du modèle (même ordre)"""
+
+    __slots__ = ()
+    _model: ClassVar[Any]
+
+    @classmethod
+    def columns(cls) -> List[Any]:
+        """Colonnes à sélectionner, dans l'ordre des champs"""
+        return [getattr(cls._model, field.name) for field in fields(cls)]
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation sérialisable en JSON"""
+        result = {}
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, uuid.UUID):
+                value = str(value)
+            result[field.name] = value
+        return result
+
+
+@dataclass(slots=True)
+class AISessionDTO(_RowDTO):
+    """Session AI"""
+    _model: ClassVar[Any] = AISession
+
+    id: uuid.UUID
+    user_id: uuid.UUID
+    mission_id: uuid.UUID
+    session_token: str
+    context_data: Optional[dict]
+    last_activity: Optional[datetime]
+    expires_at: Optional[datetime]
+
+
+@dataclass(slots=True)
+class AgentMemoryDTO(_RowDTO):
+    """Entrée de mémoire d'agent"""
+    _model: ClassVar[Any] = AgentMemory
+
+    id: uuid.UUID
+    mission_id: uuid.UUID
+    user_id: uuid.UUID
+    agent_type: str
+    memory_type: str
+    content: dict
+    relevance_score: Optional[float]
+    tags: Optional[List[str]]
+    expires_at: Optional[datetime]
+    created_at: Optional[datetime]
+
+
+@dataclass(slots=True)
+class AISuggestionDTO(_RowDTO):
+    """Suggestion AI"""
+    _model: ClassVar[Any] = AISuggestion
+
+    id: uuid.UUID
+    mission_id: uuid.UUID
+    workshop_id: Optional[uuid.UUID]
+    user_id: uuid.UUID
+    suggestion_type: str
+    content: str
+    confidence_score: Optional[float]
+    context_data: Optional[dict]
+    is_applied: Optional[bool]
+    created_at: Optional[datetime]
+
+
+__all__ = ['AISessionDTO', 'AgentMemoryDTO', 'AISuggestionDTO']
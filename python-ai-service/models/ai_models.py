@@ -3,7 +3,7 @@
 Modèles SQLAlchemy pour les tables AI unifiées
 """
 
-from sqlalchemy import Column, String, DateTime, Text, Float, Integer, Boolean, ForeignKey, ARRAY
+from sqlalchemy import Column, String, DateTime, Text, Float, Integer, Boolean, ForeignKey, ARRAY, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 import uuid
 
 from config.database import Base
+from utils.keyset import keyset_order_by
 
 class AISession(Base):
     """Sessions utilisateur pour le contexte AI"""
@@ -56,6 +57,12 @@ class AgentMemory(Base):
     created_at = Column(DateTime(timezone=True), default=func.now())
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     
+    __table_args__ = (
+        # Filtre + tri de get_agent_memory et pagination par curseur (get_agent_memory_page)
+        Index('idx_agent_memory_mission_agent_relevance', mission_id, agent_type,
+              *keyset_order_by(relevance_score, created_at, id)),
+    )
+    
     def __repr__(self):
         return f"<AgentMemory(id={self.id}, agent_type={self.agent_type}, memory_type={self.memory_type})>"
     
@@ -84,6 +91,12 @@ class AISuggestion(Base):
     created_at = Column(DateTime(timezone=True), default=func.now())
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
     
+    __table_args__ = (
+        # Filtre + tri de get_ai_suggestions et pagination par curseur (get_ai_suggestions_page)
+        Index('idx_ai_suggestions_mission_confidence', mission_id,
+              *keyset_order_by(confidence_score, created_at, id)),
+    )
+    
     def __repr__(self):
         return f"<AISuggestion(id={self.id}, type={self.suggestion_type}, confidence={self.confidence_score})>"
     
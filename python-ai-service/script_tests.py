@@ -0,0 +1,36 @@
+"""
+🧪 EXÉCUTION DES TESTS EN SCRIPT
+Les modules test_*.py sont collectés par pytest; ce point d'entrée commun permet
+aussi de les lancer directement (python test_xxx.py) avec un résumé ✅/❌
+"""
+
+import inspect
+from typing import Any, Dict
+
+
+def run_script_tests(title: str, namespace: Dict[str, Any]) -> int:
+    """
+    Exécute les fonctions test_* du module, dans leur ordre de définition
+    Retourne le code de sortie du script (0 si tout réussit)
+    """
+    print(title)
+    print("=" * 40)
+
+    tests = [
+        value for name, value in namespace.items()
+        if name.startswith('test_') and inspect.isfunction(value) and value.__module__ == namespace['__name__']
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n📊 {len(tests) - failures}/{len(tests)} tests réussis")
+    return 0 if failures == 0 else 1
+
+
+__all__ = ['run_script_tests']
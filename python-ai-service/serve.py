@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+🚀 LANCEUR MULTI-WORKERS (PRODUCTION)
+Le processus maître charge les modèles et index en lecture seule (SentenceTransformer,
+GPT-2, index RAG de l'orchestrateur) puis forke les workers: ces pages sont partagées
+en copy-on-write au lieu d'être rechargées par chaque worker
+
+    python serve.py --workers 4 --port 8000
+
+- gc.freeze() juste avant le fork: le ramasse-miettes ne parcourt plus les objets
+  hérités et ne recopie donc pas leurs pages
+- les workers partagent le socket d'écoute; un worker qui s'arrête est relancé
+- SIGTERM/SIGINT: arrêt gracieux des workers, SIGKILL après AI_SERVICE_GRACEFUL_TIMEOUT
+- memory_service (connexions Redis et base) est chargé dans chaque worker
+- les limites d'admission et les métriques /metrics restent propres à chaque worker
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+logger = logging.getLogger("serve")
+
+# Un worker qui meurt plus tôt que ce délai est relancé après une pause (boucle de plantage)
+MIN_WORKER_UPTIME_SECONDS = 5.0
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Service IA EBIOS RM: workers forkés après chargement des modèles")
+    parser.add_argument("--host", default=os.getenv("AI_SERVICE_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("AI_SERVICE_PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("AI_SERVICE_WORKERS", 2)))
+    parser.add_argument("--graceful-timeout", type=float,
+                        default=float(os.getenv("AI_SERVICE_GRACEFUL_TIMEOUT", 30)))
+    parser.add_argument("--log-level", default=os.getenv("AI_SERVICE_LOG_LEVEL", "info"))
+    return parser.parse_args(argv)
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    """Socket d'écoute ouvert par le maître et hérité par tous les workers"""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _cpu_share(workers: int) -> int:
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def _split_cpu_budget(workers: int):
+    """
+    Les limites d'admission heavy sont par processus: sans réglage explicite,
+    chaque worker reçoit sa part des cœurs plutôt que la totalité
+    """
+    if not os.getenv("AI_ADMISSION_HEAVY_CONCURRENCY"):
+        os.environ["AI_ADMISSION_HEAVY_CONCURRENCY"] = str(_cpu_share(workers))
+
+
+def preload_application():
+    """
+    Importe l'application et charge les services préchargeables dans le maître
+    Le ramasse-miettes reste désactivé pendant le chargement puis les objets survivants
+    sont gelés: le premier cycle de collecte d'un worker ne touche plus leurs pages
+    """
+    gc.disable()
+    import main
+
+    main.service_registry.preload()
+
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available() and torch.cuda.is_initialized():
+        logger.warning("⚠️ CUDA initialisé avant fork: les workers ne pourront pas l'utiliser")
+
+    gc.collect()
+    gc.freeze()
+    logger.info(f"🧊 {gc.get_freeze_count()} objets gelés avant fork")
+    return main.app
+
+
+def _run_worker(app, sock: socket.socket, args: argparse.Namespace, workers: int):
+    """Corps d'un worker forké (ne retourne pas)"""
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    gc.enable()
+
+    # Threads intra-op torch hérités du maître: un worker par part de cœurs
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(_cpu_share(workers))
+
+    config = uvicorn.Config(app, log_level=args.log_level, timeout_graceful_shutdown=args.graceful_timeout)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Master:
+    """Fork des workers, relance en cas d'arrêt inattendu, arrêt gracieux sur signal"""
+
+    def __init__(self, app, sock: socket.socket, args: argparse.Namespace):
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.workers = {}
+        self.stopping = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(self.app, self.sock, self.args, self.args.workers)
+            except BaseException:
+                logger.exception("❌ Worker arrêté sur erreur")
+                code = 1
+            finally:
+                os._exit(code)
+
+        self.workers[pid] = time.monotonic()
+        logger.info(f"👷 Worker {pid} démarré")
+
+    def stop(self, signum, frame):
+        if self.stopping:
+            return
+        self.stopping = True
+        logger.info(f"🛑 Arrêt demandé ({signal.Signals(signum).name}), {len(self.workers)} worker(s)")
+        for pid in list(self.workers):
+            self._signal(pid, signal.SIGTERM)
+        signal.signal(signal.SIGALRM, self.kill)
+        signal.alarm(max(1, int(self.args.graceful_timeout) + 5))
+
+    def kill(self, signum, frame):
+        for pid in list(self.workers):
+            logger.warning(f"⚠️ Worker {pid} arrêté de force")
+            self._signal(pid, signal.SIGKILL)
+
+    def _signal(self, pid: int, signum: int):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for _ in range(self.args.workers):
+            self.spawn()
+
+        while self.workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started_at = self.workers.pop(pid, None)
+            if started_at is None or self.stopping:
+                continue
+
+            logger.warning(f"⚠️ Worker {pid} arrêté (code {os.waitstatus_to_exitcode(status)}), relance")
+            if time.monotonic() - started_at < MIN_WORKER_UPTIME_SECONDS:
+                time.sleep(1)
+            if not self.stopping:
+                self.spawn()
+
+        signal.alarm(0)
+        logger.info("✅ Service arrêté")
+        return 0
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    args = _parse_args(argv)
+    args.workers = max(1, args.workers)
+
+    _split_cpu_budget(args.workers)
+    # Socket ouvert avant le chargement: un port déjà pris échoue immédiatement
+    sock = _bind_socket(args.host, args.port)
+    app = preload_application()
+
+    logger.info(f"🚀 {args.workers} worker(s) sur {args.host}:{args.port}")
+    return Master(app, sock, args).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+🚧 CONTRÔLE D'ADMISSION
+Concurrence bornée par classe d'endpoint (light, heavy, ingestion), plafonds par mission
+et par utilisateur, budget d'attente en file et rejet rapide (429/503 + Retry-After)
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from services.observability import (
+    ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_QUEUE_WAIT, ADMISSION_REJECTIONS
+)
+
+logger = logging.getLogger(__name__)
+
+LIGHT = 'light'
+HEAVY = 'heavy'
+INGESTION = 'ingestion'
+
+
+class AdmissionRejected(Exception):
+    """
+    Requête refusée sans être exécutée
+    429: plafond de la mission ou de l'utilisateur atteint; 503: service saturé
+    """
+
+    def __init__(self, endpoint_class: str, reason: str, status_code: int, retry_after: int, detail: str):
+        super().__init__(detail)
+        self.endpoint_class = endpoint_class
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+@dataclass
+class AdmissionPolicy:
+    """Limites d'une classe d'endpoint (None: pas de plafond)"""
+    concurrency: int
+    queue_limit: int
+    queue_timeout: float
+    per_mission: Optional[int] = None
+    per_user: Optional[int] = None
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.getenv(name)
+    if value is None or value == '':
+        return default
+    return int(value) or None
+
+
+def default_policies() -> Dict[str, AdmissionPolicy]:
+    """Limites par défaut, surchargées par AI_ADMISSION_<CLASSE>_{CONCURRENCY,QUEUE,PER_MISSION,PER_USER}"""
+    cpu_count = os.cpu_count() or 2
+    queue_timeout = float(os.getenv('AI_ADMISSION_QUEUE_TIMEOUT_SECONDS', '2'))
+    defaults = {
+        LIGHT: (64, 256, None, None),
+        # Étapes CPU (embeddings, ML): au-delà d'un calcul par cœur, tout le monde ralentit
+        HEAVY: (cpu_count, 2 * cpu_count, 1, 2),
+        INGESTION: (8, 32, None, 4)
+    }
+
+    policies = {}
+    for name, (concurrency, queue_limit, per_mission, per_user) in defaults.items():
+        prefix = f"AI_ADMISSION_{name.upper()}_"
+        policies[name] = AdmissionPolicy(
+            concurrency=_env_int(prefix + 'CONCURRENCY', concurrency) or concurrency,
+            queue_limit=_env_int(prefix + 'QUEUE', queue_limit) or 0,
+            queue_timeout=queue_timeout,
+            per_mission=_env_int(prefix + 'PER_MISSION', per_mission),
+            per_user=_env_int(prefix + 'PER_USER', per_user)
+        )
+    return policies
+
+
+class AdmissionTicket:
+    """Place obtenue dans une classe; release() idempotent"""
+
+    def __init__(self, gate: '_ClassGate', keys: tuple):
+        self._gate = gate
+        self._keys = keys
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+        self._gate.leave(self._keys, time.monotonic() - self._started)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+class _ClassGate:
+    """Sémaphore d'une classe + compteurs par clé (mission, utilisateur) en attente ou en cours"""
+
+    def __init__(self, name: str, policy: AdmissionPolicy):
+        self.name = name
+        self.policy = policy
+        self.semaphore = asyncio.Semaphore(policy.concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.per_key: Dict[tuple, int] = {}
+        # Durée moyenne (EWMA) d'une requête admise, pour estimer Retry-After
+        self.average_seconds = 1.0
+
+    def retry_after(self, queued_ahead: int = 0) -> int:
+        rounds = (queued_ahead + 1) / self.policy.concurrency
+        return max(1, math.ceil(self.average_seconds * rounds))
+
+    def _reject(self, reason: str, status_code: int, retry_after: int, detail: str):
+        ADMISSION_REJECTIONS.labels(endpoint_class=self.name, reason=reason).inc()
+        logger.warning(f"🚧 Requête {self.name} rejetée ({reason}): {detail}")
+        raise AdmissionRejected(self.name, reason, status_code, retry_after, detail)
+
+    async def enter(self, mission_id: Optional[str], user_id: Optional[str]) -> AdmissionTicket:
+        caps = (('mission', mission_id, self.policy.per_mission), ('user', user_id, self.policy.per_user))
+        keys = tuple((kind, key) for kind, key, cap in caps if key is not None and cap)
+        for kind, key, cap in caps:
+            if key is not None and cap and self.per_key.get((kind, key), 0) >= cap:
+                label = "Mission" if kind == 'mission' else "Utilisateur"
+                self._reject(f"per_{kind}", 429, self.retry_after(),
+                             f"{label} {key}: {cap} requête(s) {self.name} simultanée(s) maximum")
+
+        if self.semaphore.locked() and self.waiting >= self.policy.queue_limit:
+            self._reject('queue_full', 503, self.retry_after(self.waiting),
+                         f"File {self.name} pleine ({self.waiting} en attente)")
+
+        for key in keys:
+            self.per_key[key] = self.per_key.get(key, 0) + 1
+
+        self.waiting += 1
+        ADMISSION_QUEUE_DEPTH.labels(endpoint_class=self.name).set(self.waiting)
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.policy.queue_timeout)
+        except asyncio.TimeoutError:
+            self._forget(keys)
+            self._reject('queue_timeout', 503, self.retry_after(self.waiting),
+                         f"Attente {self.name} supérieure à {self.policy.queue_timeout:g}s")
+        except BaseException:
+            self._forget(keys)
+            raise
+        finally:
+            self.waiting -= 1
+            ADMISSION_QUEUE_DEPTH.labels(endpoint_class=self.name).set(self.waiting)
+
+        ADMISSION_QUEUE_WAIT.labels(endpoint_class=self.name).observe(time.monotonic() - queued_at)
+        self.in_flight += 1
+        ADMISSION_IN_FLIGHT.labels(endpoint_class=self.name).set(self.in_flight)
+        return AdmissionTicket(self, keys)
+
+    def leave(self, keys: tuple, elapsed: float):
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.labels(endpoint_class=self.name).set(self.in_flight)
+        self.average_seconds = 0.8 * self.average_seconds + 0.2 * elapsed
+        self._forget(keys)
+        self.semaphore.release()
+
+    def _forget(self, keys: tuple):
+        for key in keys:
+            remaining = self.per_key.get(key, 0) - 1
+            if remaining > 0:
+                self.per_key[key] = remaining
+            else:
+                self.per_key.pop(key, None)
+
+
+class AdmissionController:
+    """
+    Point d'entrée des endpoints:
+        ticket = await admission_controller.acquire(HEAVY, mission_id=..., user_id=...)
+        try: ... finally: ticket.release()
+    ou `async with await admission_controller.acquire(...)`
+    """
+
+    def __init__(self, policies: Optional[Dict[str, AdmissionPolicy]] = None):
+        self._policies = policies
+        self._gates: Dict[str, _ClassGate] = {}
+
+    def _gate(self, endpoint_class: str) -> _ClassGate:
+        # Créé au premier usage: le sémaphore appartient à la boucle du serveur
+        gate = self._gates.get(endpoint_class)
+        if gate is None:
+            if self._policies is None:
+                self._policies = default_policies()
+            gate = self._gates[endpoint_class] = _ClassGate(endpoint_class, self._policies[endpoint_class])
+        return gate
+
+    async def acquire(self, endpoint_class: str, mission_id: Optional[str] = None,
+                      user_id: Optional[str] = None) -> AdmissionTicket:
+        """Place dans la classe, ou AdmissionRejected sans attendre au-delà du budget de file"""
+        return await self._gate(endpoint_class).enter(mission_id, user_id)
+
+    def status(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: {'in_flight': gate.in_flight, 'waiting': gate.waiting,
+                   'concurrency': gate.policy.concurrency, 'queue_limit': gate.policy.queue_limit}
+            for name, gate in self._gates.items()
+        }
+
+
+__all__ = [
+    'AdmissionController', 'AdmissionPolicy', 'AdmissionRejected', 'AdmissionTicket',
+    'default_policies', 'LIGHT', 'HEAVY', 'INGESTION'
+]
@@ -12,17 +12,16 @@ from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass, asdict
 import uuid
 
+from .optional_dependencies import module_available
+
 # Imports conditionnels pour éviter les erreurs
-try:
-    import redis
-    from redis.exceptions import ConnectionError as RedisConnectionError
-    REDIS_AVAILABLE = True
-except ImportError:
-    REDIS_AVAILABLE = False
+REDIS_AVAILABLE = module_available('redis')
+if not REDIS_AVAILABLE:
     logging.warning("🔧 Redis non disponible, mémoire locale activée")
 
 try:
-    from sqlalchemy import create_engine, Column, String, DateTime, Text, Float, Integer, Boolean
+    from sqlalchemy import create_engine, inspect, text, func, Column, String, DateTime, Text, Float, Integer, Boolean, Index
+    from sqlalchemy.exc import IntegrityError
     from sqlalchemy.ext.declarative import declarative_base
     from sqlalchemy.orm import sessionmaker, Session
     from sqlalchemy.dialects.postgresql import UUID
@@ -32,13 +31,13 @@ except ImportError:
     SQLALCHEMY_AVAILABLE = False
     logging.warning("🔧 SQLAlchemy non disponible, persistance désactivée")
 
-try:
-    from celery import Celery
-    CELERY_AVAILABLE = True
-except ImportError:
-    CELERY_AVAILABLE = False
+# Celery sondé sans import (importé à la configuration des tâches)
+CELERY_AVAILABLE = module_available('celery')
+if not CELERY_AVAILABLE:
     logging.warning("🔧 Celery non disponible, tâches synchrones")
 
+from .local_memory_store import LocalMemoryStore
+
 logger = logging.getLogger(__name__)
 
 # === MODÈLES DE DONNÉES ===
@@ -72,6 +71,10 @@ class UserContext:
     last_activity: datetime
     session_count: int = 0
     total_time_spent: int = 0  # en secondes
+    # interaction_history ne contient qu'une fenêtre récente du journal d'interactions:
+    # interaction_count interactions sont persistées, la fenêtre commence à history_offset
+    interaction_count: int = 0
+    history_offset: int = 0
 
 # === MODÈLES SQLALCHEMY (SI DISPONIBLE) ===
 
@@ -92,6 +95,17 @@ if SQLALCHEMY_AVAILABLE:
         priority = Column(Integer, default=1)
         tags = Column(Text, nullable=True)  # JSON array stringifié
         
+        __table_args__ = (
+            # Couvre le filtre + tri de _retrieve_from_database
+            Index('ix_agent_memory_lookup', mission_id, agent_id, priority.desc(), timestamp.desc()),
+            # Index partiel limité aux entrées expirables, utilisé par le balayage
+            Index(
+                'ix_agent_memory_expires_at', expires_at,
+                postgresql_where=expires_at.isnot(None),
+                sqlite_where=expires_at.isnot(None)
+            ),
+        )
+        
         def to_memory_entry(self) -> AgentMemoryEntry:
             return AgentMemoryEntry(
                 id=self.id,
@@ -113,11 +127,28 @@ if SQLALCHEMY_AVAILABLE:
         user_id = Column(String, nullable=False, index=True)
         mission_id = Column(String, nullable=False, index=True)
         preferences = Column(Text, nullable=False)  # JSON
-        interaction_history = Column(Text, nullable=False)  # JSON
+        interaction_history = Column(Text, nullable=False)  # JSON - fenêtre récente uniquement
         learning_progress = Column(Text, nullable=False)  # JSON
         last_activity = Column(DateTime, nullable=False, default=datetime.utcnow)
         session_count = Column(Integer, default=0)
         total_time_spent = Column(Integer, default=0)
+        interaction_count = Column(Integer, nullable=True)  # NULL = ligne antérieure au journal
+    
+    class UserInteractionModel(Base):
+        """Journal append-only des interactions (une ligne par interaction)"""
+        __tablename__ = 'user_interaction_log'
+        
+        id = Column(Integer, primary_key=True, autoincrement=True)
+        user_id = Column(String, nullable=False)
+        mission_id = Column(String, nullable=False)
+        sequence = Column(Integer, nullable=False)
+        timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
+        payload = Column(Text, nullable=False)  # JSON
+        
+        __table_args__ = (
+            # Une séquence par contexte: deux sauvegardes concurrentes ne peuvent pas la dupliquer
+            Index('uq_user_interaction_log_sequence', user_id, mission_id, sequence, unique=True),
+        )
 
 # === SERVICE PRINCIPAL ===
 
@@ -132,7 +163,14 @@ class AgentMemoryService:
         self.redis_client = None
         self.db_session = None
         self.celery_app = None
-        self.local_memory = {}  # Fallback mémoire locale
+        self._sweeper_task = None
+
+        # Fallback mémoire locale indexé et borné
+        local_config = self.config.get('local_memory', {})
+        self.local_memory = LocalMemoryStore(
+            max_entries_per_agent=local_config.get('max_entries_per_agent', 100),
+            max_total_entries=local_config.get('max_total_entries', 10000)
+        )
         
         # Initialisation sécurisée
         self._initialize_safely()
@@ -158,6 +196,8 @@ class AgentMemoryService:
     def _setup_redis(self):
         """Configure Redis pour cache rapide"""
         try:
+            import redis
+
             redis_config = self.config.get('redis', {})
             self.redis_client = redis.Redis(
                 host=redis_config.get('host', 'localhost'),
@@ -185,6 +225,15 @@ class AgentMemoryService:
             engine = create_engine(db_url, echo=False)
             Base.metadata.create_all(engine)
             
+            # create_all ne crée pas les nouveaux index sur des tables existantes
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    try:
+                        index.create(engine, checkfirst=True)
+                    except sqlalchemy.exc.SQLAlchemyError as e:
+                        logger.warning(f"⚠️ Index {index.name} non créé: {e}")
+            self._add_missing_columns(engine)
+            
             SessionLocal = sessionmaker(bind=engine)
             self.db_session = SessionLocal()
             
@@ -194,9 +243,24 @@ class AgentMemoryService:
             logger.warning(f"⚠️ Base de données non disponible: {e}")
             self.db_session = None
     
+    def _add_missing_columns(self, engine):
+        """Ajoute les colonnes nullables introduites après la création des tables"""
+        inspector = inspect(engine)
+        for table in Base.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                with engine.begin() as conn:
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                logger.info(f"🔧 Colonne ajoutée: {table.name}.{column.name}")
+    
     def _setup_celery(self):
         """Configure Celery pour tâches asynchrones"""
         try:
+            from celery import Celery
+
             celery_config = self.config.get('celery', {})
             broker_url = celery_config.get('broker', 'redis://localhost:6379/1')
             
@@ -333,19 +397,7 @@ class AgentMemoryService:
     
     def _store_in_local_memory(self, memory_entry: AgentMemoryEntry):
         """Stocke en mémoire locale comme fallback"""
-        key = f"{memory_entry.mission_id}:{memory_entry.agent_id}"
-        if key not in self.local_memory:
-            self.local_memory[key] = []
-        
-        self.local_memory[key].append(memory_entry)
-        
-        # Limiter la taille (garder les 100 plus récents)
-        if len(self.local_memory[key]) > 100:
-            self.local_memory[key] = sorted(
-                self.local_memory[key], 
-                key=lambda x: x.timestamp, 
-                reverse=True
-            )[:100]
+        self.local_memory.add(memory_entry)
     
     async def _retrieve_from_redis(
         self, 
@@ -447,75 +499,196 @@ class AgentMemoryService:
         limit: int
     ) -> List[AgentMemoryEntry]:
         """Récupère depuis la mémoire locale"""
-        memories = []
-        
-        for key, entries in self.local_memory.items():
-            key_mission, key_agent = key.split(':', 1)
-            
-            if key_mission != mission_id:
-                continue
-            if agent_id and key_agent != agent_id:
-                continue
-            
-            for entry in entries:
-                if session_id and entry.session_id != session_id:
-                    continue
-                if memory_type and entry.memory_type != memory_type:
-                    continue
-                
-                memories.append(entry)
-        
-        # Trier et limiter
-        memories.sort(key=lambda x: (x.priority, x.timestamp), reverse=True)
-        return memories[:limit]
+        return self.local_memory.query(mission_id, agent_id, session_id, memory_type, limit)
+    
+    def _history_window_size(self) -> int:
+        return self.config.get('user_context', {}).get('history_window', 20)
     
     async def store_user_context(self, user_context: UserContext) -> bool:
-        """Stocke le contexte utilisateur"""
+        """
+        Stocke le contexte utilisateur
+        Seules les interactions nouvelles depuis le dernier chargement sont ajoutées au journal;
+        la ligne de contexte ne garde qu'une fenêtre récente (coût indépendant de l'historique)
+        """
         try:
-            # Redis pour accès rapide
+            persisted_in_window = max(0, user_context.interaction_count - user_context.history_offset)
+            new_interactions = user_context.interaction_history[persisted_in_window:]
+            window = user_context.interaction_history[-self._history_window_size():]
+            
+            # Base de données pour persistance (séquences attribuées par la base)
+            if self.db_session:
+                total_count = self._store_user_context_in_database(user_context, new_interactions, window)
+            else:
+                total_count = user_context.interaction_count + len(new_interactions)
+                if new_interactions and self.redis_client:
+                    self._append_interactions_to_stream(
+                        user_context.user_id, user_context.mission_id, user_context.interaction_count, new_interactions
+                    )
+            
+            # Redis pour accès rapide (contexte compact)
             if self.redis_client:
                 key = f"user_context:{user_context.user_id}:{user_context.mission_id}"
-                data = json.dumps(asdict(user_context), default=str)
-                self.redis_client.setex(key, 3600, data)  # 1h TTL
+                context_dict = asdict(user_context)
+                context_dict.update(
+                    interaction_history=window,
+                    interaction_count=total_count,
+                    history_offset=total_count - len(window)
+                )
+                self.redis_client.setex(key, 3600, json.dumps(context_dict, default=str))  # 1h TTL
+            
+            user_context.interaction_count = total_count
+            user_context.history_offset = total_count - len(user_context.interaction_history)
+            
+            logger.info(f"💾 Contexte utilisateur sauvegardé: {user_context.user_id} (+{len(new_interactions)} interactions)")
+            return True
             
-            # Base de données pour persistance
+        except Exception as e:
+            logger.error(f"❌ Erreur sauvegarde contexte utilisateur: {e}")
             if self.db_session:
-                db_entry = UserContextModel(
-                    id=f"{user_context.user_id}_{user_context.mission_id}",
+                self.db_session.rollback()
+            return False
+    
+    # Sauvegardes concurrentes d'un même contexte: nouvel essai après conflit de séquence
+    SEQUENCE_CONFLICT_RETRIES = 5
+    
+    def _next_interaction_sequence(self, user_id: str, mission_id: str) -> int:
+        last_sequence = self.db_session.query(func.max(UserInteractionModel.sequence)).filter(
+            UserInteractionModel.user_id == user_id,
+            UserInteractionModel.mission_id == mission_id
+        ).scalar()
+        return 0 if last_sequence is None else last_sequence + 1
+    
+    def _store_user_context_in_database(
+        self,
+        user_context: UserContext,
+        new_interactions: List[Dict[str, Any]],
+        window: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Ajoute les interactions au journal et met à jour la ligne de contexte dans une transaction
+        Les séquences suivent la dernière séquence en base; la contrainte unique
+        (user_id, mission_id, sequence) rejette une attribution concurrente, qui est recalculée
+        Retourne le nombre d'interactions persistées
+        """
+        context_id = f"{user_context.user_id}_{user_context.mission_id}"
+        now = datetime.utcnow()
+        
+        for attempt in range(self.SEQUENCE_CONFLICT_RETRIES):
+            first_sequence = self._next_interaction_sequence(user_context.user_id, user_context.mission_id)
+            total_count = first_sequence + len(new_interactions)
+            
+            self.db_session.add_all([
+                UserInteractionModel(
                     user_id=user_context.user_id,
                     mission_id=user_context.mission_id,
-                    preferences=json.dumps(user_context.preferences),
-                    interaction_history=json.dumps(user_context.interaction_history, default=str),
-                    learning_progress=json.dumps(user_context.learning_progress),
-                    last_activity=user_context.last_activity,
-                    session_count=user_context.session_count,
-                    total_time_spent=user_context.total_time_spent
+                    sequence=first_sequence + i,
+                    timestamp=now,
+                    payload=json.dumps(interaction, default=str)
                 )
+                for i, interaction in enumerate(new_interactions)
+            ])
+            
+            values = {
+                'preferences': json.dumps(user_context.preferences),
+                'interaction_history': json.dumps(window, default=str),
+                'learning_progress': json.dumps(user_context.learning_progress),
+                'last_activity': user_context.last_activity,
+                'session_count': user_context.session_count,
+                'total_time_spent': user_context.total_time_spent,
+                'interaction_count': total_count
+            }
+            
+            try:
+                # Upsert sans lecture préalable
+                updated = self.db_session.query(UserContextModel).filter(
+                    UserContextModel.id == context_id
+                ).update(values, synchronize_session=False)
                 
-                # Upsert
-                existing = self.db_session.query(UserContextModel).filter(
-                    UserContextModel.user_id == user_context.user_id,
-                    UserContextModel.mission_id == user_context.mission_id
-                ).first()
-                
-                if existing:
-                    for attr in ['preferences', 'interaction_history', 'learning_progress', 
-                               'last_activity', 'session_count', 'total_time_spent']:
-                        setattr(existing, attr, getattr(db_entry, attr))
-                else:
-                    self.db_session.add(db_entry)
+                if not updated:
+                    self.db_session.add(UserContextModel(
+                        id=context_id,
+                        user_id=user_context.user_id,
+                        mission_id=user_context.mission_id,
+                        **values
+                    ))
                 
                 self.db_session.commit()
+                return total_count
+            except IntegrityError:
+                self.db_session.rollback()
+                logger.info(f"🔁 Conflit de séquence pour {context_id}, nouvel essai ({attempt + 1})")
+        
+        raise RuntimeError(f"Séquences d'interaction non attribuées pour {context_id}")
+    
+    def _append_interactions_to_stream(
+        self,
+        user_id: str,
+        mission_id: str,
+        first_sequence: int,
+        interactions: List[Dict[str, Any]]
+    ):
+        """Ajoute des interactions au flux Redis (journal sans base de données)"""
+        stream_key = f"user_interactions:{user_id}:{mission_id}"
+        max_length = self.config.get('user_context', {}).get('stream_max_length', 10000)
+        pipeline = self.redis_client.pipeline()
+        for i, interaction in enumerate(interactions):
+            pipeline.xadd(
+                stream_key,
+                {'sequence': first_sequence + i, 'payload': json.dumps(interaction, default=str)},
+                maxlen=max_length,
+                approximate=True
+            )
+        pipeline.execute()
+    
+    async def get_interaction_history(
+        self,
+        user_id: str,
+        mission_id: str,
+        before_sequence: Optional[int] = None,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Lecture paginée du journal d'interactions, de la plus récente à la plus ancienne
+        next_cursor est à repasser en before_sequence pour la page suivante
+        """
+        interactions = []
+        
+        try:
+            if self.db_session:
+                query = self.db_session.query(UserInteractionModel).filter(
+                    UserInteractionModel.user_id == user_id,
+                    UserInteractionModel.mission_id == mission_id
+                )
+                if before_sequence is not None:
+                    query = query.filter(UserInteractionModel.sequence < before_sequence)
+                
+                rows = query.order_by(UserInteractionModel.sequence.desc()).limit(limit).all()
+                interactions = [
+                    {'sequence': row.sequence, 'timestamp': row.timestamp.isoformat(),
+                     'interaction': json.loads(row.payload)}
+                    for row in rows
+                ]
             
-            logger.info(f"💾 Contexte utilisateur sauvegardé: {user_context.user_id}")
-            return True
-            
+            elif self.redis_client:
+                stream_key = f"user_interactions:{user_id}:{mission_id}"
+                # Le filtre par séquence se fait côté client: on lit un peu plus large
+                entries = self.redis_client.xrevrange(stream_key, count=limit * 2 if before_sequence else limit)
+                for _, fields in entries:
+                    sequence = int(fields['sequence'])
+                    if before_sequence is not None and sequence >= before_sequence:
+                        continue
+                    interactions.append({'sequence': sequence, 'interaction': json.loads(fields['payload'])})
+                    if len(interactions) >= limit:
+                        break
+        
         except Exception as e:
-            logger.error(f"❌ Erreur sauvegarde contexte utilisateur: {e}")
-            return False
+            logger.error(f"❌ Erreur lecture journal interactions: {e}")
+        
+        next_cursor = interactions[-1]['sequence'] if len(interactions) == limit else None
+        return {'interactions': interactions, 'next_cursor': next_cursor}
     
     async def retrieve_user_context(self, user_id: str, mission_id: str) -> Optional[UserContext]:
-        """Récupère le contexte utilisateur"""
+        """Récupère le contexte utilisateur (fenêtre récente de l'historique)"""
         try:
             # Essayer Redis d'abord
             if self.redis_client:
@@ -534,15 +707,21 @@ class AgentMemoryService:
                 ).first()
                 
                 if db_entry:
+                    history = json.loads(db_entry.interaction_history)
+                    # Ligne antérieure au journal: l'historique complet sera migré à la prochaine sauvegarde
+                    interaction_count = db_entry.interaction_count or 0
+                    
                     return UserContext(
                         user_id=db_entry.user_id,
                         mission_id=db_entry.mission_id,
                         preferences=json.loads(db_entry.preferences),
-                        interaction_history=json.loads(db_entry.interaction_history),
+                        interaction_history=history,
                         learning_progress=json.loads(db_entry.learning_progress),
                         last_activity=db_entry.last_activity,
                         session_count=db_entry.session_count,
-                        total_time_spent=db_entry.total_time_spent
+                        total_time_spent=db_entry.total_time_spent,
+                        interaction_count=interaction_count,
+                        history_offset=interaction_count - len(history) if db_entry.interaction_count is not None else 0
                     )
             
             return None
@@ -551,35 +730,120 @@ class AgentMemoryService:
             logger.error(f"❌ Erreur récupération contexte utilisateur: {e}")
             return None
     
-    async def cleanup_expired_memories(self):
-        """Nettoie les mémoires expirées"""
+    async def cleanup_expired_memories(
+        self,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None
+    ) -> int:
+        """
+        Nettoie les mémoires expirées par lots bornés
+        Chaque lot est une transaction courte; la boucle rend la main entre deux lots
+        """
+        sweeper_config = self.config.get('sweeper', {})
+        batch_size = batch_size or sweeper_config.get('batch_size', 500)
+        max_batches = max_batches or sweeper_config.get('max_batches', 20)
+        total_deleted = 0
+        
         try:
             now = datetime.utcnow()
             
             # Nettoyage base de données
             if self.db_session:
-                expired_count = self.db_session.query(AgentMemoryModel).filter(
-                    AgentMemoryModel.expires_at < now
-                ).delete()
-                self.db_session.commit()
+                for _ in range(max_batches):
+                    deleted = self._delete_expired_batch(now, batch_size)
+                    total_deleted += deleted
+                    if deleted < batch_size:
+                        break
+                    await asyncio.sleep(0)
                 
-                if expired_count > 0:
-                    logger.info(f"🧹 {expired_count} mémoires expirées supprimées de la DB")
+                retention_days = sweeper_config.get('user_context_retention_days')
+                if retention_days:
+                    self._delete_inactive_user_contexts(
+                        now - timedelta(days=retention_days), batch_size
+                    )
+                
+                if total_deleted > 0:
+                    logger.info(f"🧹 {total_deleted} mémoires expirées supprimées de la DB")
             
             # Redis se nettoie automatiquement avec TTL
             
             # Nettoyage mémoire locale
-            for key in list(self.local_memory.keys()):
-                self.local_memory[key] = [
-                    memory for memory in self.local_memory[key]
-                    if memory.expires_at is None or memory.expires_at > now
-                ]
-                
-                if not self.local_memory[key]:
-                    del self.local_memory[key]
+            self.local_memory.remove_expired(now)
             
         except Exception as e:
             logger.error(f"❌ Erreur nettoyage mémoires: {e}")
+            if self.db_session:
+                self.db_session.rollback()
+        
+        return total_deleted
+    
+    def _delete_expired_batch(self, now: datetime, batch_size: int) -> int:
+        """Supprime un lot de mémoires expirées (via l'index partiel sur expires_at)"""
+        expired_ids = [
+            row.id for row in self.db_session.query(AgentMemoryModel.id).filter(
+                AgentMemoryModel.expires_at.isnot(None),
+                AgentMemoryModel.expires_at < now
+            ).limit(batch_size)
+        ]
+        if not expired_ids:
+            return 0
+        
+        deleted = self.db_session.query(AgentMemoryModel).filter(
+            AgentMemoryModel.id.in_(expired_ids)
+        ).delete(synchronize_session=False)
+        self.db_session.commit()
+        return deleted
+    
+    def _delete_inactive_user_contexts(self, cutoff: datetime, batch_size: int) -> int:
+        """Supprime un lot de contextes utilisateur inactifs (et leur journal) depuis la date limite"""
+        inactive = self.db_session.query(
+            UserContextModel.id, UserContextModel.user_id, UserContextModel.mission_id
+        ).filter(
+            UserContextModel.last_activity < cutoff
+        ).limit(batch_size).all()
+        if not inactive:
+            return 0
+        
+        for row in inactive:
+            self.db_session.query(UserInteractionModel).filter(
+                UserInteractionModel.user_id == row.user_id,
+                UserInteractionModel.mission_id == row.mission_id
+            ).delete(synchronize_session=False)
+        
+        deleted = self.db_session.query(UserContextModel).filter(
+            UserContextModel.id.in_([row.id for row in inactive])
+        ).delete(synchronize_session=False)
+        self.db_session.commit()
+        
+        logger.info(f"🧹 {deleted} contextes utilisateur inactifs supprimés de la DB")
+        return deleted
+    
+    def start_expiry_sweeper(self, interval_seconds: Optional[float] = None):
+        """Planifie le nettoyage périodique des mémoires expirées (boucle asyncio courante)"""
+        if self._sweeper_task and not self._sweeper_task.done():
+            return
+        
+        interval = interval_seconds or self.config.get('sweeper', {}).get('interval_seconds', 300)
+        self._sweeper_task = asyncio.create_task(self._expiry_sweeper_loop(interval))
+        logger.info(f"🧹 Balayage des mémoires expirées planifié toutes les {interval}s")
+    
+    async def stop_expiry_sweeper(self):
+        """Arrête le balayage périodique"""
+        if not self._sweeper_task:
+            return
+        
+        self._sweeper_task.cancel()
+        try:
+            await self._sweeper_task
+        except asyncio.CancelledError:
+            pass
+        self._sweeper_task = None
+    
+    async def _expiry_sweeper_loop(self, interval: float):
+        """Boucle de balayage: les erreurs sont journalisées sans arrêter la boucle"""
+        while True:
+            await asyncio.sleep(interval)
+            await self.cleanup_expired_memories()
     
     def is_ready(self) -> bool:
         """Vérifie si le service est prêt"""
@@ -591,7 +855,9 @@ class AgentMemoryService:
             "redis_connected": self.redis_client is not None,
             "database_connected": self.db_session is not None,
             "celery_available": self.celery_app is not None,
-            "local_memory_entries": sum(len(entries) for entries in self.local_memory.values()),
+            "expiry_sweeper_running": self._sweeper_task is not None and not self._sweeper_task.done(),
+            "local_memory_entries": len(self.local_memory),
+            "local_memory": self.local_memory.get_stats(),
             "ready": self.is_ready()
         }
 
@@ -0,0 +1,126 @@
+"""
+🗃️ REQUÊTES DES TABLES AI
+Construction des requêtes de UnifiedDBService (insertions en lot, pages par clé)
+Le modèle est passé en paramètre: classe ORM ou colonnes d'une Table (table.c)
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import insert, or_, select
+
+from services.keyset_cursor import encode_cursor, keyset_before
+from utils.keyset import keyset_order_by
+
+# Lignes par INSERT multi-VALUES (PostgreSQL limite une requête à 65535 paramètres)
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+# === INSERTIONS EN LOT ===
+
+def agent_memory_row(mission_id: str, user_id: str, agent_type: str, memory_type: str,
+                     content: dict, relevance_score: float = 0.5, tags: List[str] = None,
+                     expires_hours: int = None) -> Dict[str, Any]:
+    """Ligne agent_memory (paramètres de store_agent_memory), ID généré côté client"""
+    expires_at = None
+    if expires_hours:
+        expires_at = datetime.utcnow() + timedelta(hours=expires_hours)
+
+    return {
+        'id': uuid.uuid4(),
+        'mission_id': mission_id,
+        'user_id': user_id,
+        'agent_type': agent_type,
+        'memory_type': memory_type,
+        'content': content,
+        'relevance_score': relevance_score,
+        'tags': tags or [],
+        'meta_data': {},
+        'expires_at': expires_at
+    }
+
+
+def ai_suggestion_row(mission_id: str, user_id: str, suggestion_type: str, content: str,
+                      confidence_score: float, context_data: dict = None,
+                      workshop_id: str = None) -> Dict[str, Any]:
+    """Ligne ai_suggestions (paramètres de create_ai_suggestion), ID généré côté client"""
+    return {
+        'id': uuid.uuid4(),
+        'mission_id': mission_id,
+        'workshop_id': workshop_id,
+        'user_id': user_id,
+        'suggestion_type': suggestion_type,
+        'content': content,
+        'confidence_score': confidence_score,
+        'context_data': context_data or {}
+    }
+
+
+def bulk_insert_statements(table, rows: List[Dict[str, Any]],
+                           chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    INSERT multi-VALUES par paquet de chunk_size lignes
+    Les IDs sont générés côté client: l'ordre retourné est celui des entrées
+    """
+    for start in range(0, len(rows), chunk_size):
+        yield insert(table).values(rows[start:start + chunk_size])
+
+
+# === PAGINATION PAR CLÉ ===
+
+def agent_memory_stmt(model, columns: List[Any], mission_id: str, agent_type: str,
+                      memory_type: Optional[str]):
+    """Mémoire non expirée d'un agent, ordre servi par idx_agent_memory_mission_agent_relevance"""
+    stmt = select(*columns).where(
+        model.mission_id == mission_id,
+        model.agent_type == agent_type,
+        or_(
+            model.expires_at.is_(None),
+            model.expires_at > datetime.utcnow()
+        )
+    )
+
+    if memory_type:
+        stmt = stmt.where(model.memory_type == memory_type)
+
+    return stmt.order_by(*keyset_order_by(model.relevance_score, model.created_at, model.id))
+
+
+def ai_suggestions_stmt(model, columns: List[Any], mission_id: str, suggestion_type: Optional[str],
+                        workshop_id: Optional[str]):
+    """Suggestions d'une mission, ordre servi par idx_ai_suggestions_mission_confidence"""
+    stmt = select(*columns).where(model.mission_id == mission_id)
+
+    if suggestion_type:
+        stmt = stmt.where(model.suggestion_type == suggestion_type)
+
+    if workshop_id:
+        stmt = stmt.where(model.workshop_id == workshop_id)
+
+    return stmt.order_by(*keyset_order_by(model.confidence_score, model.created_at, model.id))
+
+
+def page_stmt(stmt, score_column, created_at_column, id_column, limit: int, cursor: Optional[str]):
+    """Page suivant le curseur; lève ValueError si le curseur est invalide"""
+    if cursor:
+        stmt = stmt.where(keyset_before(score_column, created_at_column, id_column, cursor))
+
+    # Une ligne de plus pour savoir s'il existe une page suivante
+    return stmt.limit(limit + 1)
+
+
+def keyset_page(rows: List[Any], limit: int, score_attribute: str) -> Dict[str, Any]:
+    """{'items': [...], 'next_cursor': str | None} depuis les limit + 1 lignes de page_stmt"""
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, score_attribute), last.created_at, last.id)
+    return {'items': items, 'next_cursor': next_cursor}
+
+
+__all__ = [
+    'BULK_INSERT_CHUNK_SIZE', 'agent_memory_row', 'ai_suggestion_row', 'bulk_insert_statements',
+    'agent_memory_stmt', 'ai_suggestions_stmt', 'page_stmt', 'keyset_page'
+]
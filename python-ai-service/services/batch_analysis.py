@@ -0,0 +1,101 @@
+"""
+📦 ANALYSE PAR LOTS DE MISSIONS
+Métriques Workshop 1 vectorisées sur N missions et cohérence sémantique
+calculée sur un encodage partagé (un seul appel au modèle par lot de textes)
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+CATEGORIES = ('business_values', 'essential_assets', 'supporting_assets', 'dreaded_events')
+
+
+def element_texts(mission: Dict[str, Any]) -> List[str]:
+    """Textes à encoder pour une mission (nom et description de chaque élément)"""
+    return [
+        f"{element.get('name', '')}. {element.get('description', '')}".strip()
+        for category in CATEGORIES
+        for element in mission.get(category) or []
+    ]
+
+
+def vectorized_metrics(missions: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Comptes par catégorie, complétude et niveau de détail pour toutes les missions
+    (mêmes règles que Workshop1AIService._calculate_quality_metrics)
+    """
+    counts = np.array(
+        [[len(mission.get(category) or []) for category in CATEGORIES] for mission in missions],
+        dtype=np.int64
+    ).reshape(len(missions), len(CATEGORIES))
+
+    owners, lengths = [], []
+    for index, mission in enumerate(missions):
+        for category in CATEGORIES:
+            for element in mission.get(category) or []:
+                description = element.get('description')
+                if description:
+                    owners.append(index)
+                    lengths.append(len(description))
+
+    owners = np.asarray(owners, dtype=np.int64)
+    described = np.bincount(owners, minlength=len(missions))
+    total_length = np.bincount(owners, weights=np.asarray(lengths, dtype=np.float64), minlength=len(missions))
+    average_length = np.divide(total_length, described, out=np.zeros(len(missions)), where=described > 0)
+
+    return {
+        'counts': counts,
+        'completion': counts > 0,
+        'completeness': (counts > 0).sum(axis=1) * 25.0,
+        'detail_level': np.minimum(100.0, average_length)
+    }
+
+
+def segment_coherence(embeddings: np.ndarray, sizes: Sequence[int]) -> np.ndarray:
+    """
+    Similarité cosinus moyenne entre éléments d'une même mission (0-100), en O(n·d)
+    Vecteurs unitaires: somme des similarités hors diagonale = ||Σu||² - n
+    NaN pour les missions de moins de deux éléments
+    """
+    sizes = np.asarray(sizes, dtype=np.int64)
+    scores = np.full(len(sizes), np.nan)
+    if not len(sizes) or embeddings.size == 0:
+        return scores
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    unit = embeddings / np.where(norms > 0, norms, 1.0)
+
+    non_empty = sizes > 0
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))[non_empty]
+    sums = np.add.reduceat(unit, starts, axis=0)
+    n = sizes[non_empty].astype(np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_similarity = ((sums ** 2).sum(axis=1) - n) / (n * (n - 1))
+    scores[non_empty] = np.where(n > 1, np.clip(mean_similarity, 0.0, 1.0) * 100.0, np.nan)
+    return scores
+
+
+def plan_encode_batches(text_counts: Sequence[int], max_texts: int) -> List[List[int]]:
+    """
+    Regroupe des missions consécutives jusqu'à `max_texts` textes par encodage
+    (une mission plus grande que la limite forme son propre lot)
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_texts = 0
+
+    for index, count in enumerate(text_counts):
+        if current and current_texts + count > max_texts:
+            batches.append(current)
+            current, current_texts = [], 0
+        current.append(index)
+        current_texts += count
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+__all__ = ['CATEGORIES', 'element_texts', 'vectorized_metrics', 'segment_coherence', 'plan_encode_batches']
@@ -0,0 +1,269 @@
+"""
+🗜️ COMPRESSION DES RÉPONSES
+gzip et brotli négociés depuis Accept-Encoding, pour les réponses JSON volumineuses
+(orchestration: semantic_graph, clusters, réponses RAG) et les flux NDJSON/SSE
+- middleware ASGI pour FastAPI, hook after_request pour les applications Flask
+- seuil de taille minimal et niveaux configurables (AI_COMPRESSION_*)
+"""
+
+import logging
+import os
+import zlib
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+from services.optional_dependencies import module_available
+
+logger = logging.getLogger(__name__)
+
+BROTLI_AVAILABLE = module_available('brotli')
+if not BROTLI_AVAILABLE:
+    logging.warning("🔧 brotli non disponible, compression gzip uniquement")
+
+# Types textuels: JSON, NDJSON, SSE, texte (les métriques Prometheus comprises)
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/', 'application/javascript',
+                      'application/xml')
+
+
+@dataclass
+class CompressionSettings:
+    """
+    minimum_size: en dessous, l'en-tête gzip et le coût CPU ne sont pas rentables
+    brotli_quality: 4-5 pour la compression à la volée (11 est réservé aux contenus statiques)
+    """
+    minimum_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 4
+    enabled: bool = True
+
+    @classmethod
+    def from_env(cls) -> 'CompressionSettings':
+        return cls(
+            minimum_size=int(os.getenv('AI_COMPRESSION_MIN_SIZE', '1024')),
+            gzip_level=int(os.getenv('AI_COMPRESSION_GZIP_LEVEL', '6')),
+            brotli_quality=int(os.getenv('AI_COMPRESSION_BROTLI_QUALITY', '4')),
+            enabled=os.getenv('AI_COMPRESSION_ENABLED', 'true').lower() == 'true'
+        )
+
+    @property
+    def encodings(self) -> Tuple[str, ...]:
+        """Encodages proposés, par préférence du serveur"""
+        return ('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Sequence[str]) -> Optional[str]:
+    """
+    Encodage retenu selon Accept-Encoding (valeurs q, '*', q=0 exclut)
+    À q égal, l'ordre de `available` départage
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+
+class _Compressor:
+    """Flux compressé: compress() + flush() (flux en cours) ou finish() (fin de corps)"""
+
+    def __init__(self, encoding: str, settings: CompressionSettings):
+        if encoding == 'br':
+            import brotli
+
+            self._brotli = brotli.Compressor(quality=settings.brotli_quality, mode=brotli.MODE_TEXT)
+            self._zlib = None
+        else:
+            self._brotli = None
+            # wbits 16 + MAX_WBITS: conteneur gzip
+            self._zlib = zlib.compressobj(settings.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data) if self._brotli else self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        """Vide le tampon pour que le client puisse décoder ce qui a été émis (NDJSON, SSE)"""
+        return self._brotli.flush() if self._brotli else self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._brotli.finish() if self._brotli else self._zlib.flush()
+
+
+def compress_bytes(data: bytes, encoding: str, settings: CompressionSettings) -> bytes:
+    compressor = _Compressor(encoding, settings)
+    return compressor.compress(data) + compressor.finish()
+
+
+def weak_etag(etag: Optional[str]) -> Optional[str]:
+    """Un ETag fort désigne des octets précis: la version compressée n'a plus qu'un ETag faible"""
+    if etag and not etag.startswith('W/'):
+        return f"W/{etag}"
+    return etag
+
+
+# === ASGI (FastAPI) ===
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI
+    - corps complet: compressé au-delà de minimum_size (Content-Length recalculé)
+    - réponse en flux: chaque morceau est compressé puis vidé, pour ne pas retarder les événements
+    """
+
+    def __init__(self, app, settings: Optional[CompressionSettings] = None):
+        self.app = app
+        self.settings = settings or CompressionSettings.from_env()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self.settings.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for name, value in scope.get('headers', ()):
+            if name == b'accept-encoding':
+                accept_encoding = value.decode('latin-1')
+                break
+
+        encoding = negotiate_encoding(accept_encoding, self.settings.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.settings).send)
+
+
+class _CompressingSender:
+    def __init__(self, send, encoding: str, settings: CompressionSettings):
+        self._send = send
+        self._encoding = encoding
+        self._settings = settings
+        self._start = None
+        self._compressor: Optional[_Compressor] = None
+        self._passthrough = False
+
+    async def send(self, message):
+        message_type = message['type']
+        if message_type == 'http.response.start':
+            self._start = message
+            return
+        if message_type != 'http.response.body' or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+        if self._compressor is None:
+            if not self._should_compress(body, more_body):
+                self._passthrough = True
+                await self._send(self._start)
+                await self._send(message)
+                return
+            self._compressor = _Compressor(self._encoding, self._settings)
+            headers = self._compressed_headers()
+            if not more_body:
+                body = self._compressor.compress(body) + self._compressor.finish()
+                headers.append((b'content-length', str(len(body)).encode('latin-1')))
+                await self._send({**self._start, 'headers': headers})
+                await self._send({'type': 'http.response.body', 'body': body})
+                return
+            await self._send({**self._start, 'headers': headers})
+
+        data = self._compressor.compress(body)
+        data += self._compressor.flush() if more_body else self._compressor.finish()
+        await self._send({'type': 'http.response.body', 'body': data, 'more_body': more_body})
+
+    def _should_compress(self, body: bytes, more_body: bool) -> bool:
+        status = self._start['status']
+        if status < 200 or status in (204, 304):
+            return False
+        content_type = None
+        for name, value in self._start.get('headers', ()):
+            if name == b'content-encoding':
+                return False
+            if name == b'content-type':
+                content_type = value.decode('latin-1')
+        if not is_compressible(content_type):
+            return False
+        # Taille inconnue d'une réponse en flux: compressée d'office
+        return more_body or len(body) >= self._settings.minimum_size
+
+    def _compressed_headers(self):
+        headers = []
+        vary = None
+        for name, value in self._start.get('headers', ()):
+            if name == b'content-length':
+                continue
+            if name == b'vary':
+                vary = value
+                continue
+            if name == b'etag':
+                value = weak_etag(value.decode('latin-1')).encode('latin-1')
+            headers.append((name, value))
+        if vary is None:
+            vary = b'Accept-Encoding'
+        elif b'accept-encoding' not in vary.lower() and vary.strip() != b'*':
+            vary += b', Accept-Encoding'
+        headers.append((b'vary', vary))
+        headers.append((b'content-encoding', self._encoding.encode('latin-1')))
+        return headers
+
+
+# === WSGI (Flask) ===
+
+def install_flask_compression(app, settings: Optional[CompressionSettings] = None):
+    """Compresse les réponses Flask non diffusées en flux (hook after_request)"""
+    settings = settings or CompressionSettings.from_env()
+    if not settings.enabled:
+        return
+
+    from flask import request
+
+    @app.after_request
+    def compress_response(response):
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers or not is_compressible(response.content_type)):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding'), settings.encodings)
+        data = response.get_data()
+        if encoding is None or len(data) < settings.minimum_size:
+            return response
+
+        response.set_data(compress_bytes(data, encoding, settings))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    logger.info(f"🗜️ Compression des réponses activée ({', '.join(settings.encodings)})")
+
+
+__all__ = [
+    'CompressionMiddleware', 'CompressionSettings', 'install_flask_compression',
+    'negotiate_encoding', 'compress_bytes', 'is_compressible', 'weak_etag', 'BROTLI_AVAILABLE'
+]
@@ -5,6 +5,7 @@ Point 3.1 - Phase 3: RAG et Base de Connaissances
 """
 
 import asyncio
+import hashlib
 import logging
 import os
 from datetime import datetime
@@ -24,13 +25,14 @@ class Response:
         self.response = ""
         self.source_nodes = []
 
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+from services.optional_dependencies import module_available
+
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available('sentence_transformers')
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
     logging.warning("🔧 Sentence-Transformers non disponible pour RAG")
 
+from services.tracing import annotate, traced
+
 logger = logging.getLogger(__name__)
 
 # === MODÈLES DE DONNÉES ===
@@ -73,6 +75,8 @@ class EbiosRAGService:
         self.pinecone_client = None
         self.sentence_model = None
         self.knowledge_base = []
+        # Empreinte des documents chargés, changée à chaque ajout (ETag des analyses)
+        self.knowledge_generation = ""
         self.index_name = "ebios-rag-knowledge"
         
         # Initialisation sécurisée
@@ -102,6 +106,8 @@ class EbiosRAGService:
     def _setup_sentence_transformers(self):
         """Configure Sentence-Transformers pour embeddings"""
         try:
+            from sentence_transformers import SentenceTransformer
+
             model_name = self.config.get('embedding_model', 'all-MiniLM-L6-v2')
             self.sentence_model = SentenceTransformer(model_name)
             logger.info(f"✅ Sentence-Transformers chargé: {model_name}")
@@ -257,6 +263,7 @@ class EbiosRAGService:
             doc.metadata = {"length": len(item["content"])}
             
             self.knowledge_base.append(doc)
+            self._advance_generation(doc)
         
         logger.info(f"✅ Base de connaissances chargée: {len(self.knowledge_base)} documents")
     
@@ -270,6 +277,7 @@ class EbiosRAGService:
 
         return True
     
+    @traced("rag.query_ebios_knowledge")
     async def query_ebios_knowledge(
         self, 
         query: str, 
@@ -279,6 +287,7 @@ class EbiosRAGService:
         Interroge la base de connaissances EBIOS RM
         """
         logger.info(f"📚 Requête RAG: {query[:50]}...")
+        annotate(query_length=len(query))
         
         result = RAGQueryResult()
         result.query = query
@@ -290,6 +299,7 @@ class EbiosRAGService:
             result.confidence = response["confidence"]
             result.sources = response["sources"]
             result.context_used = response["context"]
+            annotate(source_count=len(result.sources), confidence=result.confidence)
             
             logger.info(f"✅ Requête RAG traitée - Confiance: {result.confidence:.2f}")
             return result
@@ -412,6 +422,7 @@ class EbiosRAGService:
         """Ajoute un document à la base de connaissances"""
         try:
             self.knowledge_base.append(document)
+            self._advance_generation(document)
             
             # Reconstruire l'index si nécessaire
             if self.vector_index and LLAMA_INDEX_AVAILABLE:
@@ -424,6 +435,13 @@ class EbiosRAGService:
             logger.error(f"❌ Erreur ajout document: {e}")
             return False
     
+    def _advance_generation(self, document: EbiosKnowledgeDocument):
+        """Chaîne l'empreinte de la base avec celle du nouveau document"""
+        digest = hashlib.sha256(self.knowledge_generation.encode())
+        digest.update(document.id.encode())
+        digest.update(document.content.encode())
+        self.knowledge_generation = digest.hexdigest()[:16]
+
     def is_ready(self) -> bool:
         """Vérifie si le service RAG est prêt"""
         return len(self.knowledge_base) > 0
@@ -452,6 +470,7 @@ class EbiosRAGService:
         
         return {
             "total_documents": len(self.knowledge_base),
+            "generation": self.knowledge_generation,
             "categories": categories,
             "average_content_length": total_content_length // len(self.knowledge_base) if self.knowledge_base else 0,
             "total_content_length": total_content_length
@@ -0,0 +1,60 @@
+"""
+🏷️ REQUÊTES CONDITIONNELLES (ETag / If-None-Match)
+Les analyses sont des fonctions déterministes des données soumises et des versions
+(modèles, base de connaissances): leur empreinte sert d'ETag fort et un client qui
+la présente reçoit 304 sans qu'aucun calcul ne soit relancé
+"""
+
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import Response
+
+from services.optional_dependencies import module_available
+
+ORJSON_AVAILABLE = module_available('orjson')
+
+# Le cache (client ou proxy) doit revalider à chaque usage: la 304 ne coûte qu'un hachage
+CACHE_CONTROL = "no-cache"
+
+
+def canonical_bytes(value: Any) -> bytes:
+    """JSON canonique (clés triées, sans espaces): mêmes données, mêmes octets"""
+    if ORJSON_AVAILABLE:
+        import orjson
+
+        return orjson.dumps(value, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=str, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def compute_etag(payload: Any, *versions: Any) -> str:
+    """ETag fort: empreinte du contenu soumis et des versions dont dépend la réponse"""
+    digest = hashlib.sha256(canonical_bytes(payload))
+    for version in versions:
+        digest.update(b'\x00')
+        digest.update(canonical_bytes(version))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match (liste séparée par des virgules, '*', comparaison faible: préfixe W/ ignoré)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    """304 sans corps, avec l'ETag courant"""
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+__all__ = ['compute_etag', 'etag_matches', 'cache_headers', 'not_modified', 'canonical_bytes', 'CACHE_CONTROL']
@@ -0,0 +1,137 @@
+"""
+⚡ SÉRIALISATION JSON RAPIDE
+Réponses orjson (numpy, datetime, dataclasses natifs) sans passer par jsonable_encoder,
+avec encodages compacts optionnels des matrices (float16 base64, triplets creux)
+"""
+
+import base64
+import dataclasses
+import json
+import logging
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, List, Union
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+from services.optional_dependencies import module_available
+
+logger = logging.getLogger(__name__)
+
+ORJSON_AVAILABLE = module_available('orjson')
+if not ORJSON_AVAILABLE:
+    logging.warning("🔧 orjson non disponible, sérialisation json standard")
+
+# Encodages des tableaux numpy à 2 dimensions ou plus (similarity_matrix...)
+MATRIX_LIST = 'list'
+MATRIX_FLOAT16 = 'float16-base64'
+MATRIX_SPARSE = 'sparse'
+MATRIX_ENCODINGS = (MATRIX_LIST, MATRIX_FLOAT16, MATRIX_SPARSE)
+
+
+def encode_matrix(array: np.ndarray, encoding: str = MATRIX_LIST,
+                  threshold: float = 0.0) -> Union[List[Any], Dict[str, Any]]:
+    """
+    Représentation JSON d'une matrice
+    - list: listes imbriquées
+    - float16-base64: octets float16 little-endian en base64 (précision ~3 décimales)
+    - sparse: triplets (ligne, colonne, valeur) des cellules où |valeur| > threshold
+    """
+    if encoding == MATRIX_FLOAT16:
+        data = np.ascontiguousarray(array, dtype='<f2').tobytes()
+        return {
+            'encoding': MATRIX_FLOAT16,
+            'shape': list(array.shape),
+            'data': base64.b64encode(data).decode('ascii')
+        }
+
+    if encoding == MATRIX_SPARSE and array.ndim == 2:
+        rows, cols = np.nonzero(np.abs(array) > threshold)
+        return {
+            'encoding': MATRIX_SPARSE,
+            'shape': list(array.shape),
+            'threshold': threshold,
+            'rows': rows.tolist(),
+            'cols': cols.tolist(),
+            'values': array[rows, cols].tolist()
+        }
+
+    return array.tolist()
+
+
+def decode_matrix(payload: Union[List[Any], Dict[str, Any]]) -> np.ndarray:
+    """Inverse de encode_matrix (cellules creuses absentes à 0)"""
+    if isinstance(payload, list):
+        return np.asarray(payload, dtype=np.float64)
+
+    shape = tuple(payload['shape'])
+    if payload['encoding'] == MATRIX_FLOAT16:
+        data = np.frombuffer(base64.b64decode(payload['data']), dtype='<f2')
+        return data.astype(np.float64).reshape(shape)
+
+    matrix = np.zeros(shape, dtype=np.float64)
+    matrix[payload['rows'], payload['cols']] = payload['values']
+    return matrix
+
+
+def _default_encoder(matrix_encoding: str, threshold: float):
+    """Types non natifs (orjson) ou non standard (json)"""
+    def default(obj: Any) -> Any:
+        if isinstance(obj, np.ndarray):
+            if obj.ndim >= 2:
+                return encode_matrix(obj, matrix_encoding, threshold)
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        if isinstance(obj, Enum):
+            return obj.value
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        if hasattr(obj, 'model_dump'):
+            return obj.model_dump()
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return dataclasses.asdict(obj)
+        if hasattr(obj, '__dict__'):
+            return {key: value for key, value in vars(obj).items() if not key.startswith('_')}
+        raise TypeError(f"Type non sérialisable en JSON: {type(obj).__name__}")
+    return default
+
+
+def dumps(content: Any, matrix_encoding: str = MATRIX_LIST, threshold: float = 0.0) -> bytes:
+    """Sérialise en JSON UTF-8 (orjson si disponible)"""
+    default = _default_encoder(matrix_encoding, threshold)
+    if ORJSON_AVAILABLE:
+        import orjson
+
+        option = orjson.OPT_NON_STR_KEYS
+        if matrix_encoding == MATRIX_LIST:
+            # Tableaux sérialisés nativement; sinon ils passent par default (encodage compact)
+            option |= orjson.OPT_SERIALIZE_NUMPY
+        return orjson.dumps(content, default=default, option=option)
+
+    return json.dumps(content, default=default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Réponse JSON orjson
+    Retournée directement par un endpoint, elle évite le passage par jsonable_encoder
+    """
+
+    def __init__(self, content: Any, matrix_encoding: str = MATRIX_LIST, matrix_threshold: float = 0.0,
+                 **kwargs):
+        self.matrix_encoding = matrix_encoding
+        self.matrix_threshold = matrix_threshold
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content, self.matrix_encoding, self.matrix_threshold)
+
+
+__all__ = [
+    'FastJSONResponse', 'dumps', 'encode_matrix', 'decode_matrix', 'ORJSON_AVAILABLE',
+    'MATRIX_ENCODINGS', 'MATRIX_LIST', 'MATRIX_FLOAT16', 'MATRIX_SPARSE'
+]
@@ -0,0 +1,493 @@
+"""
+📬 FILE DE TÂCHES EN ARRIÈRE-PLAN
+Tâches longues (auto-complétion, génération) identifiées par un job_id, persistées
+en SQLite (file partagée entre workers d'un même hôte) ou en mémoire en repli,
+exécutées par un nombre borné de workers avec progression, résultat et annulation
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobNotFoundError(KeyError):
+    """Aucune tâche avec cet identifiant"""
+
+
+class JobCancelledError(Exception):
+    """Levée par JobContext.raise_if_cancelled dans un gestionnaire annulé"""
+
+
+@dataclass
+class Job:
+    """Tâche de la file (sérialisée telle quelle par GET /jobs/{id})"""
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    state: str = QUEUED
+    progress: float = 0.0
+    message: Optional[str] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for key in ('worker_id', 'lease_expires_at'):
+            data.pop(key)
+        return data
+
+
+# === STOCKAGE ===
+
+class MemoryJobStore:
+    """Stockage en processus (repli): perdu au redémarrage, non partagé entre workers"""
+
+    persistent = False
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def add(self, job: Job):
+        with self._lock:
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return Job(**asdict(job)) if job else None
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        with self._lock:
+            queued = [job for job in self._jobs.values() if job.state == QUEUED]
+            if not queued:
+                return None
+            job = min(queued, key=lambda item: item.created_at)
+            job.state, job.worker_id = RUNNING, worker_id
+            job.started_at = time.time()
+            job.lease_expires_at = job.started_at + lease_seconds
+            job.attempts += 1
+            return Job(**asdict(job))
+
+    def update(self, job_id: str, only_if_state: Optional[str] = None,
+               only_if_worker: Optional[str] = None, **changes) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or (only_if_state and job.state != only_if_state):
+                return False
+            if only_if_worker and job.worker_id != only_if_worker:
+                return False
+            for key, value in changes.items():
+                setattr(job, key, value)
+            return True
+
+    def requeue_expired(self, now: float) -> int:
+        with self._lock:
+            expired = [job for job in self._jobs.values()
+                       if job.state == RUNNING and job.lease_expires_at and job.lease_expires_at < now]
+            for job in expired:
+                job.state, job.worker_id, job.lease_expires_at = QUEUED, None, None
+            return len(expired)
+
+    def purge_finished(self, before: float) -> int:
+        with self._lock:
+            old = [job_id for job_id, job in self._jobs.items()
+                   if job.state in FINISHED_STATES and job.finished_at and job.finished_at < before]
+            for job_id in old:
+                del self._jobs[job_id]
+            return len(old)
+
+
+class SQLiteJobStore:
+    """
+    Stockage SQLite: survit aux redémarrages et partagé par les workers d'un même hôte
+    (réservation atomique d'une tâche par BEGIN IMMEDIATE)
+    """
+
+    persistent = True
+
+    _COLUMNS = [name for name in Job.__dataclass_fields__]
+    _JSON_COLUMNS = ('payload', 'result')
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT, state TEXT NOT NULL, '
+            'progress REAL, message TEXT, result TEXT, error TEXT, cancel_requested INTEGER, '
+            'attempts INTEGER, worker_id TEXT, lease_expires_at REAL, '
+            'created_at REAL, started_at REAL, finished_at REAL)'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS ix_jobs_state_created ON jobs (state, created_at)')
+
+    def _row_to_job(self, row) -> Job:
+        data = dict(zip(self._COLUMNS, row))
+        for key in self._JSON_COLUMNS:
+            data[key] = json.loads(data[key]) if data[key] is not None else None
+        data['cancel_requested'] = bool(data['cancel_requested'])
+        return Job(**data)
+
+    @classmethod
+    def _encode(cls, key: str, value: Any) -> Any:
+        if key in cls._JSON_COLUMNS and value is not None:
+            return json.dumps(value, ensure_ascii=False, default=str)
+        return value
+
+    def add(self, job: Job):
+        values = [self._encode(key, value) for key, value in asdict(job).items()]
+        with self._lock:
+            self._connection.execute(
+                f"INSERT INTO jobs ({', '.join(self._COLUMNS)}) VALUES ({', '.join('?' * len(values))})",
+                values
+            )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        with self._lock:
+            self._connection.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._connection.execute(
+                    "SELECT id FROM jobs WHERE state = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    self._connection.execute('COMMIT')
+                    return None
+                now = time.time()
+                self._connection.execute(
+                    "UPDATE jobs SET state = ?, worker_id = ?, started_at = ?, lease_expires_at = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (RUNNING, worker_id, now, now + lease_seconds, row[0])
+                )
+                self._connection.execute('COMMIT')
+            except Exception:
+                self._connection.execute('ROLLBACK')
+                raise
+        return self.get(row[0])
+
+    def update(self, job_id: str, only_if_state: Optional[str] = None,
+               only_if_worker: Optional[str] = None, **changes) -> bool:
+        assignments = ', '.join(f"{key} = ?" for key in changes)
+        values = [self._encode(key, value) for key, value in changes.items()]
+        query = f"UPDATE jobs SET {assignments} WHERE id = ?"
+        values.append(job_id)
+        if only_if_state:
+            query += " AND state = ?"
+            values.append(only_if_state)
+        if only_if_worker:
+            query += " AND worker_id = ?"
+            values.append(only_if_worker)
+        with self._lock:
+            return self._connection.execute(query, values).rowcount > 0
+
+    def requeue_expired(self, now: float) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "UPDATE jobs SET state = ?, worker_id = NULL, lease_expires_at = NULL "
+                "WHERE state = ? AND lease_expires_at < ?",
+                (QUEUED, RUNNING, now)
+            ).rowcount
+
+    def purge_finished(self, before: float) -> int:
+        with self._lock:
+            return self._connection.execute(
+                f"DELETE FROM jobs WHERE state IN ({', '.join('?' * len(FINISHED_STATES))}) AND finished_at < ?",
+                (*FINISHED_STATES, before)
+            ).rowcount
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def create_job_store(path: Optional[str] = None) -> Union[SQLiteJobStore, MemoryJobStore]:
+    """Stockage SQLite (AI_JOBS_DB_PATH), mémoire si désactivé ('') ou inaccessible"""
+    path = os.getenv('AI_JOBS_DB_PATH', 'jobs.db') if path is None else path
+    if path:
+        try:
+            store = SQLiteJobStore(path)
+            logger.info(f"✅ File de tâches persistante: {path}")
+            return store
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ File de tâches SQLite indisponible ({e}), mode mémoire locale")
+    return MemoryJobStore()
+
+
+# === EXÉCUTION ===
+
+class JobContext:
+    """Transmis au gestionnaire: progression et annulation coopérative"""
+
+    def __init__(self, queue: 'JobQueue', job: Job):
+        self.job = job
+        self._queue = queue
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise JobCancelledError(self.job.id)
+
+    def report(self, progress: float, message: Optional[str] = None):
+        """Progression (0 à 1) depuis un gestionnaire synchrone (écriture bloquante, hors de la boucle)"""
+        changes = {'progress': max(0.0, min(1.0, progress)), 'message': message}
+        self._queue.store.update(self.job.id, only_if_state=RUNNING,
+                                 only_if_worker=self._queue.worker_id, **changes)
+
+    async def report_async(self, progress: float, message: Optional[str] = None):
+        """Progression depuis un gestionnaire coroutine: écriture dans un thread"""
+        await asyncio.to_thread(self.report, progress, message)
+
+
+Handler = Callable[[Dict[str, Any], JobContext], Union[Any, Awaitable[Any]]]
+
+
+class JobQueue:
+    """
+    File de tâches avec workers bornés
+    - gestionnaire coroutine: exécuté dans la boucle (doit céder la main: I/O, sleep,
+      progression par await context.report_async)
+    - gestionnaire synchrone: exécuté dans un thread, hors de la boucle d'événements
+    - bail renouvelé pendant l'exécution: une tâche d'un worker mort est reprise à l'expiration
+    """
+
+    def __init__(self, store=None, concurrency: Optional[int] = None, lease_seconds: Optional[float] = None,
+                 poll_interval: float = 1.0, retention_hours: Optional[float] = None,
+                 max_attempts: Optional[int] = None):
+        self._store = store
+        self.concurrency = concurrency or int(os.getenv('AI_JOB_WORKERS', '2'))
+        self.lease_seconds = lease_seconds or float(os.getenv('AI_JOB_LEASE_SECONDS', '60'))
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts or int(os.getenv('AI_JOB_MAX_ATTEMPTS', '3'))
+        self.retention_seconds = 3600 * (retention_hours if retention_hours is not None
+                                         else float(os.getenv('AI_JOB_RETENTION_HOURS', '24')))
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, Handler] = {}
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._contexts: Dict[str, JobContext] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def store(self):
+        """Stockage créé au premier usage (pas de fichier ouvert à l'import)"""
+        if self._store is None:
+            self._store = create_job_store()
+        return self._store
+
+    def register(self, kind: str, handler: Handler):
+        """Associe un type de tâche à son gestionnaire: handler(payload, context) -> résultat JSON"""
+        self._handlers[kind] = handler
+
+    # === CYCLE DE VIE ===
+
+    def start(self):
+        """Lance les workers dans la boucle courante"""
+        if self._workers:
+            return
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker_loop(), name=f'job-worker-{index}')
+            for index in range(self.concurrency)
+        ]
+        self._workers.append(asyncio.create_task(self._maintenance_loop(), name='job-maintenance'))
+        logger.info(f"📬 File de tâches démarrée ({self.concurrency} workers)")
+
+    async def stop(self):
+        """
+        Arrête les workers; les tâches en cours redeviennent 'queued'
+        (reprises au prochain démarrage si le stockage est persistant)
+        """
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # === API ===
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> Job:
+        if kind not in self._handlers:
+            raise ValueError(f"Type de tâche inconnu: {kind}")
+        job = Job(id=uuid.uuid4().hex, kind=kind, payload=payload)
+        await asyncio.to_thread(self.store.add, job)
+        if self._wakeup:
+            self._wakeup.set()
+        logger.info(f"📬 Tâche {kind} en file: {job.id}")
+        return job
+
+    async def get(self, job_id: str) -> Job:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            raise JobNotFoundError(job_id)
+        return job
+
+    async def cancel(self, job_id: str) -> Job:
+        """
+        Annule une tâche: immédiat si en file, demande d'annulation si en cours
+        (tâche asyncio annulée dans ce processus, drapeau lu par les autres workers)
+        Une tâche terminée est retournée inchangée
+        """
+        job = await self.get(job_id)
+        if job.state == QUEUED:
+            cancelled = await asyncio.to_thread(
+                self.store.update, job_id, only_if_state=QUEUED,
+                state=CANCELLED, cancel_requested=True, finished_at=time.time()
+            )
+            if not cancelled:
+                return await self.cancel(job_id)
+        elif job.state == RUNNING:
+            await asyncio.to_thread(self.store.update, job_id, only_if_state=RUNNING, cancel_requested=True)
+            self._cancel_local(job_id)
+        return await self.get(job_id)
+
+    # === WORKERS ===
+
+    def _cancel_local(self, job_id: str):
+        context = self._contexts.get(job_id)
+        if context:
+            context._cancelled.set()
+        task = self._running.get(job_id)
+        if task:
+            task.cancel()
+
+    async def _worker_loop(self):
+        while True:
+            job = await asyncio.to_thread(self.store.claim, self.worker_id, self.lease_seconds)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._execute(job)
+
+    async def _execute(self, job: Job):
+        handler = self._handlers.get(job.kind)
+        if handler is None:
+            await self._finish(job, FAILED, error=f"Type de tâche inconnu: {job.kind}")
+            return
+        if job.attempts > self.max_attempts:
+            await self._finish(job, FAILED, error=f"Abandon après {self.max_attempts} tentatives")
+            return
+
+        context = JobContext(self, job)
+        self._contexts[job.id] = context
+        if inspect.iscoroutinefunction(handler):
+            task = asyncio.ensure_future(handler(job.payload, context))
+            self._running[job.id] = task
+        else:
+            # Un thread ne s'interrompt pas: annulation coopérative via context.cancelled
+            task = asyncio.ensure_future(asyncio.to_thread(handler, job.payload, context))
+        logger.info(f"⚙️ Exécution tâche {job.kind}: {job.id} (tentative {job.attempts})")
+
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if not context.cancelled:
+                # Arrêt des workers: la tâche sera reprise au prochain démarrage
+                await asyncio.to_thread(self.store.update, job.id, only_if_state=RUNNING,
+                                        only_if_worker=self.worker_id,
+                                        state=QUEUED, worker_id=None, lease_expires_at=None)
+                raise
+            await self._finish(job, CANCELLED)
+        except JobCancelledError:
+            await self._finish(job, CANCELLED)
+        except Exception as e:
+            logger.error(f"❌ Tâche {job.kind} en échec: {job.id}: {e}")
+            await self._finish(job, FAILED, error=f"{type(e).__name__}: {e}")
+        else:
+            if context.cancelled:
+                await self._finish(job, CANCELLED)
+            else:
+                await self._finish(job, SUCCEEDED, result=result, progress=1.0)
+        finally:
+            self._running.pop(job.id, None)
+            self._contexts.pop(job.id, None)
+
+    async def _finish(self, job: Job, state: str, **changes):
+        finished = await asyncio.to_thread(
+            self.store.update, job.id, only_if_state=RUNNING, only_if_worker=self.worker_id,
+            state=state, finished_at=time.time(), worker_id=None, lease_expires_at=None, **changes
+        )
+        if not finished:
+            # Bail expiré: la tâche a été remise en file (ou reprise par un autre worker)
+            logger.warning(f"⚠️ Bail perdu, issue {state} ignorée pour la tâche {job.kind}: {job.id}")
+            return
+        logger.info(f"{'✅' if state == SUCCEEDED else '⚠️'} Tâche {job.kind} {state}: {job.id}")
+
+    async def _maintenance_loop(self):
+        """Renouvelle les baux, relaie les annulations, reprend les tâches orphelines, purge l'historique"""
+        interval = max(self.poll_interval, self.lease_seconds / 4)
+        while True:
+            now = time.time()
+            for job_id in list(self._contexts):
+                job = await asyncio.to_thread(self.store.get, job_id)
+                if job is None or job.cancel_requested:
+                    self._cancel_local(job_id)
+                else:
+                    renewed = await asyncio.to_thread(
+                        self.store.update, job_id, only_if_state=RUNNING, only_if_worker=self.worker_id,
+                        lease_expires_at=now + self.lease_seconds
+                    )
+                    if not renewed:
+                        # Bail expiré puis tâche reprise ailleurs: cette exécution s'arrête
+                        logger.warning(f"⚠️ Bail perdu pour la tâche {job_id}, exécution locale interrompue")
+                        self._cancel_local(job_id)
+            requeued = await asyncio.to_thread(self.store.requeue_expired, now)
+            if requeued:
+                logger.warning(f"♻️ {requeued} tâche(s) orpheline(s) remise(s) en file")
+                self._wakeup.set()
+            await asyncio.to_thread(self.store.purge_finished, now - self.retention_seconds)
+            await asyncio.sleep(interval)
+
+    def status(self) -> Dict[str, Any]:
+        # _contexts couvre les gestionnaires coroutine et synchrones (_running: coroutines seulement)
+        return {
+            'persistent': self.store.persistent,
+            'workers': self.concurrency,
+            'running': len(self._contexts)
+        }
+
+
+__all__ = [
+    'Job', 'JobContext', 'JobQueue', 'JobNotFoundError', 'JobCancelledError',
+    'MemoryJobStore', 'SQLiteJobStore', 'create_job_store',
+    'QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', 'CANCELLED', 'FINISHED_STATES'
+]
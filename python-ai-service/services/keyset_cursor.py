@@ -0,0 +1,49 @@
+"""
+🔖 CURSEURS DE PAGINATION PAR CLÉ (KEYSET)
+Encodage opaque de la position (score, created_at, id) de la dernière ligne d'une page
+et condition « après le curseur » sur la clé de tri de utils.keyset
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import DateTime, Float, literal, tuple_
+
+from utils.keyset import keyset_key
+
+
+def encode_cursor(score: Optional[float], created_at: Optional[datetime], row_id) -> str:
+    """Encode la clé de tri de la dernière ligne retournée"""
+    payload = json.dumps(
+        [score, created_at.isoformat() if created_at is not None else None, str(row_id)],
+        separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[float], Optional[datetime], uuid.UUID]:
+    """Décode un curseur; lève ValueError si le curseur est invalide"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        score, created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (
+            float(score) if score is not None else None,
+            datetime.fromisoformat(created_at) if created_at is not None else None,
+            uuid.UUID(row_id)
+        )
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError(f"Curseur de pagination invalide: {cursor}") from e
+
+
+def keyset_before(score, created_at, row_id, cursor: str):
+    """Condition 'après le curseur' dans l'ordre décroissant; lève ValueError si le curseur est invalide"""
+    cursor_score, cursor_created_at, cursor_id = decode_cursor(cursor)
+    return tuple_(*keyset_key(score, created_at, row_id)) < tuple_(*keyset_key(
+        literal(cursor_score, Float), literal(cursor_created_at, DateTime(timezone=True)), cursor_id
+    ))
+
+
+__all__ = ['encode_cursor', 'decode_cursor', 'keyset_before']
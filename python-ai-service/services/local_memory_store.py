@@ -0,0 +1,203 @@
+"""
+🗃️ MÉMOIRE LOCALE INDEXÉE DES AGENTS IA
+Niveau de mémoire en processus utilisé quand Redis est indisponible
+Index par mission/agent/session/type + budget global avec éviction LRU
+"""
+
+import heapq
+import itertools
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _sort_key(entry: Any):
+    """Clé de tri commune aux niveaux de mémoire (priorité puis fraîcheur)"""
+    return (entry.priority, entry.timestamp)
+
+
+class _MissionBucket:
+    """Entrées d'une mission: files bornées par agent + index secondaires"""
+
+    __slots__ = ('agents', 'by_session', 'by_type', 'size')
+
+    def __init__(self):
+        self.agents: Dict[str, Deque[Any]] = {}
+        self.by_session: Dict[str, Dict[str, Any]] = {}
+        self.by_type: Dict[str, Dict[str, Any]] = {}
+        self.size = 0
+
+    def index(self, entry: Any):
+        self.by_session.setdefault(entry.session_id, {})[entry.id] = entry
+        self.by_type.setdefault(entry.memory_type, {})[entry.id] = entry
+        self.size += 1
+
+    def unindex(self, entry: Any):
+        for index, key in ((self.by_session, entry.session_id), (self.by_type, entry.memory_type)):
+            entries = index.get(key)
+            if entries is not None:
+                entries.pop(entry.id, None)
+                if not entries:
+                    del index[key]
+        self.size -= 1
+
+
+class LocalMemoryStore:
+    """
+    Stockage mémoire local borné
+    - une file bornée (deque) par (mission, agent): éviction O(1) des plus anciennes entrées
+    - index secondaires par session et par type de mémoire au sein de chaque mission
+    - budget global d'entrées avec éviction LRU entre missions
+    - tas d'expiration: le balayage ne visite que les entrées effectivement expirées
+    - un identifiant déjà présent remplace l'entrée précédente dans toutes les structures
+    """
+
+    def __init__(self, max_entries_per_agent: int = 100, max_total_entries: int = 10000):
+        self.max_entries_per_agent = max_entries_per_agent
+        self.max_total_entries = max_total_entries
+        self._missions: "OrderedDict[str, _MissionBucket]" = OrderedDict()
+        self._by_id: Dict[str, Any] = {}
+        self._total = 0
+        self.evictions = 0
+        self._expiry_heap: List[tuple] = []
+        self._expiry_sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return self._total
+
+    def add(self, entry: Any):
+        """Ajoute ou remplace une entrée (O(1) amorti, évictions comprises)"""
+        previous = self._by_id.get(entry.id)
+        if previous is not None:
+            self._remove(previous)
+
+        bucket = self._missions.get(entry.mission_id)
+        if bucket is None:
+            bucket = self._missions[entry.mission_id] = _MissionBucket()
+        self._missions.move_to_end(entry.mission_id)
+
+        queue = bucket.agents.get(entry.agent_id)
+        if queue is None:
+            queue = bucket.agents[entry.agent_id] = deque()
+
+        # Les entrées arrivent par ordre chronologique: la plus ancienne est à gauche
+        if len(queue) >= self.max_entries_per_agent:
+            self._discard(bucket, queue.popleft())
+            self.evictions += 1
+
+        queue.append(entry)
+        bucket.index(entry)
+        self._by_id[entry.id] = entry
+        self._total += 1
+
+        if entry.expires_at is not None:
+            heapq.heappush(self._expiry_heap, (entry.expires_at, next(self._expiry_sequence), entry))
+
+        while self._total > self.max_total_entries:
+            self._evict_least_recently_used()
+
+    def query(
+        self,
+        mission_id: str,
+        agent_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        memory_type: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Any]:
+        """Récupère les entrées d'une mission triées par priorité puis timestamp"""
+        bucket = self._missions.get(mission_id)
+        if bucket is None:
+            return []
+        self._missions.move_to_end(mission_id)
+
+        # Partir du plus petit ensemble candidat disponible
+        candidate_sets = []
+        if agent_id is not None:
+            candidate_sets.append(bucket.agents.get(agent_id, ()))
+        if session_id is not None:
+            candidate_sets.append(bucket.by_session.get(session_id, {}).values())
+        if memory_type is not None:
+            candidate_sets.append(bucket.by_type.get(memory_type, {}).values())
+        if not candidate_sets:
+            candidate_sets.append(
+                entry for queue in bucket.agents.values() for entry in queue
+            )
+            candidates = candidate_sets[0]
+        else:
+            candidates = min(candidate_sets, key=len)
+
+        matches = (
+            entry for entry in candidates
+            if (agent_id is None or entry.agent_id == agent_id)
+            and (session_id is None or entry.session_id == session_id)
+            and (memory_type is None or entry.memory_type == memory_type)
+        )
+        return heapq.nlargest(limit, matches, key=_sort_key)
+
+    def remove_expired(self, now) -> int:
+        """Supprime les entrées expirées, retourne le nombre d'entrées supprimées"""
+        removed = 0
+        heap = self._expiry_heap
+
+        while heap and heap[0][0] <= now:
+            _, _, entry = heapq.heappop(heap)
+            if self._contains(entry):
+                self._remove(entry)
+                removed += 1
+
+        # Les entrées déjà évincées laissent des références mortes dans le tas
+        if len(heap) > 2 * self._total + 64:
+            self._expiry_heap = [item for item in heap if self._contains(item[2])]
+            heapq.heapify(self._expiry_heap)
+
+        return removed
+
+    def _contains(self, entry: Any) -> bool:
+        return self._by_id.get(entry.id) is entry
+
+    def _discard(self, bucket: _MissionBucket, entry: Any):
+        """Retire l'entrée des index (sa file est gérée par l'appelant)"""
+        bucket.unindex(entry)
+        del self._by_id[entry.id]
+        self._total -= 1
+
+    def _remove(self, entry: Any):
+        bucket = self._missions[entry.mission_id]
+        queue = bucket.agents[entry.agent_id]
+        queue.remove(entry)
+        self._discard(bucket, entry)
+
+        if not queue:
+            del bucket.agents[entry.agent_id]
+        if not bucket.agents:
+            del self._missions[entry.mission_id]
+
+    def _evict_least_recently_used(self):
+        """Évince l'entrée la plus ancienne de la mission la moins récemment utilisée"""
+        mission_id, bucket = next(iter(self._missions.items()))
+        agent_id = min(bucket.agents, key=lambda agent: bucket.agents[agent][0].timestamp)
+        queue = bucket.agents[agent_id]
+
+        self._discard(bucket, queue.popleft())
+        self.evictions += 1
+
+        if not queue:
+            del bucket.agents[agent_id]
+        if not bucket.agents:
+            del self._missions[mission_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiques du stockage local"""
+        return {
+            "entries": self._total,
+            "missions": len(self._missions),
+            "max_entries_per_agent": self.max_entries_per_agent,
+            "max_total_entries": self.max_total_entries,
+            "evictions": self.evictions,
+            "pending_expirations": len(self._expiry_heap)
+        }
+
+
+__all__ = ['LocalMemoryStore']
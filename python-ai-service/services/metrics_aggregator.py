@@ -0,0 +1,107 @@
+"""
+📈 AGRÉGATEUR DE MÉTRIQUES AI
+Agrégation en processus des métriques par (metric_type, service_name, unit)
+Les agrégats sont écrits en lot au lieu d'une ligne AIMetric par appel
+"""
+
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.stats import MetricBucket
+
+
+class MetricsAggregator:
+    """
+    Tampon de métriques thread-safe
+    - agrégats (count, sum, min, max, histogramme) par (metric_type, service_name, unit)
+    - échantillons bruts conservés selon raw_sample_rate
+    - drain() vide le tampon et retourne les lignes à insérer en lot
+    - restore() reprend les lignes d'une écriture en échec pour le prochain drain()
+    """
+
+    def __init__(self, raw_sample_rate: float = 0.0, max_raw_samples: int = 10000,
+                 max_unwritten_rows: int = 10000):
+        self.raw_sample_rate = raw_sample_rate
+        self.max_raw_samples = max_raw_samples
+        self.max_unwritten_rows = max_unwritten_rows
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, str, Optional[str]], MetricBucket] = {}
+        self._raw_samples: List[Dict[str, Any]] = []
+        self._unwritten: List[Dict[str, Any]] = []
+        self._interval_start = time.time()
+        self.dropped_samples = 0
+        self.dropped_rows = 0
+
+    def record(self, metric_type: str, service_name: str, value: float,
+               unit: Optional[str] = None, context: Optional[dict] = None):
+        """Enregistre une valeur (O(1), sans accès base de données)"""
+        key = (metric_type, service_name, unit)
+        sampled = self.raw_sample_rate > 0 and random.random() < self.raw_sample_rate
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = MetricBucket()
+            bucket.add(float(value))
+
+            if sampled:
+                if len(self._raw_samples) < self.max_raw_samples:
+                    self._raw_samples.append({
+                        "metric_type": metric_type,
+                        "service_name": service_name,
+                        "value": value,
+                        "unit": unit,
+                        "context": {**(context or {}), "sampled": True}
+                    })
+                else:
+                    self.dropped_samples += 1
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Vide le tampon et retourne les lignes AIMetric (agrégats + échantillons bruts)"""
+        with self._lock:
+            buckets, self._buckets = self._buckets, {}
+            raw_samples, self._raw_samples = self._raw_samples, []
+            unwritten, self._unwritten = self._unwritten, []
+            interval_start, self._interval_start = self._interval_start, time.time()
+
+        interval = {
+            "interval_start": datetime.utcfromtimestamp(interval_start).isoformat(),
+            "interval_end": datetime.utcfromtimestamp(self._interval_start).isoformat()
+        }
+
+        rows = []
+        for (metric_type, service_name, unit), bucket in buckets.items():
+            aggregation = bucket.to_dict()
+            rows.append({
+                "metric_type": metric_type,
+                "service_name": service_name,
+                "value": aggregation["mean"],
+                "unit": unit,
+                "context": {"aggregation": aggregation, **interval}
+            })
+
+        return unwritten + rows + raw_samples
+
+    def restore(self, rows: List[Dict[str, Any]]):
+        """
+        Reprend des lignes issues de drain() dont l'écriture a échoué
+        Chaque ligne garde son intervalle; au-delà de max_unwritten_rows, les plus anciennes sont perdues
+        """
+        with self._lock:
+            unwritten = rows + self._unwritten
+            overflow = len(unwritten) - self.max_unwritten_rows
+            if overflow > 0:
+                unwritten = unwritten[overflow:]
+                self.dropped_rows += overflow
+            self._unwritten = unwritten
+
+    def pending(self) -> int:
+        """Nombre de séries, d'échantillons et de lignes en attente d'écriture"""
+        with self._lock:
+            return len(self._buckets) + len(self._raw_samples) + len(self._unwritten)
+
+
+__all__ = ['MetricsAggregator', 'MetricBucket']
@@ -7,30 +7,21 @@ Point 2.2 - Phase 2: IA Sémantique et Suggestions
 import asyncio
 import logging
 import numpy as np
-import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 import json
 import pickle
 import os
 
-# Imports conditionnels pour éviter les erreurs
-try:
-    import xgboost as xgb
-    XGBOOST_AVAILABLE = True
-except ImportError:
-    XGBOOST_AVAILABLE = False
+from services.optional_dependencies import module_available
+
+# Dépendances optionnelles sondées sans import (importées à la création des modèles)
+XGBOOST_AVAILABLE = module_available('xgboost')
+if not XGBOOST_AVAILABLE:
     logging.warning("🔧 XGBoost non disponible, mode simulation activé")
 
-try:
-    from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
-    from sklearn.model_selection import train_test_split, cross_val_score
-    from sklearn.preprocessing import StandardScaler, LabelEncoder
-    from sklearn.metrics import accuracy_score, mean_squared_error
-    from sklearn.cluster import DBSCAN
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+SKLEARN_AVAILABLE = module_available('sklearn')
+if not SKLEARN_AVAILABLE:
     logging.warning("🔧 Scikit-learn non disponible, mode simulation activé")
 
 try:
@@ -40,6 +31,8 @@ except ImportError:
     SEMANTIC_ANALYZER_AVAILABLE = False
     logging.warning("🔧 Analyseur sémantique non disponible")
 
+from services.tracing import annotate, traced
+
 logger = logging.getLogger(__name__)
 
 # === MODÈLES DE DONNÉES ===
@@ -110,6 +103,8 @@ class MLSuggestionEngine:
         """Initialise les modèles ML"""
         try:
             if XGBOOST_AVAILABLE:
+                import xgboost as xgb
+
                 # Modèle XGBoost pour prédiction de qualité
                 self.models['quality_predictor'] = xgb.XGBRegressor(
                     n_estimators=100,
@@ -120,6 +115,9 @@ class MLSuggestionEngine:
                 logger.info("✅ Modèle XGBoost initialisé")
             
             if SKLEARN_AVAILABLE:
+                from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
+                from sklearn.preprocessing import StandardScaler, LabelEncoder
+
                 # Modèle Random Forest pour classification des suggestions
                 self.models['suggestion_classifier'] = RandomForestClassifier(
                     n_estimators=100,
@@ -188,6 +186,7 @@ class MLSuggestionEngine:
         
         logger.info(f"✅ Données d'entraînement chargées: {len(self.training_data)} échantillons")
     
+    @traced("ml.generate_ml_suggestions")
     async def generate_ml_suggestions(
         self,
         workshop_data: Dict[str, Any],
@@ -197,6 +196,10 @@ class MLSuggestionEngine:
         Génère des suggestions ML basées sur les données du workshop
         """
         logger.info("🤖 Génération suggestions ML")
+        annotate(**{
+            f"{key}_count": len(workshop_data.get(key) or [])
+            for key in ("business_values", "essential_assets", "supporting_assets", "dreaded_events")
+        })
         
         result = MLAnalysisResult()
         
@@ -0,0 +1,273 @@
+"""
+📡 OBSERVABILITÉ DU SERVICE IA
+Métriques Prometheus: latence HTTP par route, durée des étapes d'orchestration,
+encodage des embeddings, cache des requêtes, contrôle d'admission, pool de connexions
+PostgreSQL et mémoire réelle du processus
+"""
+
+import logging
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from services.tracing import annotate, span
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+    logging.warning("🔧 prometheus-client non disponible, métriques désactivées")
+
+
+class _NoopMetric:
+    """Métrique inerte utilisée sans prometheus-client"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def set_function(self, function):
+        pass
+
+
+# Seaux adaptés aux latences du service (du cache local aux analyses complètes)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+# Attente d'une connexion: quelques dixièmes de milliseconde sans contention, jusqu'au pool_timeout
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0, 30.0)
+
+if PROMETHEUS_AVAILABLE:
+    HTTP_REQUEST_DURATION = Histogram(
+        'ebios_ai_http_request_duration_seconds',
+        "Latence des requêtes HTTP par route",
+        ['method', 'route', 'status'],
+        buckets=LATENCY_BUCKETS
+    )
+    ORCHESTRATION_STAGE_DURATION = Histogram(
+        'ebios_ai_orchestration_stage_duration_seconds',
+        "Durée des étapes de l'orchestration Workshop 1",
+        ['stage'],
+        buckets=LATENCY_BUCKETS
+    )
+    ENCODE_BATCH_SIZE = Histogram(
+        'ebios_ai_encode_batch_size',
+        "Nombre de textes par appel d'encodage",
+        ['model'],
+        buckets=BATCH_SIZE_BUCKETS
+    )
+    ENCODE_DURATION = Histogram(
+        'ebios_ai_encode_duration_seconds',
+        "Durée des appels d'encodage des embeddings",
+        ['model'],
+        buckets=LATENCY_BUCKETS
+    )
+    CACHE_REQUESTS = Counter(
+        'ebios_ai_cache_requests_total',
+        "Consultations de cache par résultat (local_hit, hit, miss)",
+        ['cache', 'result']
+    )
+    PROCESS_RSS = Gauge(
+        'ebios_ai_process_resident_memory_bytes',
+        "Mémoire résidente du processus"
+    )
+    ADMISSION_IN_FLIGHT = Gauge(
+        'ebios_ai_admission_in_flight',
+        "Requêtes admises en cours d'exécution par classe d'endpoint",
+        ['endpoint_class']
+    )
+    ADMISSION_QUEUE_DEPTH = Gauge(
+        'ebios_ai_admission_queue_depth',
+        "Requêtes en attente d'admission par classe d'endpoint",
+        ['endpoint_class']
+    )
+    ADMISSION_QUEUE_WAIT = Histogram(
+        'ebios_ai_admission_queue_wait_seconds',
+        "Temps d'attente avant admission",
+        ['endpoint_class'],
+        buckets=LATENCY_BUCKETS
+    )
+    ADMISSION_REJECTIONS = Counter(
+        'ebios_ai_admission_rejections_total',
+        "Requêtes rejetées par classe d'endpoint et motif",
+        ['endpoint_class', 'reason']
+    )
+    DB_POOL_WAIT = Histogram(
+        'ebios_ai_db_pool_wait_seconds',
+        "Attente d'une connexion au checkout du pool",
+        buckets=POOL_WAIT_BUCKETS
+    )
+    DB_POOL_CHECKOUT_DURATION = Histogram(
+        'ebios_ai_db_pool_checkout_duration_seconds',
+        "Durée d'emprunt d'une connexion (checkout -> checkin)",
+        buckets=LATENCY_BUCKETS
+    )
+    DB_POOL_OVERFLOW_CHECKOUTS = Counter(
+        'ebios_ai_db_pool_overflow_checkouts_total',
+        "Checkouts servis au-delà de pool_size (max_overflow)"
+    )
+    DB_POOL_TIMEOUTS = Counter(
+        'ebios_ai_db_pool_timeouts_total',
+        "Checkouts abandonnés après pool_timeout"
+    )
+    DB_SLOW_QUERIES = Counter(
+        'ebios_ai_db_slow_queries_total',
+        "Requêtes au-delà de DB_SLOW_QUERY_MS"
+    )
+else:
+    HTTP_REQUEST_DURATION = ORCHESTRATION_STAGE_DURATION = _NoopMetric()
+    ENCODE_BATCH_SIZE = ENCODE_DURATION = CACHE_REQUESTS = PROCESS_RSS = _NoopMetric()
+    ADMISSION_IN_FLIGHT = ADMISSION_QUEUE_DEPTH = ADMISSION_QUEUE_WAIT = ADMISSION_REJECTIONS = _NoopMetric()
+    DB_POOL_WAIT = DB_POOL_CHECKOUT_DURATION = _NoopMetric()
+    DB_POOL_OVERFLOW_CHECKOUTS = DB_POOL_TIMEOUTS = DB_SLOW_QUERIES = _NoopMetric()
+
+
+def process_rss_bytes() -> int:
+    """Mémoire résidente actuelle (/proc sous Linux, pic ru_maxrss sinon)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss est en octets sous macOS, en kilo-octets ailleurs
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def process_memory() -> dict:
+    """
+    Mémoire du processus en Mo (Linux): rss, pss et private
+    Avec serve.py, `private` mesure le coût réel d'un worker; les pages des modèles
+    chargés avant fork restent partagées
+    """
+    fields = {'Rss:': 'rss', 'Pss:': 'pss', 'Private_Clean:': 'private', 'Private_Dirty:': 'private'}
+    usage = {'rss': 0.0, 'pss': 0.0, 'private': 0.0}
+    try:
+        with open('/proc/self/smaps_rollup') as rollup:
+            for line in rollup:
+                parts = line.split()
+                if parts and parts[0] in fields:
+                    usage[fields[parts[0]]] += int(parts[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        return {'rss': round(process_rss_bytes() / (1024 * 1024), 1)}
+    return {name: round(value, 1) for name, value in usage.items()}
+
+
+def format_memory_usage() -> str:
+    return f"{process_rss_bytes() / (1024 * 1024):.0f} MB"
+
+
+PROCESS_RSS.set_function(process_rss_bytes)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Chronomètre une étape d'orchestration (histogramme + span de trace)"""
+    start = time.perf_counter()
+    try:
+        with span(f"orchestrator.{stage}"):
+            yield
+    finally:
+        ORCHESTRATION_STAGE_DURATION.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def encode_timer(model: str, batch_size: int):
+    """Chronomètre un appel d'encodage et enregistre la taille du lot"""
+    ENCODE_BATCH_SIZE.labels(model=model).observe(batch_size)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ENCODE_DURATION.labels(model=model).observe(time.perf_counter() - start)
+
+
+def record_cache_lookup(cache: str, result: str):
+    """Enregistre une consultation de cache (local_hit, hit ou miss)"""
+    CACHE_REQUESTS.labels(cache=cache, result=result).inc()
+    annotate(**{f"cache.{cache}": result})
+
+
+class PoolMetrics:
+    """Observateur de config.pool_monitor.PoolMonitor: mesures du pool exposées sur /metrics"""
+
+    def observe_wait(self, seconds: float, overflow: bool):
+        DB_POOL_WAIT.observe(seconds)
+        if overflow:
+            DB_POOL_OVERFLOW_CHECKOUTS.inc()
+
+    def observe_timeout(self, seconds: float):
+        DB_POOL_WAIT.observe(seconds)
+        DB_POOL_TIMEOUTS.inc()
+
+    def observe_checkout(self, seconds: float):
+        DB_POOL_CHECKOUT_DURATION.observe(seconds)
+
+    def observe_slow_query(self, seconds: float):
+        DB_SLOW_QUERIES.inc()
+
+
+POOL_METRICS = PoolMetrics()
+
+
+def render_metrics() -> Optional[bytes]:
+    """Exposition texte Prometheus (None sans prometheus-client)"""
+    if not PROMETHEUS_AVAILABLE:
+        return None
+    return generate_latest(REGISTRY)
+
+
+class PrometheusMiddleware:
+    """
+    Middleware ASGI: latence par (méthode, gabarit de route, statut)
+    Le gabarit (/jobs/{job_id}) borne la cardinalité des labels
+    """
+
+    def __init__(self, app, excluded_paths=('/metrics',)):
+        self.app = app
+        self.excluded_paths = set(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope.get('path') in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {'code': 500}
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get('route')
+            HTTP_REQUEST_DURATION.labels(
+                method=scope.get('method', ''),
+                route=getattr(route, 'path', None) or 'unmatched',
+                status=str(status['code'])
+            ).observe(time.perf_counter() - start)
+
+
+__all__ = [
+    'PROMETHEUS_AVAILABLE', 'CONTENT_TYPE_LATEST', 'PrometheusMiddleware',
+    'stage_timer', 'encode_timer', 'record_cache_lookup', 'render_metrics', 'PoolMetrics', 'POOL_METRICS',
+    'process_rss_bytes', 'process_memory', 'format_memory_usage'
+]
@@ -0,0 +1,33 @@
+"""
+🧩 DÉPENDANCES OPTIONNELLES
+Sondes de disponibilité sans import (importlib.util.find_spec):
+les bibliothèques lourdes (torch, transformers, sklearn, langchain...) ne sont
+importées qu'au premier usage, dans les fonctions qui en ont besoin
+"""
+
+import importlib.util
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def module_available(name: str) -> bool:
+    """
+    Vrai si le module est installé, sans l'importer
+    Sonder le paquet racine ('sklearn', pas 'sklearn.cluster'): find_spec
+    importe les paquets parents d'un nom pointé
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def modules_available(*names: str) -> bool:
+    """Vrai si tous les modules sont installés"""
+    return all(module_available(name) for name in names)
+
+
+__all__ = ['module_available', 'modules_available']
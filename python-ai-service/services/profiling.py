@@ -0,0 +1,156 @@
+"""
+🩺 PROFILAGE À LA DEMANDE
+Captures limitées dans le temps sur un worker en production:
+- profil CPU cProfile du thread de la boucle d'événements (fichier pstats)
+- échantillonnage wall-clock de la boucle (piles repliées, compatibles flamegraph)
+- instantané d'allocations tracemalloc (rapport texte ou dump brut)
+Une seule capture à la fois par processus
+"""
+
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+MAX_PROFILE_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', '60'))
+
+
+class ProfilerBusyError(RuntimeError):
+    """Une capture est déjà en cours dans ce processus"""
+
+
+class ProfilingService:
+    """Captures de profil exclusives et bornées dans le temps"""
+
+    def __init__(self, max_seconds: float = MAX_PROFILE_SECONDS):
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+
+    def _bounded(self, seconds: float) -> float:
+        return max(0.1, min(float(seconds), self.max_seconds))
+
+    def _acquire(self):
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("Une capture de profil est déjà en cours")
+
+    async def capture_cpu_profile(self, seconds: float) -> bytes:
+        """
+        Profil cProfile du thread de la boucle d'événements pendant `seconds`
+        (toutes les requêtes servies par la boucle pendant la fenêtre sont couvertes)
+        Retourne le contenu d'un fichier pstats (pstats.Stats / snakeviz)
+        """
+        self._acquire()
+        try:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await asyncio.sleep(self._bounded(seconds))
+            finally:
+                profiler.disable()
+
+            with tempfile.NamedTemporaryFile(suffix='.pstats', delete=False) as output:
+                path = output.name
+            try:
+                pstats.Stats(profiler).dump_stats(path)
+                with open(path, 'rb') as stats_file:
+                    return stats_file.read()
+            finally:
+                os.remove(path)
+        finally:
+            self._lock.release()
+
+    async def capture_wall_profile(self, seconds: float, interval_ms: float = 5.0) -> str:
+        """
+        Échantillonne la pile du thread de la boucle depuis un thread dédié
+        Retourne des piles repliées ("racine;...;feuille nombre"), entrée de flamegraph.pl / speedscope
+        L'échantillonneur attend le GIL: les sections Python plus courtes que
+        sys.getswitchinterval() sont sous-représentées
+        """
+        self._acquire()
+        try:
+            target_thread = threading.get_ident()
+            duration = self._bounded(seconds)
+            interval = max(0.001, interval_ms / 1000)
+            stacks: Counter = Counter()
+
+            def sample():
+                deadline = time.monotonic() + duration
+                while time.monotonic() < deadline:
+                    frame = sys._current_frames().get(target_thread)
+                    if frame is not None:
+                        stacks[_collapse(frame)] += 1
+                    time.sleep(interval)
+
+            sampler = threading.Thread(target=sample, name='wall-profiler', daemon=True)
+            sampler.start()
+            while sampler.is_alive():
+                await asyncio.sleep(0.05)
+
+            return '\n'.join(f"{stack} {count}" for stack, count in stacks.most_common()) + '\n'
+        finally:
+            self._lock.release()
+
+    async def capture_allocations(self, seconds: float, top: int = 50, frames: int = 10,
+                                  raw: bool = False) -> bytes:
+        """
+        Allocations effectuées pendant `seconds` (différence de deux instantanés tracemalloc)
+        raw=True: dump de l'instantané final (tracemalloc.Snapshot.load)
+        """
+        self._acquire()
+        started_here = not tracemalloc.is_tracing()
+        try:
+            if started_here:
+                tracemalloc.start(frames)
+            baseline = tracemalloc.take_snapshot()
+            await asyncio.sleep(self._bounded(seconds))
+            snapshot = tracemalloc.take_snapshot()
+
+            if raw:
+                with tempfile.NamedTemporaryFile(suffix='.tracemalloc', delete=False) as output:
+                    path = output.name
+                try:
+                    snapshot.dump(path)
+                    with open(path, 'rb') as dump_file:
+                        return dump_file.read()
+                finally:
+                    os.remove(path)
+
+            current, peak = tracemalloc.get_traced_memory()
+            lines = [
+                f"# tracemalloc: {self._bounded(seconds):.1f}s, mémoire tracée {current / 1024:.0f} KiB "
+                f"(pic {peak / 1024:.0f} KiB)"
+            ]
+            for stat in snapshot.compare_to(baseline, 'traceback')[:top]:
+                lines.append(f"\n{stat.size_diff / 1024:+.1f} KiB, {stat.count_diff:+d} blocs "
+                             f"(total {stat.size / 1024:.1f} KiB)")
+                lines.extend(f"    {line}" for line in stat.traceback.format())
+            return ('\n'.join(lines) + '\n').encode()
+        finally:
+            if started_here:
+                tracemalloc.stop()
+            self._lock.release()
+
+
+def _collapse(frame) -> str:
+    """Pile repliée d'une frame, de la racine vers la feuille"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+profiling_service = ProfilingService()
+
+
+__all__ = ['ProfilingService', 'ProfilerBusyError', 'profiling_service', 'MAX_PROFILE_SECONDS']
@@ -0,0 +1,239 @@
+"""
+🧹 MAINTENANCE DU CACHE DES REQUÊTES AI
+Purge des entrées expirées et budget (lignes + octets) pour la table ai_query_cache
+Éviction LFU/LRU (hit_count puis last_accessed) par lots bornés, puis compaction
+Une seule passe à la fois, tous processus confondus (verrou consultatif PostgreSQL)
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.database import db_config, get_db_session
+
+logger = logging.getLogger(__name__)
+
+# Octets utiles d'une entrée (hors en-têtes de ligne et index)
+_ENTRY_BYTES_SQL = "pg_column_size(response_data) + pg_column_size(query_text)"
+# Autres moteurs (SQLite de développement et de test): taille des valeurs sérialisées
+_PORTABLE_ENTRY_BYTES_SQL = "LENGTH(CAST(response_data AS BLOB)) + LENGTH(CAST(query_text AS BLOB))"
+
+# Clé du verrou consultatif de session partagé par tous les workers et instances
+ADVISORY_LOCK_KEY = 0x41495143  # 'AIQC'
+
+
+class QueryCacheMaintenance:
+    """
+    Maintenance périodique de ai_query_cache
+    - suppression des lignes expirées (index idx_ai_query_cache_expires_at)
+    - budget de lignes et d'octets: éviction des entrées les moins utilisées puis les plus anciennes
+      (index idx_ai_query_cache_eviction sur hit_count, last_accessed)
+    - chaque lot est une transaction courte; le nombre de lots par passage est borné
+    - VACUUM (ANALYZE) lorsque la passe a supprimé une part significative de la table
+    - pg_try_advisory_lock: si une autre passe est en cours (autre worker), la passe est sautée
+    """
+
+    def __init__(
+        self,
+        max_rows: int = 50000,
+        max_bytes: int = 256 * 1024 * 1024,
+        batch_size: int = 500,
+        max_batches: int = 20,
+        vacuum_ratio: float = 0.2
+    ):
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.vacuum_ratio = vacuum_ratio
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_env(cls) -> 'QueryCacheMaintenance':
+        """Construit la maintenance depuis les variables d'environnement"""
+        return cls(
+            max_rows=int(os.getenv('AI_QUERY_CACHE_MAX_ROWS', '50000')),
+            max_bytes=int(os.getenv('AI_QUERY_CACHE_MAX_BYTES', str(256 * 1024 * 1024))),
+            batch_size=int(os.getenv('AI_QUERY_CACHE_MAINTENANCE_BATCH', '500')),
+            max_batches=int(os.getenv('AI_QUERY_CACHE_MAINTENANCE_MAX_BATCHES', '20'))
+        )
+
+    def run(self) -> Dict[str, Any]:
+        """Exécute une passe de maintenance, retourne le bilan"""
+        start_time = time.time()
+        report = {'expired_deleted': 0, 'evicted_rows': 0, 'evicted_bytes': 0, 'vacuumed': False}
+
+        try:
+            with self._exclusive_pass() as acquired:
+                if acquired:
+                    self._run_pass(report)
+                else:
+                    report['skipped'] = 'locked'
+                    logger.info("🔒 Maintenance du cache requêtes déjà en cours dans un autre processus")
+
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Erreur maintenance cache requêtes: {e}")
+            report['error'] = str(e)
+
+        report['duration_ms'] = round((time.time() - start_time) * 1000, 2)
+        report['finished_at'] = time.time()
+        self.last_run = report
+        return report
+
+    def _run_pass(self, report: Dict[str, Any]):
+        batches_left = self.max_batches
+        report['expired_deleted'], batches_left = self._purge_expired(batches_left)
+
+        usage = self._live_usage()
+        report['rows_before_eviction'] = usage['rows']
+        report['bytes_before_eviction'] = usage['bytes']
+
+        excess_rows = usage['rows'] - self.max_rows
+        excess_bytes = usage['bytes'] - self.max_bytes
+        if excess_rows > 0 or excess_bytes > 0:
+            evicted_rows, evicted_bytes = self._evict(excess_rows, excess_bytes, batches_left)
+            report['evicted_rows'] = evicted_rows
+            report['evicted_bytes'] = evicted_bytes
+
+        deleted = report['expired_deleted'] + report['evicted_rows']
+        if deleted and deleted >= self.vacuum_ratio * max(usage['rows'] + report['expired_deleted'], 1):
+            report['vacuumed'] = self._vacuum()
+
+        if deleted:
+            logger.info(
+                f"🧹 Cache requêtes: {report['expired_deleted']} expirées, "
+                f"{report['evicted_rows']} évincées ({report['evicted_bytes']} octets)"
+            )
+
+    @contextmanager
+    def _exclusive_pass(self):
+        """
+        Verrou consultatif de session sur une connexion dédiée, libéré en fin de passe
+        La transaction d'acquisition est validée aussitôt: la connexion ne reste pas
+        « idle in transaction » pendant la passe (ce qui bloquerait le VACUUM)
+        Hors PostgreSQL (SQLite local, un seul processus): pas de verrou
+        """
+        engine = db_config.engine
+        if engine.dialect.name != 'postgresql':
+            yield True
+            return
+
+        with engine.connect() as conn:
+            acquired = bool(conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {'key': ADVISORY_LOCK_KEY}
+            ).scalar())
+            conn.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': ADVISORY_LOCK_KEY})
+                    conn.commit()
+
+    @staticmethod
+    def _entry_bytes_sql() -> str:
+        if db_config.engine.dialect.name == 'postgresql':
+            return _ENTRY_BYTES_SQL
+        return _PORTABLE_ENTRY_BYTES_SQL
+
+    def _purge_expired(self, batches_left: int):
+        deleted = 0
+        while batches_left > 0:
+            with get_db_session() as session:
+                count = session.execute(text("""
+                    DELETE FROM ai_query_cache
+                    WHERE id IN (
+                        SELECT id FROM ai_query_cache
+                        WHERE expires_at <= CURRENT_TIMESTAMP
+                        LIMIT :batch_size
+                    )
+                """), {'batch_size': self.batch_size}).rowcount
+            batches_left -= 1
+            deleted += count
+            if count < self.batch_size:
+                break
+        return deleted, batches_left
+
+    def _live_usage(self) -> Dict[str, int]:
+        """Lignes et octets utiles des entrées encore valides"""
+        with get_db_session() as session:
+            row = session.execute(text(f"""
+                SELECT COUNT(*) AS rows, COALESCE(SUM({self._entry_bytes_sql()}), 0) AS bytes
+                FROM ai_query_cache
+            """)).first()
+        return {'rows': int(row.rows), 'bytes': int(row.bytes)}
+
+    def _evict(self, excess_rows: int, excess_bytes: int, batches_left: int):
+        """Évince les entrées les moins utilisées jusqu'à respecter les deux budgets"""
+        evicted_rows = 0
+        evicted_bytes = 0
+
+        while batches_left > 0 and (evicted_rows < excess_rows or evicted_bytes < excess_bytes):
+            # Le budget de lignes fixe un minimum exact, le budget d'octets se vérifie au fil des lots
+            limit = self.batch_size
+            if excess_bytes <= evicted_bytes:
+                limit = min(limit, excess_rows - evicted_rows)
+
+            with get_db_session() as session:
+                freed = session.execute(text(f"""
+                    DELETE FROM ai_query_cache
+                    WHERE id IN (
+                        SELECT id FROM ai_query_cache
+                        ORDER BY hit_count ASC, last_accessed ASC
+                        LIMIT :limit
+                    )
+                    RETURNING {self._entry_bytes_sql()} AS entry_bytes
+                """), {'limit': limit}).scalars().all()
+            batches_left -= 1
+
+            if not freed:
+                break
+            evicted_rows += len(freed)
+            evicted_bytes += sum(freed)
+
+        return evicted_rows, evicted_bytes
+
+    def _vacuum(self) -> bool:
+        """Compacte la table (VACUUM ne peut pas s'exécuter dans une transaction)"""
+        try:
+            with db_config.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.execute(text("VACUUM (ANALYZE) ai_query_cache"))
+            return True
+        except SQLAlchemyError as e:
+            logger.warning(f"⚠️ VACUUM ai_query_cache impossible: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Taille de la table (estimations du catalogue, sans parcours) pour le health check"""
+        try:
+            with get_db_session() as session:
+                row = session.execute(text("""
+                    SELECT pg_total_relation_size(c.oid) AS total_bytes,
+                           pg_relation_size(c.oid) AS table_bytes,
+                           GREATEST(c.reltuples, 0)::BIGINT AS estimated_rows
+                    FROM pg_class c
+                    WHERE c.oid = to_regclass('ai_query_cache')
+                """)).first()
+        except SQLAlchemyError as e:
+            return {'status': 'unavailable', 'error': str(e)}
+
+        if row is None:
+            return {'status': 'missing'}
+
+        return {
+            'status': 'ok',
+            'total_bytes': int(row.total_bytes),
+            'table_bytes': int(row.table_bytes),
+            'estimated_rows': int(row.estimated_rows),
+            'max_rows': self.max_rows,
+            'max_bytes': self.max_bytes,
+            'last_maintenance': self.last_run
+        }
+
+
+__all__ = ['QueryCacheMaintenance', 'ADVISORY_LOCK_KEY']
@@ -0,0 +1,98 @@
+"""
+⚡ NIVEAU DE CACHE EN PROCESSUS POUR AIQueryCache
+Cache LRU local devant la table ai_query_cache + tampon des compteurs d'accès
+Les lectures n'écrivent plus en base: les hits sont agrégés puis appliqués en lot
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class LocalQueryCache:
+    """
+    Cache LRU borné avec expiration
+    Une entrée expire à la première des deux échéances: expires_at de la ligne ou TTL local
+    (le TTL local borne l'obsolescence entre workers après une mise à jour)
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, query_hash: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(query_hash)
+            if item is None:
+                return None
+            deadline, response_data = item
+            if deadline <= time.monotonic():
+                del self._entries[query_hash]
+                return None
+            self._entries.move_to_end(query_hash)
+            return response_data
+
+    def put(self, query_hash: str, response_data: Any, expires_at: Optional[datetime] = None):
+        deadline = time.monotonic() + self.ttl_seconds
+        if expires_at is not None:
+            now = datetime.now(expires_at.tzinfo) if expires_at.tzinfo else datetime.utcnow()
+            deadline = min(deadline, time.monotonic() + (expires_at - now).total_seconds())
+
+        with self._lock:
+            self._entries[query_hash] = (deadline, response_data)
+            self._entries.move_to_end(query_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, query_hash: str):
+        with self._lock:
+            self._entries.pop(query_hash, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class HitCounterBuffer:
+    """Compteurs d'accès par query_hash, vidés périodiquement en une requête UPDATE"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits: Dict[str, List[Any]] = {}
+
+    def record_hit(self, query_hash: str):
+        now = datetime.utcnow()
+        with self._lock:
+            counter = self._hits.get(query_hash)
+            if counter is None:
+                self._hits[query_hash] = [1, now]
+            else:
+                counter[0] += 1
+                counter[1] = now
+
+    def drain(self) -> List[Tuple[str, int, datetime]]:
+        """Vide le tampon: liste de (query_hash, hits, last_accessed)"""
+        with self._lock:
+            hits, self._hits = self._hits, {}
+        return [(query_hash, count, last_accessed) for query_hash, (count, last_accessed) in hits.items()]
+
+    def restore(self, hits: List[Tuple[str, int, datetime]]):
+        """Reprend les compteurs d'une écriture en échec (additionnés aux hits reçus entre-temps)"""
+        with self._lock:
+            for query_hash, count, last_accessed in hits:
+                counter = self._hits.get(query_hash)
+                if counter is None:
+                    self._hits[query_hash] = [count, last_accessed]
+                else:
+                    counter[0] += count
+                    counter[1] = max(counter[1], last_accessed)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._hits)
+
+
+__all__ = ['LocalQueryCache', 'HitCounterBuffer']
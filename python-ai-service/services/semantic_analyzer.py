@@ -11,31 +11,24 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 import json
 
-# Imports conditionnels pour éviter les erreurs
-try:
-    from sentence_transformers import SentenceTransformer
-    import torch
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+from services.optional_dependencies import module_available
+
+# Dépendances optionnelles sondées sans import (importées au premier usage)
+TRANSFORMERS_AVAILABLE = module_available('sentence_transformers')
+if not TRANSFORMERS_AVAILABLE:
     logging.warning("🔧 Transformers non disponible, mode simulation activé")
 
-try:
-    from sklearn.metrics.pairwise import cosine_similarity
-    from sklearn.cluster import KMeans
-    from sklearn.decomposition import PCA
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+SKLEARN_AVAILABLE = module_available('sklearn')
+if not SKLEARN_AVAILABLE:
     logging.warning("🔧 Scikit-learn non disponible, mode simulation activé")
 
-try:
-    import networkx as nx
-    NETWORKX_AVAILABLE = True
-except ImportError:
-    NETWORKX_AVAILABLE = False
+NETWORKX_AVAILABLE = module_available('networkx')
+if not NETWORKX_AVAILABLE:
     logging.warning("🔧 NetworkX non disponible, mode simulation activé")
 
+from services.observability import encode_timer
+from services.tracing import annotate, traced
+
 logger = logging.getLogger(__name__)
 
 # === MODÈLES DE DONNÉES ===
@@ -84,6 +77,7 @@ class EbiosSemanticAnalyzer:
         
         if TRANSFORMERS_AVAILABLE:
             try:
+                from sentence_transformers import SentenceTransformer
                 self.sentence_model = SentenceTransformer(self.model_name)
                 logger.info("✅ Modèle Sentence-Transformers chargé")
             except Exception as e:
@@ -92,6 +86,7 @@ class EbiosSemanticAnalyzer:
         else:
             logger.warning("⚠️ Transformers non disponible, mode simulation")
     
+    @traced("semantic.analyze_ebios_elements")
     async def analyze_ebios_elements(
         self, 
         elements: List[Dict[str, Any]],
@@ -101,6 +96,7 @@ class EbiosSemanticAnalyzer:
         Analyse sémantique complète des éléments EBIOS RM
         """
         logger.info(f"🧠 Analyse sémantique: {len(elements)} éléments, type: {analysis_type}")
+        annotate(element_count=len(elements), analysis_type=analysis_type)
         
         result = SemanticAnalysisResult()
         
@@ -172,7 +168,8 @@ class EbiosSemanticAnalyzer:
                 texts.append(text)
             
             # Générer les embeddings en batch
-            embeddings = self.sentence_model.encode(texts, convert_to_numpy=True)
+            with encode_timer(self.model_name, len(texts)):
+                embeddings = self.sentence_model.encode(texts, convert_to_numpy=True)
             
             # Assigner les embeddings aux éléments
             for i, element in enumerate(elements):
@@ -195,6 +192,8 @@ class EbiosSemanticAnalyzer:
             return np.eye(len(elements)) if elements else np.array([])
         
         try:
+            from sklearn.metrics.pairwise import cosine_similarity
+
             # Extraire les embeddings
             embeddings = np.array([elem.embedding for elem in elements])
             
@@ -214,6 +213,8 @@ class EbiosSemanticAnalyzer:
             return []
         
         try:
+            from sklearn.cluster import KMeans
+
             # Extraire les embeddings
             embeddings = np.array([elem.embedding for elem in elements])
             
@@ -430,6 +431,8 @@ class EbiosSemanticAnalyzer:
             return None
         
         try:
+            import networkx as nx
+
             G = nx.Graph()
             
             # Ajouter les nœuds
@@ -0,0 +1,204 @@
+"""
+🚦 REGISTRE DES SERVICES IA
+Chargement différé et ordonné des services lourds (modèles d'embeddings, génération,
+orchestrateur) en arrière-plan, avec état de disponibilité par composant
+Préchargement synchrone possible avant fork (serve.py): les workers héritent des instances
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class ServiceNotReadyError(RuntimeError):
+    """Le composant demandé n'est pas (encore) disponible"""
+
+    def __init__(self, name: str, state: str, retry_after: Optional[int]):
+        super().__init__(f"Service {name} indisponible ({state})")
+        self.name = name
+        self.state = state
+        self.retry_after = retry_after
+
+
+class _Component:
+    __slots__ = ('name', 'loader', 'priority', 'expected_seconds', 'on_ready', 'preload',
+                 'state', 'instance', 'error', 'started_at', 'load_seconds')
+
+    def __init__(self, name: str, loader: Callable[[], Any], priority: int, expected_seconds: float,
+                 on_ready: Optional[Callable[[Any], Optional[Awaitable[None]]]], preload: bool):
+        self.name = name
+        self.loader = loader
+        self.priority = priority
+        self.expected_seconds = expected_seconds
+        self.on_ready = on_ready
+        self.preload = preload
+        self.state = PENDING
+        self.instance = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.load_seconds: Optional[float] = None
+
+
+class ServiceRegistry:
+    """
+    Composants chargés un par un, par priorité croissante, dans un thread
+    (les constructeurs sont synchrones et bloquants) sans bloquer la boucle d'événements
+    """
+
+    def __init__(self):
+        self._components: Dict[str, _Component] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._started_at: Optional[float] = None
+
+    def register(self, name: str, loader: Callable[[], Any], priority: int = 100,
+                 expected_seconds: float = 5.0,
+                 on_ready: Optional[Callable[[Any], Optional[Awaitable[None]]]] = None,
+                 preload: bool = True):
+        """
+        Enregistre un composant
+        - loader: callable synchrone (imports et construction compris)
+        - expected_seconds: durée de chargement estimée (calcul du Retry-After)
+        - on_ready: rappel exécuté dans la boucle une fois le composant prêt
+        - preload: chargeable avant fork (False pour les composants qui ouvrent
+          des connexions ou des fichiers à ne pas partager entre processus)
+        """
+        self._components[name] = _Component(name, loader, priority, expected_seconds, on_ready, preload)
+
+    def preload(self) -> List[str]:
+        """
+        Charge de façon synchrone, sans boucle d'événements, les composants préchargeables
+        Les rappels on_ready sont différés au start() de chaque processus
+        """
+        started_at = time.monotonic()
+        for component in sorted(self._components.values(), key=lambda item: item.priority):
+            if component.preload and component.state == PENDING:
+                self._construct(component)
+        loaded = [name for name, component in self._components.items() if component.state == READY]
+        logger.info(f"📦 Services préchargés en {time.monotonic() - started_at:.1f}s: {', '.join(loaded) or 'aucun'}")
+        return loaded
+
+    def start(self) -> asyncio.Task:
+        """Lance le chargement en arrière-plan (boucle courante)"""
+        if self._task is None:
+            self._started_at = time.monotonic()
+            self._task = asyncio.create_task(self._load_all(), name='service-registry-loader')
+        return self._task
+
+    async def stop(self):
+        """Interrompt le chargement en cours (le thread du composant courant termine seul)"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def wait_ready(self, timeout: Optional[float] = None):
+        """Attend la fin du chargement de tous les composants"""
+        if self._task:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+
+    async def _load_all(self):
+        for component in sorted(self._components.values(), key=lambda item: item.priority):
+            await self._load(component)
+        logger.info(f"✅ Chargement des services terminé en {time.monotonic() - self._started_at:.1f}s")
+
+    def _construct(self, component: _Component) -> bool:
+        component.state = LOADING
+        component.started_at = time.monotonic()
+        logger.info(f"⏳ Chargement du service {component.name}...")
+        try:
+            component.instance = component.loader()
+        except Exception as e:
+            component.state = FAILED
+            component.error = f"{type(e).__name__}: {e}"
+            logger.error(f"❌ Service {component.name} non chargé: {component.error}")
+            return False
+        finally:
+            component.load_seconds = round(time.monotonic() - component.started_at, 3)
+
+        component.state = READY
+        logger.info(f"✅ Service {component.name} prêt en {component.load_seconds}s")
+        return True
+
+    async def _load(self, component: _Component):
+        if component.state == PENDING:
+            ready = await asyncio.to_thread(self._construct, component)
+        else:
+            # Préchargé avant fork: seul le rappel reste à exécuter dans ce processus
+            ready = component.state == READY
+
+        if ready and component.on_ready:
+            try:
+                result = component.on_ready(component.instance)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"⚠️ Rappel de démarrage du service {component.name} en échec: {e}")
+
+    # === ACCÈS ===
+
+    def is_ready(self, name: str) -> bool:
+        component = self._components.get(name)
+        return component is not None and component.state == READY
+
+    def peek(self, name: str, default: Any = None) -> Any:
+        """Instance si prête, `default` sinon (endpoints légers)"""
+        return self._components[name].instance if self.is_ready(name) else default
+
+    def get(self, name: str) -> Any:
+        """Instance prête ou ServiceNotReadyError (avec estimation du délai de disponibilité)"""
+        component = self._components.get(name)
+        if component is None:
+            raise ServiceNotReadyError(name, 'unknown', None)
+        if component.state == READY:
+            return component.instance
+        retry_after = None if component.state == FAILED else self.retry_after(name)
+        raise ServiceNotReadyError(name, component.state, retry_after)
+
+    def retry_after(self, name: str) -> int:
+        """Secondes estimées avant que `name` soit prêt (composants restants avant lui compris)"""
+        target = self._components[name]
+        remaining = 0.0
+        for component in self._components.values():
+            if component.priority > target.priority or component.state in (READY, FAILED):
+                continue
+            if component.state == LOADING:
+                remaining += max(1.0, component.expected_seconds - (time.monotonic() - component.started_at))
+            else:
+                remaining += component.expected_seconds
+        return max(1, int(round(remaining)))
+
+    @property
+    def all_ready(self) -> bool:
+        return all(component.state == READY for component in self._components.values())
+
+    @property
+    def loading(self) -> bool:
+        return any(component.state in (PENDING, LOADING) for component in self._components.values())
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """État par composant (pour /health)"""
+        return {
+            component.name: {
+                'state': component.state,
+                'ready': component.state == READY,
+                'load_seconds': component.load_seconds,
+                'error': component.error
+            }
+            for component in sorted(self._components.values(), key=lambda item: item.priority)
+        }
+
+    def names(self) -> List[str]:
+        return list(self._components)
+
+
+__all__ = ['ServiceRegistry', 'ServiceNotReadyError', 'PENDING', 'LOADING', 'READY', 'FAILED']
@@ -0,0 +1,296 @@
+"""
+🔭 TRAÇAGE DES CHEMINS CRITIQUES
+Spans imbriqués (contextvars) avec échantillonnage en tête de trace
+Export JSON compatible OTLP vers un fichier local ou un collecteur OTLP/HTTP
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = os.getenv('TRACE_SERVICE_NAME', 'ebios-ai-service')
+
+# Codes de statut OTLP
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """Span enregistré (uniquement pour les traces échantillonnées)"""
+
+    __slots__ = ('trace', 'span_id', 'parent_span_id', 'name', 'attributes',
+                 'start_ns', 'end_ns', 'status', 'status_message')
+
+    def __init__(self, trace: '_Trace', name: str, parent_span_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = STATUS_OK
+        self.status_message = ''
+
+    @property
+    def recording(self) -> bool:
+        return True
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or time.time_ns()),
+            'attributes': [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            'status': {'code': self.status, 'message': self.status_message}
+        }
+        if self.parent_span_id:
+            span['parentSpanId'] = self.parent_span_id
+        return span
+
+
+class _NonRecordingSpan:
+    """Span d'une trace non échantillonnée: les enfants ne sont pas réévalués"""
+
+    __slots__ = ()
+    recording = False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+
+NON_RECORDING_SPAN = _NonRecordingSpan()
+
+
+class _Trace:
+    __slots__ = ('trace_id', 'spans')
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {'boolValue': value}
+    elif isinstance(value, int):
+        typed = {'intValue': str(value)}
+    elif isinstance(value, float):
+        typed = {'doubleValue': value}
+    else:
+        typed = {'stringValue': str(value)}
+    return {'key': key, 'value': typed}
+
+
+_current_span: ContextVar[Optional[Any]] = ContextVar('ebios_current_span', default=None)
+
+
+def _reset_current_span(token):
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        # Générateur asynchrone finalisé hors du contexte qui l'a parcouru (flux abandonné)
+        pass
+
+
+class _OTLPExporter:
+    """
+    Export asynchrone des traces terminées (thread dédié, file bornée)
+    - fichier: une requête ExportTraceServiceRequest JSON par ligne
+    - collecteur: POST {endpoint}/v1/traces (OTLP/HTTP JSON)
+    - thread démarré au premier submit() de chaque processus (les workers forkés
+      après l'import n'héritent pas du thread du maître)
+    """
+
+    def __init__(self, file_path: Optional[str], endpoint: Optional[str], max_queue: int = 1000):
+        self.file_path = file_path
+        self.endpoint = endpoint.rstrip('/') + '/v1/traces' if endpoint else None
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._queue: Optional['queue.Queue[Optional[List[Span]]]'] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self) -> 'queue.Queue[Optional[List[Span]]]':
+        """File et thread du processus courant (recréés après un fork)"""
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._queue = queue.Queue(maxsize=self.max_queue)
+                    self._thread = threading.Thread(target=self._run, args=(self._queue,),
+                                                    name='trace-exporter', daemon=True)
+                    self._thread.start()
+                    self._pid = pid
+        return self._queue
+
+    def submit(self, spans: List[Span]):
+        try:
+            self._ensure_started().put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self, timeout: float = 5.0):
+        if self._pid != os.getpid():
+            return
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def _run(self, spans_queue: 'queue.Queue[Optional[List[Span]]]'):
+        while True:
+            spans = spans_queue.get()
+            if spans is None:
+                return
+            try:
+                self._export(self._payload(spans))
+            except Exception as e:
+                logger.warning(f"⚠️ Export de trace impossible: {e}")
+
+    @staticmethod
+    def _payload(spans: List[Span]) -> Dict[str, Any]:
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', SERVICE_NAME)]},
+                'scopeSpans': [{
+                    'scope': {'name': 'ebios.ai.tracing'},
+                    'spans': [span.to_otlp() for span in spans]
+                }]
+            }]
+        }
+
+    def _export(self, payload: Dict[str, Any]):
+        body = json.dumps(payload, separators=(',', ':'))
+        if self.file_path:
+            with open(self.file_path, 'a', encoding='utf-8') as trace_file:
+                trace_file.write(body + '\n')
+        if self.endpoint:
+            request = urllib.request.Request(
+                self.endpoint, data=body.encode(), headers={'Content-Type': 'application/json'}, method='POST'
+            )
+            with urllib.request.urlopen(request, timeout=5):
+                pass
+
+
+class Tracer:
+    """Traceur du service: décision d'échantillonnage au span racine, export à sa fermeture"""
+
+    def __init__(self, sample_rate: float = 0.0, file_path: Optional[str] = None,
+                 endpoint: Optional[str] = None, max_spans_per_trace: int = 1000):
+        self.sample_rate = sample_rate
+        self.max_spans_per_trace = max_spans_per_trace
+        self.exporter = None
+        if sample_rate > 0 and (file_path or endpoint):
+            self.exporter = _OTLPExporter(file_path, endpoint)
+            atexit.register(self.exporter.shutdown)
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Ouvre un span enfant du span courant (ou une nouvelle trace)"""
+        parent = _current_span.get()
+
+        if parent is NON_RECORDING_SPAN or (parent is None and not self._sample()):
+            token = _current_span.set(NON_RECORDING_SPAN)
+            try:
+                yield NON_RECORDING_SPAN
+            finally:
+                _reset_current_span(token)
+            return
+
+        trace = parent.trace if parent is not None else _Trace()
+        if len(trace.spans) >= self.max_spans_per_trace:
+            yield NON_RECORDING_SPAN
+            return
+
+        current = Span(trace, name, parent.span_id if parent is not None else None, attributes)
+        trace.spans.append(current)
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.status = STATUS_ERROR
+            current.status_message = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current.end_ns = time.time_ns()
+            _reset_current_span(token)
+            if parent is None:
+                self.exporter.submit(trace.spans)
+
+    def _sample(self) -> bool:
+        return self.enabled and random.random() < self.sample_rate
+
+
+tracer = Tracer(
+    sample_rate=float(os.getenv('TRACE_SAMPLE_RATE', '0')),
+    file_path=os.getenv('TRACE_EXPORT_FILE') or None,
+    endpoint=os.getenv('TRACE_EXPORT_ENDPOINT') or None
+)
+
+
+def span(name: str, **attributes):
+    """Span du traceur global (context manager)"""
+    return tracer.span(name, **attributes)
+
+
+def current_span():
+    """Span courant (non enregistré hors d'une trace échantillonnée)"""
+    return _current_span.get() or NON_RECORDING_SPAN
+
+
+def annotate(**attributes):
+    """Ajoute des attributs au span courant (tailles d'entrée, résultats de cache...)"""
+    current_span().set_attributes(**attributes)
+
+
+def traced(name: str):
+    """Décorateur: exécute la fonction (synchrone ou coroutine) dans un span"""
+    def decorator(function):
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.span(name):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+__all__ = ['Tracer', 'tracer', 'span', 'current_span', 'annotate', 'traced']
@@ -3,76 +3,147 @@
 Service pour gérer les interactions avec PostgreSQL de manière unifiée
 """
 
+import atexit
+import copy
+import functools
+import inspect
 import logging
 import hashlib
 import json
+import os
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import select, update, insert, text
 
-from config.database import get_db_session
+from config.database import (
+    db_config, get_db_session, get_async_db_session, adapt_database_pool,
+    database_initialized, sync_fallback
+)
 from models.ai_models import (
     AISession, AgentMemory, AISuggestion, 
     SemanticAnalysis, AIQueryCache, AIMetric
 )
+from services.metrics_aggregator import MetricsAggregator
+from services.query_cache_tier import LocalQueryCache, HitCounterBuffer
+from services.query_cache_maintenance import QueryCacheMaintenance
+from services import ai_queries
+from services.observability import POOL_METRICS, record_cache_lookup
+from models.ai_dtos import AISessionDTO, AgentMemoryDTO, AISuggestionDTO
 
 logger = logging.getLogger(__name__)
 
+EMPTY_PAGE = {'items': [], 'next_cursor': None}
+
+
+def _on_db_error(action: str, default: Any):
+    """
+    Décorateur des méthodes synchrones et asynchrones du service:
+    une SQLAlchemyError est journalisée et la méthode retourne une copie de `default`
+    """
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                try:
+                    return await method(self, *args, **kwargs)
+                except SQLAlchemyError as e:
+                    self.logger.error(f"❌ Erreur {action}: {e}")
+                    return copy.deepcopy(default)
+            return async_wrapper
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except SQLAlchemyError as e:
+                self.logger.error(f"❌ Erreur {action}: {e}")
+                return copy.deepcopy(default)
+        return wrapper
+    return decorator
+
+
 class UnifiedDBService:
     """Service unifié pour les opérations de base de données"""
     
     def __init__(self):
         self.logger = logger
+        
+        # Attente, durée d'emprunt, débordements et requêtes lentes du pool exposés sur /metrics
+        db_config.pool_monitor.add_observer(POOL_METRICS)
+        
+        # Tampon des métriques, écrit en lot par flush_buffers()
+        self.metrics_aggregator = MetricsAggregator(
+            raw_sample_rate=float(os.getenv('AI_METRICS_RAW_SAMPLE_RATE', '0'))
+        )
+        
+        # Cache de requêtes: niveau local en lecture + compteurs d'accès différés
+        self.local_query_cache = LocalQueryCache(
+            max_entries=int(os.getenv('AI_QUERY_CACHE_LOCAL_SIZE', '1000')),
+            ttl_seconds=float(os.getenv('AI_QUERY_CACHE_LOCAL_TTL_SECONDS', '30'))
+        )
+        self.query_cache_hits = HitCounterBuffer()
+        
+        # Purge et budget de la table ai_query_cache, exécutés par le thread d'écriture
+        self.query_cache_maintenance = QueryCacheMaintenance.from_env()
+        self._maintenance_interval = float(os.getenv('AI_QUERY_CACHE_MAINTENANCE_INTERVAL_SECONDS', '300'))
+        self._last_maintenance = 0.0
+        
+        self._flush_interval = float(os.getenv('AI_METRICS_FLUSH_INTERVAL_SECONDS', '60'))
+        self._flush_stop = threading.Event()
+        self._flush_thread = None
+        self._flush_lock = threading.Lock()
+        self._flush_at_exit = False
     
     # === GESTION DES SESSIONS AI ===
     
+    @_on_db_error("création session AI", None)
     def create_ai_session(self, user_id: str, mission_id: str, context_data: dict = None) -> Optional[str]:
         """Crée une nouvelle session AI"""
-        try:
-            with get_db_session() as session:
-                # Générer un token unique
-                session_token = hashlib.sha256(f"{user_id}_{mission_id}_{datetime.utcnow()}".encode()).hexdigest()
-                
-                ai_session = AISession(
-                    user_id=user_id,
-                    mission_id=mission_id,
-                    session_token=session_token,
-                    context_data=context_data or {}
-                )
-                
-                session.add(ai_session)
-                session.commit()
-                
-                self.logger.info(f"✅ Session AI créée: {session_token}")
-                return session_token
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"❌ Erreur création session AI: {e}")
-            return None
+        row = self._ai_session_row(user_id, mission_id, context_data)
+        with get_db_session() as session:
+            session.execute(insert(AISession).values(row))
+        
+        return self._ai_session_created(row)
     
-    def get_ai_session(self, session_token: str) -> Optional[AISession]:
-        """Récupère une session AI par token"""
-        try:
-            with get_db_session() as session:
-                ai_session = session.query(AISession).filter(
-                    and_(
-                        AISession.session_token == session_token,
-                        AISession.is_active == True,
-                        AISession.expires_at > datetime.utcnow()
-                    )
-                ).first()
-                
-                if ai_session:
-                    # Mettre à jour l'activité
-                    ai_session.last_activity = datetime.utcnow()
-                    session.commit()
-                
-                return ai_session
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"❌ Erreur récupération session AI: {e}")
-            return None
+    @_on_db_error("récupération session AI", None)
+    def get_ai_session(self, session_token: str) -> Optional[AISessionDTO]:
+        """Récupère une session AI par token et met à jour son activité (un seul UPDATE ... RETURNING)"""
+        with get_db_session() as session:
+            row = session.execute(self._touch_ai_session_stmt(session_token)).first()
+        
+        return AISessionDTO.from_row(row) if row else None
+    
+    @staticmethod
+    def _ai_session_row(user_id: str, mission_id: str, context_data: Optional[dict]) -> Dict[str, Any]:
+        # Générer un token unique
+        session_token = hashlib.sha256(f"{user_id}_{mission_id}_{datetime.utcnow()}".encode()).hexdigest()
+        return {
+            'user_id': user_id,
+            'mission_id': mission_id,
+            'session_token': session_token,
+            'context_data': context_data or {}
+        }
+    
+    def _ai_session_created(self, row: Dict[str, Any]) -> str:
+        self.logger.info(f"✅ Session AI créée: {row['session_token']}")
+        return row['session_token']
+    
+    @staticmethod
+    def _touch_ai_session_stmt(session_token: str):
+        now = datetime.utcnow()
+        return (
+            update(AISession)
+            .where(
+                AISession.session_token == session_token,
+                AISession.is_active == True,
+                AISession.expires_at > now
+            )
+            .values(last_activity=now)
+            .returning(*AISessionDTO.columns())
+        )
     
     # === GESTION DE LA MÉMOIRE DES AGENTS ===
     
@@ -80,61 +151,50 @@ class UnifiedDBService:
                           memory_type: str, content: dict, relevance_score: float = 0.5,
                           tags: List[str] = None, expires_hours: int = None) -> bool:
         """Stocke une entrée de mémoire d'agent"""
-        try:
-            with get_db_session() as session:
-                expires_at = None
-                if expires_hours:
-                    expires_at = datetime.utcnow() + timedelta(hours=expires_hours)
-                
-                memory = AgentMemory(
-                    mission_id=mission_id,
-                    user_id=user_id,
-                    agent_type=agent_type,
-                    memory_type=memory_type,
-                    content=content,
-                    relevance_score=relevance_score,
-                    tags=tags or [],
-                    meta_data={},
-                    expires_at=expires_at
-                )
-                
-                session.add(memory)
-                session.commit()
-                
-                self.logger.info(f"✅ Mémoire agent stockée: {agent_type}/{memory_type}")
-                return True
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"❌ Erreur stockage mémoire agent: {e}")
-            return False
+        return bool(self.store_agent_memories_bulk([{
+            'mission_id': mission_id, 'user_id': user_id, 'agent_type': agent_type,
+            'memory_type': memory_type, 'content': content, 'relevance_score': relevance_score,
+            'tags': tags, 'expires_hours': expires_hours
+        }]))
     
+    @_on_db_error("stockage mémoires agent", [])
+    def store_agent_memories_bulk(self, memories: List[Dict[str, Any]]) -> List[str]:
+        """
+        Stocke plusieurs entrées de mémoire en une transaction
+        Chaque élément reprend les paramètres de store_agent_memory; retourne les IDs dans l'ordre
+        """
+        if not memories:
+            return []
+        
+        rows = [ai_queries.agent_memory_row(**memory) for memory in memories]
+        with get_db_session() as session:
+            for statement in ai_queries.bulk_insert_statements(AgentMemory, rows):
+                session.execute(statement)
+        
+        return self._inserted_ids(rows, "mémoires agent stockées")
+    
+    @_on_db_error("récupération mémoire agent", [])
     def get_agent_memory(self, mission_id: str, agent_type: str, memory_type: str = None,
-                        limit: int = 10) -> List[AgentMemory]:
+                        limit: int = 10) -> List[AgentMemoryDTO]:
         """Récupère la mémoire d'un agent"""
-        try:
-            with get_db_session() as session:
-                query = session.query(AgentMemory).filter(
-                    and_(
-                        AgentMemory.mission_id == mission_id,
-                        AgentMemory.agent_type == agent_type,
-                        or_(
-                            AgentMemory.expires_at.is_(None),
-                            AgentMemory.expires_at > datetime.utcnow()
-                        )
-                    )
-                )
-                
-                if memory_type:
-                    query = query.filter(AgentMemory.memory_type == memory_type)
-                
-                memories = query.order_by(desc(AgentMemory.relevance_score), 
-                                        desc(AgentMemory.created_at)).limit(limit).all()
-                
-                return memories
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"❌ Erreur récupération mémoire agent: {e}")
-            return []
+        stmt = self._agent_memory_stmt(mission_id, agent_type, memory_type).limit(limit)
+        with get_db_session() as session:
+            rows = session.execute(stmt).all()
+        
+        return [AgentMemoryDTO.from_row(row) for row in rows]
+    
+    @_on_db_error("récupération mémoire agent", EMPTY_PAGE)
+    def get_agent_memory_page(self, mission_id: str, agent_type: str, memory_type: str = None,
+                              limit: int = 20, cursor: str = None) -> Dict[str, Any]:
+        """
+        Page de mémoire d'agent paginée par clé (relevance_score, created_at, id), NULL en dernier
+        Retourne {'items': [...], 'next_cursor': str | None}; lève ValueError si le curseur est invalide
+        """
+        stmt = self._agent_memory_page_stmt(mission_id, agent_type, memory_type, limit, cursor)
+        with get_db_session() as session:
+            rows = session.execute(stmt).all()
+        
+        return self._dto_page(AgentMemoryDTO, rows, limit, 'relevance_score')
     
     # === GESTION DES SUGGESTIONS AI ===
     
@@ -142,137 +202,461 @@ class UnifiedDBService:
                            content: str, confidence_score: float, context_data: dict = None,
                            workshop_id: str = None) -> bool:
         """Crée une suggestion AI"""
-        try:
-            with get_db_session() as session:
-                suggestion = AISuggestion(
-                    mission_id=mission_id,
-                    workshop_id=workshop_id,
-                    user_id=user_id,
-                    suggestion_type=suggestion_type,
-                    content=content,
-                    confidence_score=confidence_score,
-                    context_data=context_data or {}
-                )
-                
-                session.add(suggestion)
-                session.commit()
-                
-                self.logger.info(f"✅ Suggestion AI créée: {suggestion_type}")
-                return True
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"❌ Erreur création suggestion AI: {e}")
-            return False
+        return bool(self.create_ai_suggestions_bulk([{
+            'mission_id': mission_id, 'user_id': user_id, 'suggestion_type': suggestion_type,
+            'content': content, 'confidence_score': confidence_score, 'context_data': context_data,
+            'workshop_id': workshop_id
+        }]))
+    
+    @_on_db_error("création suggestions AI", [])
+    def create_ai_suggestions_bulk(self, suggestions: List[Dict[str, Any]]) -> List[str]:
+        """
+        Crée plusieurs suggestions AI en une transaction
+        Chaque élément reprend les paramètres de create_ai_suggestion; retourne les IDs dans l'ordre
+        """
+        if not suggestions:
+            return []
+        
+        rows = [ai_queries.ai_suggestion_row(**suggestion) for suggestion in suggestions]
+        with get_db_session() as session:
+            for statement in ai_queries.bulk_insert_statements(AISuggestion, rows):
+                session.execute(statement)
+        
+        return self._inserted_ids(rows, "suggestions AI créées")
     
+    @_on_db_error("récupération suggestions AI", [])
     def get_ai_suggestions(self, mission_id: str, suggestion_type: str = None,
-                          workshop_id: str = None, limit: int = 10) -> List[AISuggestion]:
+                          workshop_id: str = None, limit: int = 10) -> List[AISuggestionDTO]:
         """Récupère les suggestions AI"""
-        try:
-            with get_db_session() as session:
-                query = session.query(AISuggestion).filter(
-                    AISuggestion.mission_id == mission_id
-                )
-                
-                if suggestion_type:
-                    query = query.filter(AISuggestion.suggestion_type == suggestion_type)
-                
-                if workshop_id:
-                    query = query.filter(AISuggestion.workshop_id == workshop_id)
-                
-                suggestions = query.order_by(desc(AISuggestion.confidence_score),
-                                           desc(AISuggestion.created_at)).limit(limit).all()
-                
-                return suggestions
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"❌ Erreur récupération suggestions AI: {e}")
-            return []
+        stmt = self._ai_suggestions_stmt(mission_id, suggestion_type, workshop_id).limit(limit)
+        with get_db_session() as session:
+            rows = session.execute(stmt).all()
+        
+        return [AISuggestionDTO.from_row(row) for row in rows]
+    
+    @_on_db_error("récupération suggestions AI", EMPTY_PAGE)
+    def get_ai_suggestions_page(self, mission_id: str, suggestion_type: str = None,
+                                workshop_id: str = None, limit: int = 20,
+                                cursor: str = None) -> Dict[str, Any]:
+        """
+        Page de suggestions AI paginée par clé (confidence_score, created_at, id), NULL en dernier
+        Retourne {'items': [...], 'next_cursor': str | None}; lève ValueError si le curseur est invalide
+        """
+        stmt = self._ai_suggestions_page_stmt(mission_id, suggestion_type, workshop_id, limit, cursor)
+        with get_db_session() as session:
+            rows = session.execute(stmt).all()
+        
+        return self._dto_page(AISuggestionDTO, rows, limit, 'confidence_score')
+    
+    # === PAGINATION PAR CLÉ ===
+    
+    @staticmethod
+    def _agent_memory_stmt(mission_id: str, agent_type: str, memory_type: Optional[str]):
+        """Colonnes de AgentMemoryDTO"""
+        return ai_queries.agent_memory_stmt(AgentMemory, AgentMemoryDTO.columns(),
+                                            mission_id, agent_type, memory_type)
+    
+    def _agent_memory_page_stmt(self, mission_id: str, agent_type: str, memory_type: Optional[str],
+                                limit: int, cursor: Optional[str]):
+        return ai_queries.page_stmt(self._agent_memory_stmt(mission_id, agent_type, memory_type),
+                                    AgentMemory.relevance_score, AgentMemory.created_at, AgentMemory.id,
+                                    limit, cursor)
+    
+    @staticmethod
+    def _ai_suggestions_stmt(mission_id: str, suggestion_type: Optional[str], workshop_id: Optional[str]):
+        """Colonnes de AISuggestionDTO"""
+        return ai_queries.ai_suggestions_stmt(AISuggestion, AISuggestionDTO.columns(),
+                                              mission_id, suggestion_type, workshop_id)
+    
+    def _ai_suggestions_page_stmt(self, mission_id: str, suggestion_type: Optional[str],
+                                  workshop_id: Optional[str], limit: int, cursor: Optional[str]):
+        return ai_queries.page_stmt(self._ai_suggestions_stmt(mission_id, suggestion_type, workshop_id),
+                                    AISuggestion.confidence_score, AISuggestion.created_at, AISuggestion.id,
+                                    limit, cursor)
+    
+    # === RÉSULTATS (partagés par les variantes synchrones et asynchrones) ===
+    
+    def _inserted_ids(self, rows: List[Dict[str, Any]], description: str) -> List[str]:
+        self.logger.info(f"✅ {len(rows)} {description}")
+        return [str(row['id']) for row in rows]
+    
+    @staticmethod
+    def _dto_page(dto_class, rows: List[Any], limit: int, score_attribute: str) -> Dict[str, Any]:
+        return ai_queries.keyset_page([dto_class.from_row(row) for row in rows], limit, score_attribute)
     
     # === GESTION DU CACHE DES REQUÊTES ===
     
+    @_on_db_error("récupération cache", None)
     def get_cached_query(self, query_text: str) -> Optional[dict]:
-        """Récupère une requête en cache"""
-        try:
-            query_hash = hashlib.sha256(query_text.encode()).hexdigest()
-            
-            with get_db_session() as session:
-                cached = session.query(AIQueryCache).filter(
-                    and_(
-                        AIQueryCache.query_hash == query_hash,
-                        AIQueryCache.expires_at > datetime.utcnow()
-                    )
-                ).first()
-                
-                if cached:
-                    cached.increment_hit()
-                    session.commit()
-                    return cached.response_data
-                
-                return None
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"❌ Erreur récupération cache: {e}")
-            return None
+        """
+        Récupère une requête en cache
+        Lecture seule: le niveau local est consulté d'abord, les hits sont comptés en mémoire
+        """
+        query_hash = self._query_hash(query_text)
+        response_data = self._local_cached_query(query_hash)
+        if response_data is not None:
+            return response_data
+        
+        with get_db_session() as session:
+            row = session.execute(self._cached_query_stmt(query_hash)).first()
+        
+        return self._cached_query_result(query_hash, row)
     
+    @_on_db_error("mise en cache", False)
     def cache_query_response(self, query_text: str, response_data: dict, 
                            model_used: str = None, tokens_used: int = None,
                            processing_time_ms: int = None, expires_hours: int = 1) -> bool:
         """Met en cache une réponse de requête"""
-        try:
-            query_hash = hashlib.sha256(query_text.encode()).hexdigest()
-            expires_at = datetime.utcnow() + timedelta(hours=expires_hours)
-            
-            with get_db_session() as session:
-                # Vérifier si existe déjà
-                existing = session.query(AIQueryCache).filter(
-                    AIQueryCache.query_hash == query_hash
-                ).first()
-                
-                if existing:
-                    existing.response_data = response_data
-                    existing.expires_at = expires_at
-                    existing.last_accessed = datetime.utcnow()
-                else:
-                    cached = AIQueryCache(
-                        query_hash=query_hash,
-                        query_text=query_text,
-                        response_data=response_data,
-                        model_used=model_used,
-                        tokens_used=tokens_used,
-                        processing_time_ms=processing_time_ms,
-                        expires_at=expires_at
-                    )
-                    session.add(cached)
-                
-                session.commit()
-                return True
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"❌ Erreur mise en cache: {e}")
-            return False
+        entry = self._query_cache_entry(query_text, response_data, model_used, tokens_used,
+                                        processing_time_ms, expires_hours)
+        with get_db_session() as session:
+            if not session.execute(self._refresh_cache_entry_stmt(entry)).rowcount:
+                session.execute(insert(AIQueryCache).values(entry))
+        
+        return self._cache_locally(entry)
+    
+    @staticmethod
+    def _query_hash(query_text: str) -> str:
+        return hashlib.sha256(query_text.encode()).hexdigest()
+    
+    def _local_cached_query(self, query_hash: str) -> Optional[dict]:
+        """Niveau local: réponse ou None (le hit est compté en mémoire)"""
+        response_data = self.local_query_cache.get(query_hash)
+        if response_data is not None:
+            self.query_cache_hits.record_hit(query_hash)
+            self._ensure_background_flush()
+            record_cache_lookup('ai_query_cache', 'local_hit')
+        return response_data
+    
+    @staticmethod
+    def _cached_query_stmt(query_hash: str):
+        return select(AIQueryCache.response_data, AIQueryCache.expires_at).where(
+            AIQueryCache.query_hash == query_hash,
+            AIQueryCache.expires_at > datetime.utcnow()
+        )
+    
+    def _cached_query_result(self, query_hash: str, row) -> Optional[dict]:
+        """Ligne lue en base: remontée au niveau local et hit compté en mémoire"""
+        if row is None:
+            record_cache_lookup('ai_query_cache', 'miss')
+            return None
+        
+        self.local_query_cache.put(query_hash, row.response_data, row.expires_at)
+        self.query_cache_hits.record_hit(query_hash)
+        self._ensure_background_flush()
+        record_cache_lookup('ai_query_cache', 'hit')
+        return row.response_data
+    
+    def _query_cache_entry(self, query_text: str, response_data: dict, model_used: Optional[str],
+                           tokens_used: Optional[int], processing_time_ms: Optional[int],
+                           expires_hours: int) -> Dict[str, Any]:
+        return {
+            'query_hash': self._query_hash(query_text),
+            'query_text': query_text,
+            'response_data': response_data,
+            'model_used': model_used,
+            'tokens_used': tokens_used,
+            'processing_time_ms': processing_time_ms,
+            'expires_at': datetime.utcnow() + timedelta(hours=expires_hours)
+        }
+    
+    @staticmethod
+    def _refresh_cache_entry_stmt(entry: Dict[str, Any]):
+        """Entrée existante: réponse et expiration remplacées (aucune ligne si absente)"""
+        return (
+            update(AIQueryCache)
+            .where(AIQueryCache.query_hash == entry['query_hash'])
+            .values(response_data=entry['response_data'], expires_at=entry['expires_at'],
+                    last_accessed=datetime.utcnow())
+        )
+    
+    def _cache_locally(self, entry: Dict[str, Any]) -> bool:
+        self.local_query_cache.put(entry['query_hash'], entry['response_data'], entry['expires_at'])
+        return True
     
     # === MÉTRIQUES ===
     
     def record_ai_metric(self, metric_type: str, service_name: str, value: float,
                         unit: str = None, context: dict = None) -> bool:
-        """Enregistre une métrique AI"""
+        """
+        Enregistre une métrique AI dans le tampon d'agrégation
+        L'écriture en base se fait en lot par flush_buffers() (tâche de fond)
+        """
+        self.metrics_aggregator.record(metric_type, service_name, value, unit, context)
+        self._ensure_background_flush()
+        return True
+    
+    # === ÉCRITURES DIFFÉRÉES ===
+    
+    def flush_buffers(self) -> bool:
+        """Écrit en base le contenu des tampons en mémoire (métriques, compteurs d'accès)"""
+        if not database_initialized():
+            # Tampons conservés jusqu'à l'initialisation de la base
+            return False
+        metrics_ok = self._flush_metrics()
+        hits_ok = self._flush_query_cache_hits()
+        return metrics_ok and hits_ok
+    
+    def _flush_metrics(self) -> bool:
+        rows = self.metrics_aggregator.drain()
+        if not rows:
+            return True
+        
         try:
             with get_db_session() as session:
-                metric = AIMetric(
-                    metric_type=metric_type,
-                    service_name=service_name,
-                    value=value,
-                    unit=unit,
-                    context=context or {}
-                )
-                
-                session.add(metric)
-                session.commit()
-                return True
-                
+                session.execute(insert(AIMetric), rows)
+            
+            self.logger.info(f"📈 {len(rows)} lignes de métriques écrites")
+            return True
+            
         except SQLAlchemyError as e:
-            self.logger.error(f"❌ Erreur enregistrement métrique: {e}")
+            self.metrics_aggregator.restore(rows)
+            self.logger.error(f"❌ Erreur écriture métriques ({len(rows)} lignes remises en tampon): {e}")
             return False
+    
+    def _flush_query_cache_hits(self, chunk_size: int = 1000) -> bool:
+        """Applique les hits accumulés avec un UPDATE ... FROM (VALUES ...) par paquet"""
+        hits = self.query_cache_hits.drain()
+        if not hits:
+            return True
+        
+        try:
+            with get_db_session() as session:
+                for start in range(0, len(hits), chunk_size):
+                    chunk = hits[start:start + chunk_size]
+                    params = {}
+                    values = []
+                    for i, (query_hash, count, last_accessed) in enumerate(chunk):
+                        params.update({f"h{i}": query_hash, f"n{i}": count, f"t{i}": last_accessed})
+                        values.append(f"(:h{i}, CAST(:n{i} AS INTEGER), CAST(:t{i} AS TIMESTAMPTZ))")
+                    
+                    session.execute(text(f"""
+                        UPDATE ai_query_cache AS c
+                        SET hit_count = c.hit_count + v.hits,
+                            last_accessed = GREATEST(c.last_accessed, v.last_accessed)
+                        FROM (VALUES {', '.join(values)}) AS v(query_hash, hits, last_accessed)
+                        WHERE c.query_hash = v.query_hash
+                    """), params)
+            
+            return True
+            
+        except SQLAlchemyError as e:
+            # Transaction annulée: aucun paquet n'a été appliqué
+            self.query_cache_hits.restore(hits)
+            self.logger.error(f"❌ Erreur écriture compteurs cache ({len(hits)} remis en tampon): {e}")
+            return False
+    
+    def start_background_flush(self, interval_seconds: float = None):
+        """
+        Démarre le thread d'écriture périodique des tampons
+        Les tampons sont aussi vidés à la sortie de l'interpréteur (atexit)
+        """
+        with self._flush_lock:
+            if self._flush_thread and self._flush_thread.is_alive():
+                return
+            
+            if interval_seconds:
+                self._flush_interval = interval_seconds
+            
+            if not self._flush_at_exit:
+                atexit.register(self.stop_background_flush)
+                self._flush_at_exit = True
+            
+            self._flush_stop.clear()
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop, name="unified-db-flush", daemon=True
+            )
+            self._flush_thread.start()
+        self.logger.info(f"📈 Écriture différée des métriques toutes les {self._flush_interval}s")
+    
+    def _ensure_background_flush(self):
+        """Démarre l'écriture différée au premier tampon rempli, une fois la base initialisée (sauf après arrêt)"""
+        if self._flush_thread is None and not self._flush_stop.is_set() and database_initialized():
+            self.start_background_flush()
+    
+    def stop_background_flush(self):
+        """Arrête le thread d'écriture et vide les tampons"""
+        with self._flush_lock:
+            self._flush_stop.set()
+            thread, self._flush_thread = self._flush_thread, None
+        if thread:
+            thread.join(timeout=self._flush_interval + 5)
+        self.flush_buffers()
+    
+    def _flush_loop(self):
+        while not self._flush_stop.wait(self._flush_interval):
+            try:
+                self.flush_buffers()
+            except Exception as e:
+                self.logger.error(f"❌ Erreur écriture différée: {e}")
+            
+            try:
+                adapt_database_pool()
+            except Exception as e:
+                self.logger.error(f"❌ Erreur évaluation du pool: {e}")
+            
+            if time.monotonic() - self._last_maintenance >= self._maintenance_interval:
+                self._last_maintenance = time.monotonic()
+                try:
+                    self.query_cache_maintenance.run()
+                except Exception as e:
+                    self.logger.error(f"❌ Erreur maintenance cache requêtes: {e}")
+    
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """Taille de la table de cache et état des niveaux en mémoire"""
+        stats = self.query_cache_maintenance.get_stats()
+        stats['local_entries'] = len(self.local_query_cache)
+        stats['pending_hit_updates'] = self.query_cache_hits.pending()
+        return stats
+    
+    # === VARIANTES ASYNCHRONES (engine asyncpg, pour l'application FastAPI) ===
+    # Mêmes requêtes et résultats que les méthodes synchrones: seule l'exécution diffère
+    # Sans engine asynchrone, chaque variante exécute la méthode synchrone dans un thread
+    
+    @sync_fallback('create_ai_session')
+    @_on_db_error("création session AI", None)
+    async def create_ai_session_async(self, user_id: str, mission_id: str, context_data: dict = None) -> Optional[str]:
+        """Crée une nouvelle session AI (asynchrone)"""
+        row = self._ai_session_row(user_id, mission_id, context_data)
+        async with get_async_db_session() as session:
+            await session.execute(insert(AISession).values(row))
+        
+        return self._ai_session_created(row)
+    
+    @sync_fallback('get_ai_session')
+    @_on_db_error("récupération session AI", None)
+    async def get_ai_session_async(self, session_token: str) -> Optional[AISessionDTO]:
+        """Récupère une session AI par token et met à jour son activité (asynchrone)"""
+        async with get_async_db_session() as session:
+            row = (await session.execute(self._touch_ai_session_stmt(session_token))).first()
+        
+        return AISessionDTO.from_row(row) if row else None
+    
+    async def store_agent_memory_async(self, mission_id: str, user_id: str, agent_type: str,
+                                       memory_type: str, content: dict, relevance_score: float = 0.5,
+                                       tags: List[str] = None, expires_hours: int = None) -> bool:
+        """Stocke une entrée de mémoire d'agent (asynchrone)"""
+        return bool(await self.store_agent_memories_bulk_async([{
+            'mission_id': mission_id, 'user_id': user_id, 'agent_type': agent_type,
+            'memory_type': memory_type, 'content': content, 'relevance_score': relevance_score,
+            'tags': tags, 'expires_hours': expires_hours
+        }]))
+    
+    @sync_fallback('store_agent_memories_bulk')
+    @_on_db_error("stockage mémoires agent", [])
+    async def store_agent_memories_bulk_async(self, memories: List[Dict[str, Any]]) -> List[str]:
+        """Stocke plusieurs entrées de mémoire en une transaction (asynchrone)"""
+        if not memories:
+            return []
+        
+        rows = [ai_queries.agent_memory_row(**memory) for memory in memories]
+        async with get_async_db_session() as session:
+            for statement in ai_queries.bulk_insert_statements(AgentMemory, rows):
+                await session.execute(statement)
+        
+        return self._inserted_ids(rows, "mémoires agent stockées")
+    
+    @sync_fallback('get_agent_memory')
+    @_on_db_error("récupération mémoire agent", [])
+    async def get_agent_memory_async(self, mission_id: str, agent_type: str, memory_type: str = None,
+                                     limit: int = 10) -> List[AgentMemoryDTO]:
+        """Récupère la mémoire d'un agent (asynchrone)"""
+        stmt = self._agent_memory_stmt(mission_id, agent_type, memory_type).limit(limit)
+        async with get_async_db_session() as session:
+            rows = (await session.execute(stmt)).all()
+        
+        return [AgentMemoryDTO.from_row(row) for row in rows]
+    
+    @sync_fallback('get_agent_memory_page')
+    @_on_db_error("récupération mémoire agent", EMPTY_PAGE)
+    async def get_agent_memory_page_async(self, mission_id: str, agent_type: str, memory_type: str = None,
+                                          limit: int = 20, cursor: str = None) -> Dict[str, Any]:
+        """Page de mémoire d'agent paginée par clé (asynchrone)"""
+        stmt = self._agent_memory_page_stmt(mission_id, agent_type, memory_type, limit, cursor)
+        async with get_async_db_session() as session:
+            rows = (await session.execute(stmt)).all()
+        
+        return self._dto_page(AgentMemoryDTO, rows, limit, 'relevance_score')
+    
+    async def create_ai_suggestion_async(self, mission_id: str, user_id: str, suggestion_type: str,
+                                         content: str, confidence_score: float, context_data: dict = None,
+                                         workshop_id: str = None) -> bool:
+        """Crée une suggestion AI (asynchrone)"""
+        return bool(await self.create_ai_suggestions_bulk_async([{
+            'mission_id': mission_id, 'user_id': user_id, 'suggestion_type': suggestion_type,
+            'content': content, 'confidence_score': confidence_score, 'context_data': context_data,
+            'workshop_id': workshop_id
+        }]))
+    
+    @sync_fallback('create_ai_suggestions_bulk')
+    @_on_db_error("création suggestions AI", [])
+    async def create_ai_suggestions_bulk_async(self, suggestions: List[Dict[str, Any]]) -> List[str]:
+        """Crée plusieurs suggestions AI en une transaction (asynchrone)"""
+        if not suggestions:
+            return []
+        
+        rows = [ai_queries.ai_suggestion_row(**suggestion) for suggestion in suggestions]
+        async with get_async_db_session() as session:
+            for statement in ai_queries.bulk_insert_statements(AISuggestion, rows):
+                await session.execute(statement)
+        
+        return self._inserted_ids(rows, "suggestions AI créées")
+    
+    @sync_fallback('get_ai_suggestions')
+    @_on_db_error("récupération suggestions AI", [])
+    async def get_ai_suggestions_async(self, mission_id: str, suggestion_type: str = None,
+                                       workshop_id: str = None, limit: int = 10) -> List[AISuggestionDTO]:
+        """Récupère les suggestions AI (asynchrone)"""
+        stmt = self._ai_suggestions_stmt(mission_id, suggestion_type, workshop_id).limit(limit)
+        async with get_async_db_session() as session:
+            rows = (await session.execute(stmt)).all()
+        
+        return [AISuggestionDTO.from_row(row) for row in rows]
+    
+    @sync_fallback('get_ai_suggestions_page')
+    @_on_db_error("récupération suggestions AI", EMPTY_PAGE)
+    async def get_ai_suggestions_page_async(self, mission_id: str, suggestion_type: str = None,
+                                            workshop_id: str = None, limit: int = 20,
+                                            cursor: str = None) -> Dict[str, Any]:
+        """Page de suggestions AI paginée par clé (asynchrone)"""
+        stmt = self._ai_suggestions_page_stmt(mission_id, suggestion_type, workshop_id, limit, cursor)
+        async with get_async_db_session() as session:
+            rows = (await session.execute(stmt)).all()
+        
+        return self._dto_page(AISuggestionDTO, rows, limit, 'confidence_score')
+    
+    @sync_fallback('get_cached_query')
+    @_on_db_error("récupération cache", None)
+    async def get_cached_query_async(self, query_text: str) -> Optional[dict]:
+        """Récupère une requête en cache (asynchrone, lecture seule)"""
+        query_hash = self._query_hash(query_text)
+        response_data = self._local_cached_query(query_hash)
+        if response_data is not None:
+            return response_data
+        
+        async with get_async_db_session() as session:
+            row = (await session.execute(self._cached_query_stmt(query_hash))).first()
+        
+        return self._cached_query_result(query_hash, row)
+    
+    @sync_fallback('cache_query_response')
+    @_on_db_error("mise en cache", False)
+    async def cache_query_response_async(self, query_text: str, response_data: dict,
+                                         model_used: str = None, tokens_used: int = None,
+                                         processing_time_ms: int = None, expires_hours: int = 1) -> bool:
+        """Met en cache une réponse de requête (asynchrone)"""
+        entry = self._query_cache_entry(query_text, response_data, model_used, tokens_used,
+                                        processing_time_ms, expires_hours)
+        async with get_async_db_session() as session:
+            if not (await session.execute(self._refresh_cache_entry_stmt(entry))).rowcount:
+                await session.execute(insert(AIQueryCache).values(entry))
+        
+        return self._cache_locally(entry)
+    
+    async def record_ai_metric_async(self, metric_type: str, service_name: str, value: float,
+                                     unit: str = None, context: dict = None) -> bool:
+        """Enregistre une métrique AI (tampon en mémoire, aucun accès base)"""
+        return self.record_ai_metric(metric_type, service_name, value, unit, context)
 
 # Instance globale
 unified_db = UnifiedDBService()
@@ -5,20 +5,18 @@ Service IA spécialisé pour l'assistance Workshop 1 EBIOS RM
 
 import asyncio
 import logging
+import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 import json
 import numpy as np
 from dataclasses import dataclass
 
-# Imports pour l'IA
-try:
-    from transformers import pipeline, AutoTokenizer, AutoModel
-    from sentence_transformers import SentenceTransformer
-    import torch
-    AI_LIBRARIES_AVAILABLE = True
-except ImportError:
-    AI_LIBRARIES_AVAILABLE = False
+from services.optional_dependencies import modules_available
+
+# Librairies IA sondées sans import (chargées avec les modèles)
+AI_LIBRARIES_AVAILABLE = modules_available('transformers', 'sentence_transformers', 'torch')
+if not AI_LIBRARIES_AVAILABLE:
     logging.warning("🔧 Librairies IA non disponibles, mode simulation activé")
 
 from models.ebios_models import (
@@ -29,9 +27,19 @@ from models.ebios_models import (
     SuggestionPriority,
     CriticalityLevel
 )
+from services.batch_analysis import (
+    CATEGORIES, element_texts, vectorized_metrics, segment_coherence, plan_encode_batches
+)
+from services.observability import encode_timer, format_memory_usage
 
 logger = logging.getLogger(__name__)
 
+SEMANTIC_MODEL_NAME = 'all-MiniLM-L6-v2'
+TEXT_GENERATION_MODEL_NAME = 'gpt2'
+
+# Nombre maximal de textes par appel d'encodage en analyse par lots
+BATCH_ENCODE_MAX_TEXTS = int(os.getenv('AI_BATCH_ENCODE_MAX_TEXTS', '1024'))
+
 @dataclass
 class EbiosKnowledge:
     """Base de connaissances EBIOS RM"""
@@ -89,13 +97,16 @@ class Workshop1AIService:
         """Initialise les modèles IA si disponibles"""
         if AI_LIBRARIES_AVAILABLE:
             try:
+                from sentence_transformers import SentenceTransformer
+                from transformers import pipeline
+
                 # Modèle pour l'analyse sémantique
-                self.ai_models['semantic'] = SentenceTransformer('all-MiniLM-L6-v2')
+                self.ai_models['semantic'] = SentenceTransformer(SEMANTIC_MODEL_NAME)
                 
                 # Modèle pour la génération de texte
                 self.ai_models['text_generator'] = pipeline(
                     'text-generation',
-                    model='gpt2',
+                    model=TEXT_GENERATION_MODEL_NAME,
                     max_length=100,
                     num_return_sequences=1
                 )
@@ -111,6 +122,12 @@ class Workshop1AIService:
         """Vérifie si le service est prêt"""
         return True
     
+    def get_model_version(self) -> str:
+        """Modèles effectivement chargés (les résultats diffèrent en mode simulation)"""
+        if not self.ai_models:
+            return "simulation"
+        return f"{SEMANTIC_MODEL_NAME}+{TEXT_GENERATION_MODEL_NAME}"
+    
     def get_request_count(self) -> int:
         """Retourne le nombre de requêtes traitées"""
         return self.request_count
@@ -123,8 +140,8 @@ class Workshop1AIService:
         return f"{hours}h {minutes}m"
     
     def get_memory_usage(self) -> str:
-        """Retourne l'utilisation mémoire (simulée)"""
-        return "150 MB"
+        """Retourne la mémoire résidente du processus"""
+        return format_memory_usage()
     
     async def analyze_workshop_context(
         self,
@@ -179,6 +196,92 @@ class Workshop1AIService:
             estimated_completion_time=self._estimate_completion_time(completion_status)
         )
     
+    async def analyze_missions_batch(
+        self,
+        missions: List[Dict[str, Any]],
+        max_texts_per_encode: int = BATCH_ENCODE_MAX_TEXTS
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Analyse de N missions en un appel
+        - métriques de complétude et de détail vectorisées sur toutes les missions
+        - un encodage partagé par lot de missions (au plus max_texts_per_encode textes)
+        Produit (index, analyse) au fil des lots terminés
+        """
+        self.request_count += len(missions)
+        logger.info(f"🔍 Analyse par lots: {len(missions)} missions")
+
+        metrics = vectorized_metrics(missions)
+        texts = [element_texts(mission) for mission in missions]
+
+        for batch in plan_encode_batches([len(mission_texts) for mission_texts in texts], max_texts_per_encode):
+            coherence = await self._batch_semantic_coherence([texts[index] for index in batch])
+
+            for position, index in enumerate(batch):
+                yield index, await self._batch_mission_analysis(
+                    missions[index], metrics, index, float(coherence[position])
+                )
+
+    async def _batch_semantic_coherence(self, batch_texts: List[List[str]]) -> np.ndarray:
+        """Cohérence sémantique par mission depuis un seul encodage (NaN sans modèle)"""
+        sizes = [len(mission_texts) for mission_texts in batch_texts]
+        model = self.ai_models.get('semantic')
+        if not model or not sum(sizes):
+            return np.full(len(sizes), np.nan)
+
+        flat_texts = [text for mission_texts in batch_texts for text in mission_texts]
+        try:
+            with encode_timer(SEMANTIC_MODEL_NAME, len(flat_texts)):
+                embeddings = await asyncio.to_thread(model.encode, flat_texts, convert_to_numpy=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Encodage par lots impossible, cohérence basique: {e}")
+            return np.full(len(sizes), np.nan)
+
+        return segment_coherence(embeddings, sizes)
+
+    async def _batch_mission_analysis(
+        self,
+        mission: Dict[str, Any],
+        metrics: Dict[str, np.ndarray],
+        index: int,
+        semantic_coherence: float
+    ) -> Dict[str, Any]:
+        """Analyse d'une mission depuis les métriques calculées pour tout le lot"""
+        sections = [mission.get(category) or [] for category in CATEGORIES]
+        completion_status = dict(zip(CATEGORIES, (bool(done) for done in metrics['completion'][index])))
+
+        if np.isnan(semantic_coherence):
+            coherence = self._basic_coherence_analysis(*sections)
+        else:
+            coherence = semantic_coherence
+
+        mission_id = mission.get('mission_id', '')
+        suggestions = await self._generate_contextual_suggestions(
+            mission_id, *sections, mission.get('current_step')
+        )
+
+        return {
+            "mission_id": mission_id,
+            "completion_status": completion_status,
+            "quality_metrics": {
+                "completeness": float(metrics['completeness'][index]),
+                "coherence": float(coherence),
+                "detail_level": float(metrics['detail_level'][index]),
+                "ebios_compliance": self._calculate_ebios_compliance(*sections)
+            },
+            "suggestions": suggestions,
+            "next_steps": self._recommend_next_steps(completion_status, mission.get('current_step')),
+            "estimated_completion_time": self._estimate_completion_time(completion_status),
+            "element_counts": dict(zip(CATEGORIES, (int(count) for count in metrics['counts'][index])))
+        }
+
+    async def _semantic_coherence_analysis(self, sections: List[List[Dict]]) -> float:
+        """Cohérence sémantique d'une mission (similarité moyenne entre éléments)"""
+        mission = dict(zip(CATEGORIES, sections))
+        coherence = float((await self._batch_semantic_coherence([element_texts(mission)]))[0])
+        if np.isnan(coherence):
+            return self._basic_coherence_analysis(*sections)
+        return coherence
+
     async def _calculate_quality_metrics(
         self, 
         business_values: List[Dict], 
@@ -0,0 +1,105 @@
+"""
+🧰 OUTILS LANGCHAIN EBIOS RM
+Outils de l'agent LangChain de l'orchestrateur Workshop 1
+Module importé uniquement quand LangChain est installé
+"""
+
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from langchain.tools import BaseTool
+
+logger = logging.getLogger(__name__)
+
+
+class EbiosAnalysisTool(BaseTool):
+    """Outil d'analyse EBIOS RM pour LangChain"""
+    name = "ebios_analysis"
+    description = "Analyse les éléments EBIOS RM et fournit des suggestions d'amélioration"
+    
+    def __init__(self, workshop_service: Optional[Any] = None):
+        super().__init__()
+        self.workshop_service = workshop_service
+    
+    def _run(self, elements: str) -> str:
+        """Exécute l'analyse EBIOS RM"""
+        try:
+            # Parse les éléments
+            data = json.loads(elements)
+            
+            # Analyse basique si service non disponible
+            if not self.workshop_service:
+                return self._basic_analysis(data)
+            
+            # Utilise le service existant si disponible
+            return self._advanced_analysis(data)
+            
+        except Exception as e:
+            logger.error(f"Erreur analyse EBIOS: {e}")
+            return f"Erreur d'analyse: {str(e)}"
+    
+    def _basic_analysis(self, data: Dict[str, Any]) -> str:
+        """Analyse basique sans services externes"""
+        business_values = data.get('business_values', [])
+        essential_assets = data.get('essential_assets', [])
+        
+        analysis = {
+            "completion": len(business_values) > 0 and len(essential_assets) > 0,
+            "suggestions": [
+                "Ajoutez plus de détails aux descriptions",
+                "Vérifiez les liens entre valeurs métier et biens essentiels",
+                "Complétez les critères de sécurité"
+            ]
+        }
+        
+        return json.dumps(analysis, ensure_ascii=False)
+    
+    def _advanced_analysis(self, data: Dict[str, Any]) -> str:
+        """Analyse avancée avec services existants"""
+        # Ici on utiliserait le Workshop1AIService existant
+        return json.dumps({"status": "advanced_analysis_ready"}, ensure_ascii=False)
+
+class EbiosSuggestionTool(BaseTool):
+    """Outil de suggestions EBIOS RM pour LangChain"""
+    name = "ebios_suggestions"
+    description = "Génère des suggestions contextuelles pour améliorer l'analyse EBIOS RM"
+    
+    def _run(self, context: str) -> str:
+        """Génère des suggestions contextuelles"""
+        try:
+            context_data = json.loads(context)
+            current_step = context_data.get('current_step', 'unknown')
+            
+            suggestions_map = {
+                'business-values': [
+                    "Identifiez vos processus métier critiques",
+                    "Pensez aux exigences réglementaires",
+                    "Considérez votre réputation et image de marque"
+                ],
+                'essential-assets': [
+                    "Cartographiez vos informations sensibles",
+                    "Identifiez vos processus clés",
+                    "Documentez votre savoir-faire critique"
+                ],
+                'supporting-assets': [
+                    "Inventoriez vos systèmes techniques",
+                    "Identifiez vos ressources humaines clés",
+                    "Cartographiez votre infrastructure"
+                ]
+            }
+            
+            suggestions = suggestions_map.get(current_step, ["Continuez votre analyse EBIOS RM"])
+            
+            return json.dumps({
+                "suggestions": suggestions,
+                "step": current_step,
+                "confidence": 0.85
+            }, ensure_ascii=False)
+            
+        except Exception as e:
+            logger.error(f"Erreur génération suggestions: {e}")
+            return json.dumps({"error": str(e)}, ensure_ascii=False)
+
+
+__all__ = ['EbiosAnalysisTool', 'EbiosSuggestionTool']
@@ -5,28 +5,22 @@ ATTENTION: Service additif qui ne casse pas l'existant
 """
 
 import asyncio
+import copy
+import functools
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple, Union
 import json
 
-# Imports conditionnels pour éviter les erreurs si librairies manquantes
-try:
-    from langchain.schema import BaseMessage, HumanMessage, AIMessage, SystemMessage
-    from langchain.callbacks.base import BaseCallbackHandler
-    from langchain.agents import AgentExecutor, create_openai_functions_agent
-    from langchain.tools import BaseTool
-    from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
+from services.optional_dependencies import module_available
+
+# Dépendances optionnelles sondées sans import (importées au premier usage)
+LANGCHAIN_AVAILABLE = module_available('langchain')
+if not LANGCHAIN_AVAILABLE:
     logging.warning("🔧 LangChain non disponible, mode simulation activé")
 
-try:
-    import instructor
-    INSTRUCTOR_AVAILABLE = True
-except ImportError:
-    INSTRUCTOR_AVAILABLE = False
+INSTRUCTOR_AVAILABLE = module_available('instructor')
+if not INSTRUCTOR_AVAILABLE:
     logging.warning("🔧 Instructor non disponible, mode simulation activé")
 
 try:
@@ -48,41 +42,32 @@ except ImportError:
     def Field(**kwargs):
         return None
 
-try:
-    import redis
-    REDIS_AVAILABLE = True
-except ImportError:
-    REDIS_AVAILABLE = False
+REDIS_AVAILABLE = module_available('redis')
+if not REDIS_AVAILABLE:
     logging.warning("🔧 Redis non disponible, mode mémoire locale activé")
 
-# Import des services existants (sans les casser)
-try:
-    from .workshop1_ai_service import Workshop1AIService
-    from .suggestion_engine import SuggestionEngine
-    EXISTING_SERVICES_AVAILABLE = True
-except ImportError:
-    EXISTING_SERVICES_AVAILABLE = False
-    logging.warning("🔧 Services existants non trouvés, mode autonome activé")
+from services.observability import stage_timer
+from services.tracing import annotate, span, traced
 
-# Import des nouveaux services IA avancés
-try:
-    from .semantic_analyzer import SemanticAnalyzerFactory
-    from .ml_suggestion_engine import MLSuggestionEngineFactory
-    ADVANCED_AI_SERVICES_AVAILABLE = True
-except ImportError:
-    ADVANCED_AI_SERVICES_AVAILABLE = False
-    logging.warning("🔧 Services IA avancés non trouvés, mode basique activé")
+logger = logging.getLogger(__name__)
 
-# Import des services RAG et traitement de documents
-try:
-    from .ebios_rag_service import EbiosRAGServiceFactory
-    from .document_processor import DocumentProcessorFactory
-    RAG_SERVICES_AVAILABLE = True
-except ImportError:
-    RAG_SERVICES_AVAILABLE = False
-    logging.warning("🔧 Services RAG non trouvés, mode sans RAG activé")
+# Enrichissements exécutés en parallèle, dans leur ordre de fusion
+ENRICHMENT_STAGES = ('semantic', 'ml', 'rag')
 
-logger = logging.getLogger(__name__)
+# Requête RAG de la guidance de chaque étape de l'atelier 1
+STEP_GUIDANCE_QUERIES = {
+    'business-values': "Comment identifier et définir les valeurs métier en EBIOS RM ?",
+    'essential-assets': "Comment identifier les biens essentiels en EBIOS RM ?",
+    'supporting-assets': "Comment identifier les biens supports en EBIOS RM ?",
+    'dreaded-events': "Comment définir les événements redoutés en EBIOS RM ?"
+}
+
+def _element_counts(workshop_data: Dict[str, Any]) -> Dict[str, int]:
+    """Tailles d'entrée d'une mission (attributs de trace)"""
+    return {
+        f"{key}_count": len(workshop_data.get(key) or [])
+        for key in ("business_values", "essential_assets", "supporting_assets", "dreaded_events")
+    }
 
 # === MODÈLES PYDANTIC POUR INSTRUCTOR ===
 
@@ -119,96 +104,6 @@ class OrchestrationPlan(BaseModel):
     fallback_strategy: str
     created_at: datetime = Field(default_factory=datetime.now)
 
-# === OUTILS LANGCHAIN POUR EBIOS RM ===
-
-class EbiosAnalysisTool(BaseTool):
-    """Outil d'analyse EBIOS RM pour LangChain"""
-    name = "ebios_analysis"
-    description = "Analyse les éléments EBIOS RM et fournit des suggestions d'amélioration"
-    
-    def __init__(self, workshop_service: Optional[Any] = None):
-        super().__init__()
-        self.workshop_service = workshop_service
-    
-    def _run(self, elements: str) -> str:
-        """Exécute l'analyse EBIOS RM"""
-        try:
-            # Parse les éléments
-            data = json.loads(elements)
-            
-            # Analyse basique si service non disponible
-            if not self.workshop_service:
-                return self._basic_analysis(data)
-            
-            # Utilise le service existant si disponible
-            return self._advanced_analysis(data)
-            
-        except Exception as e:
-            logger.error(f"Erreur analyse EBIOS: {e}")
-            return f"Erreur d'analyse: {str(e)}"
-    
-    def _basic_analysis(self, data: Dict[str, Any]) -> str:
-        """Analyse basique sans services externes"""
-        business_values = data.get('business_values', [])
-        essential_assets = data.get('essential_assets', [])
-        
-        analysis = {
-            "completion": len(business_values) > 0 and len(essential_assets) > 0,
-            "suggestions": [
-                "Ajoutez plus de détails aux descriptions",
-                "Vérifiez les liens entre valeurs métier et biens essentiels",
-                "Complétez les critères de sécurité"
-            ]
-        }
-        
-        return json.dumps(analysis, ensure_ascii=False)
-    
-    def _advanced_analysis(self, data: Dict[str, Any]) -> str:
-        """Analyse avancée avec services existants"""
-        # Ici on utiliserait le Workshop1AIService existant
-        return json.dumps({"status": "advanced_analysis_ready"}, ensure_ascii=False)
-
-class EbiosSuggestionTool(BaseTool):
-    """Outil de suggestions EBIOS RM pour LangChain"""
-    name = "ebios_suggestions"
-    description = "Génère des suggestions contextuelles pour améliorer l'analyse EBIOS RM"
-    
-    def _run(self, context: str) -> str:
-        """Génère des suggestions contextuelles"""
-        try:
-            context_data = json.loads(context)
-            current_step = context_data.get('current_step', 'unknown')
-            
-            suggestions_map = {
-                'business-values': [
-                    "Identifiez vos processus métier critiques",
-                    "Pensez aux exigences réglementaires",
-                    "Considérez votre réputation et image de marque"
-                ],
-                'essential-assets': [
-                    "Cartographiez vos informations sensibles",
-                    "Identifiez vos processus clés",
-                    "Documentez votre savoir-faire critique"
-                ],
-                'supporting-assets': [
-                    "Inventoriez vos systèmes techniques",
-                    "Identifiez vos ressources humaines clés",
-                    "Cartographiez votre infrastructure"
-                ]
-            }
-            
-            suggestions = suggestions_map.get(current_step, ["Continuez votre analyse EBIOS RM"])
-            
-            return json.dumps({
-                "suggestions": suggestions,
-                "step": current_step,
-                "confidence": 0.85
-            }, ensure_ascii=False)
-            
-        except Exception as e:
-            logger.error(f"Erreur génération suggestions: {e}")
-            return json.dumps({"error": str(e)}, ensure_ascii=False)
-
 # === ORCHESTRATEUR PRINCIPAL ===
 
 class Workshop1Orchestrator:
@@ -235,7 +130,12 @@ class Workshop1Orchestrator:
         logger.info(f"🎼 Initialisation Orchestrateur Workshop 1: {self.session_id}")
         
         # 1. Initialiser les services existants si disponibles
-        if EXISTING_SERVICES_AVAILABLE:
+        try:
+            from .workshop1_ai_service import Workshop1AIService
+            from .suggestion_engine import SuggestionEngine
+        except ImportError:
+            logger.warning("🔧 Services existants non trouvés, mode autonome activé")
+        else:
             try:
                 self.existing_services['workshop1'] = Workshop1AIService()
                 self.existing_services['suggestions'] = SuggestionEngine()
@@ -244,7 +144,12 @@ class Workshop1Orchestrator:
                 logger.warning(f"⚠️ Services existants non disponibles: {e}")
 
         # 1.5. Initialiser les nouveaux services IA avancés
-        if ADVANCED_AI_SERVICES_AVAILABLE:
+        try:
+            from .semantic_analyzer import SemanticAnalyzerFactory
+            from .ml_suggestion_engine import MLSuggestionEngineFactory
+        except ImportError:
+            logger.warning("🔧 Services IA avancés non trouvés, mode basique activé")
+        else:
             try:
                 self.advanced_ai_services['semantic_analyzer'] = SemanticAnalyzerFactory.create()
                 self.advanced_ai_services['ml_suggestion_engine'] = MLSuggestionEngineFactory.create()
@@ -253,14 +158,19 @@ class Workshop1Orchestrator:
                 logger.warning(f"⚠️ Services IA avancés non disponibles: {e}")
 
         # 1.6. Initialiser les services RAG et traitement de documents (MODE SIMPLIFIÉ)
-        if RAG_SERVICES_AVAILABLE:
+        try:
+            from .ebios_rag_service import EbiosRAGServiceFactory
+            from .document_processor import DocumentProcessorFactory
+        except ImportError:
+            logger.warning("🔧 Services RAG non trouvés, mode sans RAG activé")
+        else:
             try:
                 self.rag_services['rag_service'] = EbiosRAGServiceFactory.create()
                 self.rag_services['document_processor'] = DocumentProcessorFactory.create()
 
                 # Construire l'index simple (pas de LlamaIndex)
                 if self.rag_services['rag_service']:
-                    asyncio.create_task(self.rag_services['rag_service'].build_vector_index())
+                    self._build_rag_index(self.rag_services['rag_service'])
 
                 logger.info("✅ Services RAG chargés (mode simplifié)")
             except Exception as e:
@@ -269,6 +179,8 @@ class Workshop1Orchestrator:
         # 2. Initialiser Redis si disponible
         if REDIS_AVAILABLE:
             try:
+                import redis
+
                 self.redis_client = redis.Redis(
                     host='localhost', 
                     port=6379, 
@@ -298,10 +210,23 @@ class Workshop1Orchestrator:
             except Exception as e:
                 logger.warning(f"⚠️ Instructor non disponible: {e}")
     
+    @staticmethod
+    def _build_rag_index(rag_service):
+        """Construit l'index RAG (tâche de la boucle courante, ou synchrone depuis un thread de chargement)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(rag_service.build_vector_index())
+        else:
+            asyncio.create_task(rag_service.build_vector_index())
+
     def _setup_langchain_agent(self):
         """Configure l'agent LangChain pour EBIOS RM"""
         if not LANGCHAIN_AVAILABLE:
             return
+
+        from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+        from services.workshop1_langchain_tools import EbiosAnalysisTool, EbiosSuggestionTool
         
         # Outils EBIOS RM
         tools = [
@@ -344,66 +269,140 @@ class Workshop1Orchestrator:
     ) -> WorkshopAnalysisResult:
         """
         Orchestration complète de l'analyse Workshop 1
+        (résultat final de stream_workshop_analysis)
+        """
+        result = None
+        async for stage, payload in self.stream_workshop_analysis(mission_id, workshop_data, user_context):
+            if stage == 'result':
+                result = payload
+        return result
+
+    async def stream_workshop_analysis(
+        self,
+        mission_id: str,
+        workshop_data: Dict[str, Any],
+        user_context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Orchestration progressive: (étape, résultat) dès que chaque étape est terminée
+        - 'basic': complétude, métriques de qualité et suggestions de base
+        - 'semantic', 'ml', 'rag': enrichissements exécutés en parallèle, émis par ordre d'achèvement
+        - 'result': WorkshopAnalysisResult final (enrichissements fusionnés dans l'ordre ENRICHMENT_STAGES)
+        En cas d'erreur: 'error' puis le résultat de repli
         """
-        logger.info(f"🎼 Orchestration analyse Workshop 1: {mission_id}")
+        # Un seul span pour toute l'orchestration, y compris en flux (/workshop1/orchestrate/stream)
+        with span("workshop1.orchestrate", mission_id=mission_id):
+            logger.info(f"🎼 Orchestration analyse Workshop 1: {mission_id}")
+            annotate(**_element_counts(workshop_data))
         
-        try:
-            # 1. Récupérer le contexte utilisateur
-            context = await self._get_user_context(mission_id, user_context)
+            try:
+                # 1. Récupérer le contexte utilisateur
+                with stage_timer('context'):
+                    context = await self._get_user_context(mission_id, user_context)
             
-            # 2. Analyser avec les services existants si disponibles
-            if self.existing_services.get('workshop1'):
-                existing_analysis = await self._analyze_with_existing_services(
-                    mission_id, workshop_data
-                )
-            else:
-                existing_analysis = self._basic_analysis(workshop_data)
-
-            # 2.5. Enrichir avec l'analyse sémantique avancée
-            if self.advanced_ai_services.get('semantic_analyzer'):
-                semantic_analysis = await self._analyze_with_semantic_ai(
-                    workshop_data, existing_analysis
-                )
-                existing_analysis.update(semantic_analysis)
-
-            # 2.6. Enrichir avec les suggestions ML
-            if self.advanced_ai_services.get('ml_suggestion_engine'):
-                ml_analysis = await self._analyze_with_ml_engine(
-                    workshop_data, context, existing_analysis
-                )
-                existing_analysis.update(ml_analysis)
-
-            # 2.7. Enrichir avec RAG EBIOS RM
-            if self.rag_services.get('rag_service'):
-                rag_analysis = await self._analyze_with_rag_service(
-                    workshop_data, context, existing_analysis
-                )
-                existing_analysis.update(rag_analysis)
-
-            # 3. Enrichir avec LangChain si disponible
-            if LANGCHAIN_AVAILABLE and self.langchain_agent:
-                enhanced_analysis = await self._enhance_with_langchain(
-                    existing_analysis, workshop_data, context
-                )
-            else:
-                enhanced_analysis = existing_analysis
+                # 2. Analyser avec les services existants si disponibles
+                with stage_timer('existing_analysis'):
+                    if self.existing_services.get('workshop1'):
+                        existing_analysis = await self._analyze_with_existing_services(
+                            mission_id, workshop_data
+                        )
+                    else:
+                        existing_analysis = self._basic_analysis(workshop_data)
+
+                yield 'basic', copy.deepcopy(existing_analysis)
+
+                # 2.5. Enrichir avec l'analyse sémantique, les suggestions ML et RAG EBIOS RM
+                enrichments = {}
+                async for stage, enhancement, contribution in self._run_enrichments(workshop_data, context):
+                    enrichments[stage] = (enhancement, contribution)
+                    yield stage, {**enhancement, **contribution}
+
+                for stage in ENRICHMENT_STAGES:
+                    if stage in enrichments:
+                        self._merge_enrichment(existing_analysis, *enrichments[stage])
+
+                # 3. Enrichir avec LangChain si disponible
+                if LANGCHAIN_AVAILABLE and self.langchain_agent:
+                    with stage_timer('langchain'):
+                        enhanced_analysis = await self._enhance_with_langchain(
+                            existing_analysis, workshop_data, context
+                        )
+                else:
+                    enhanced_analysis = existing_analysis
             
-            # 4. Structurer avec Instructor si disponible
-            if INSTRUCTOR_AVAILABLE:
-                structured_result = self._structure_with_instructor(enhanced_analysis)
-            else:
-                structured_result = self._create_basic_result(enhanced_analysis, mission_id)
+                # 4. Structurer avec Instructor si disponible
+                with stage_timer('structuring'):
+                    if INSTRUCTOR_AVAILABLE:
+                        structured_result = self._structure_with_instructor(enhanced_analysis)
+                    else:
+                        structured_result = self._create_basic_result(enhanced_analysis, mission_id)
             
-            # 5. Sauvegarder le contexte
-            await self._save_context(mission_id, structured_result, context)
+                # 5. Sauvegarder le contexte
+                with stage_timer('save'):
+                    await self._save_context(mission_id, structured_result, context)
             
-            logger.info(f"✅ Orchestration terminée: {mission_id}")
-            return structured_result
+                logger.info(f"✅ Orchestration terminée: {mission_id}")
             
-        except Exception as e:
-            logger.error(f"❌ Erreur orchestration: {e}")
-            # Fallback sécurisé
-            return self._create_fallback_result(mission_id, workshop_data)
+            except Exception as e:
+                logger.error(f"❌ Erreur orchestration: {e}")
+                yield 'error', {"detail": str(e)}
+                # Fallback sécurisé
+                structured_result = self._create_fallback_result(mission_id, workshop_data)
+
+            yield 'result', structured_result
+
+    async def _run_enrichments(
+        self,
+        workshop_data: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Lance les enrichissements disponibles en parallèle et les restitue par ordre d'achèvement
+        Chaque étape écrit ses suggestions et métriques dans sa propre contribution
+        (fusion déterministe ensuite, indépendante de l'ordre d'achèvement)
+        """
+        analyzers = {
+            'semantic': (self.advanced_ai_services.get('semantic_analyzer'),
+                         functools.partial(self._analyze_with_semantic_ai, workshop_data)),
+            'ml': (self.advanced_ai_services.get('ml_suggestion_engine'),
+                   functools.partial(self._analyze_with_ml_engine, workshop_data, context)),
+            'rag': (self.rag_services.get('rag_service'),
+                    functools.partial(self._analyze_with_rag_service, workshop_data, context))
+        }
+
+        async def run(stage, analyze):
+            contribution = {"suggestions": [], "quality_metrics": {}}
+            with stage_timer(stage):
+                enhancement = await analyze(contribution)
+            return stage, enhancement, contribution
+
+        tasks = [
+            asyncio.create_task(run(stage, analyze))
+            for stage, (service, analyze) in analyzers.items() if service
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client déconnecté en cours de flux: ne pas laisser tourner les étapes restantes
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _merge_enrichment(
+        analysis: Dict[str, Any],
+        enhancement: Dict[str, Any],
+        contribution: Dict[str, Any]
+    ):
+        """Intègre un enrichissement et sa contribution (suggestions, métriques, évaluations) à l'analyse"""
+        analysis.update(enhancement)
+        analysis.setdefault("suggestions", []).extend(contribution["suggestions"])
+        if contribution["quality_metrics"] and "quality_metrics" in analysis:
+            analysis["quality_metrics"].update(contribution["quality_metrics"])
+        analysis.update({
+            key: value for key, value in contribution.items()
+            if key not in ("suggestions", "quality_metrics")
+        })
     
     async def _get_user_context(
         self, 
@@ -417,6 +416,7 @@ class Workshop1Orchestrator:
         if self.redis_client:
             try:
                 stored_context = self.redis_client.get(f"context:{mission_id}")
+                annotate(**{"cache.context_redis": "hit" if stored_context else "miss"})
                 if stored_context:
                     context.update(json.loads(stored_context))
                     logger.info(f"📚 Contexte récupéré depuis Redis: {mission_id}")
@@ -424,6 +424,7 @@ class Workshop1Orchestrator:
                 logger.warning(f"⚠️ Erreur lecture Redis: {e}")
         
         # Fallback mémoire locale
+        annotate(**{"cache.context_local": "hit" if mission_id in self.memory_store else "miss"})
         if mission_id in self.memory_store:
             context.update(self.memory_store[mission_id])
             logger.info(f"📚 Contexte récupéré depuis mémoire locale: {mission_id}")
@@ -581,6 +582,7 @@ class Workshop1Orchestrator:
             next_steps=["Vérifier la configuration", "Réessayer l'analyse"]
         )
     
+    @traced("workshop1.save_context")
     async def _save_context(
         self, 
         mission_id: str, 
@@ -739,6 +741,7 @@ class Workshop1Orchestrator:
 
             # Construire des requêtes contextuelles pour RAG
             queries = self._build_rag_queries(workshop_data, context)
+            annotate(rag_query_count=len(queries))
 
             rag_responses = []
             total_confidence = 0.0
@@ -851,20 +854,41 @@ class Workshop1Orchestrator:
         """Vérifie si l'orchestrateur est prêt"""
         return True
     
+    async def get_step_guidance(self, workshop_step: str) -> Dict[str, Any]:
+        """
+        Guidance d'une étape de l'atelier 1 tirée de la base de connaissances EBIOS RM
+        Fonction de l'étape et de la génération de la base (ETag); lève ValueError si l'étape est inconnue
+        """
+        query = STEP_GUIDANCE_QUERIES.get(workshop_step)
+        if query is None:
+            raise ValueError(f"Étape inconnue: {workshop_step}")
+
+        rag_service = self.rag_services.get('rag_service')
+        if not rag_service:
+            return {"query": query, "advice": None, "confidence": 0.0, "sources": []}
+
+        result = await rag_service.query_ebios_knowledge(query, {"current_step": workshop_step})
+        return {
+            "query": query,
+            "advice": result.response,
+            "confidence": result.confidence,
+            "sources": result.sources
+        }
+
     def get_capabilities(self) -> Dict[str, bool]:
         """Retourne les capacités disponibles"""
         capabilities = {
             "langchain_available": LANGCHAIN_AVAILABLE,
             "instructor_available": INSTRUCTOR_AVAILABLE,
             "redis_available": REDIS_AVAILABLE and self.redis_client is not None,
-            "existing_services": EXISTING_SERVICES_AVAILABLE,
+            "existing_services": bool(self.existing_services),
             "memory_persistent": self.redis_client is not None,
-            "advanced_ai_services": ADVANCED_AI_SERVICES_AVAILABLE,
-            "rag_services": RAG_SERVICES_AVAILABLE
+            "advanced_ai_services": bool(self.advanced_ai_services),
+            "rag_services": bool(self.rag_services)
         }
 
         # Ajouter les capacités des services IA avancés
-        if ADVANCED_AI_SERVICES_AVAILABLE:
+        if self.advanced_ai_services:
             if self.advanced_ai_services.get('semantic_analyzer'):
                 semantic_caps = self.advanced_ai_services['semantic_analyzer'].get_capabilities()
                 capabilities.update({f"semantic_{k}": v for k, v in semantic_caps.items()})
@@ -874,7 +898,7 @@ class Workshop1Orchestrator:
                 capabilities.update({f"ml_{k}": v for k, v in ml_caps.items()})
 
         # Ajouter les capacités des services RAG
-        if RAG_SERVICES_AVAILABLE:
+        if self.rag_services:
             if self.rag_services.get('rag_service'):
                 rag_caps = self.rag_services['rag_service'].get_capabilities()
                 capabilities.update({f"rag_{k}": v for k, v in rag_caps.items()})
@@ -885,6 +909,18 @@ class Workshop1Orchestrator:
 
         return capabilities
 
+    def get_analysis_version(self) -> Dict[str, Any]:
+        """Versions dont dépend le résultat d'orchestration (ETag): capacités, modèles, base RAG"""
+        workshop_service = self.existing_services.get('workshop1')
+        semantic_analyzer = self.advanced_ai_services.get('semantic_analyzer')
+        rag_service = self.rag_services.get('rag_service')
+        return {
+            "capabilities": self.get_capabilities(),
+            "workshop1_models": workshop_service.get_model_version() if workshop_service else None,
+            "semantic_model": getattr(semantic_analyzer, 'model_name', None),
+            "knowledge_generation": getattr(rag_service, 'knowledge_generation', None)
+        }
+
 # === FACTORY POUR CRÉATION SÉCURISÉE ===
 
 class Workshop1OrchestratorFactory:
@@ -10,6 +10,8 @@ import logging
 import json
 from datetime import datetime
 
+from services.compression import install_flask_compression
+
 # Import des modèles harmonisés
 try:
     from models.harmonized_models import (
@@ -29,6 +31,9 @@ app = Flask(__name__)
 # Configuration CORS pour le développement local
 CORS(app, origins=["http://localhost:5173", "http://localhost:3000", "http://localhost:5174"])
 
+# Compression gzip/brotli des réponses JSON volumineuses
+install_flask_compression(app)
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST CONTRÔLE D'ADMISSION
+Concurrence par classe, budget d'attente, file pleine et plafonds par mission/utilisateur
+"""
+
+import asyncio
+import sys
+
+from script_tests import run_script_tests
+from services.admission_control import AdmissionController, AdmissionPolicy, AdmissionRejected
+
+
+def _controller(**overrides):
+    policy = dict(concurrency=1, queue_limit=1, queue_timeout=0.05, per_mission=None, per_user=None)
+    policy.update(overrides)
+    return AdmissionController({'heavy': AdmissionPolicy(**policy)})
+
+
+async def _rejection(controller, **kwargs) -> AdmissionRejected:
+    try:
+        ticket = await controller.acquire('heavy', **kwargs)
+    except AdmissionRejected as e:
+        return e
+    ticket.release()
+    raise AssertionError("requête admise")
+
+
+def test_queue_timeout_rejects_with_retry_after():
+    """Au-delà du budget d'attente: 503 et Retry-After"""
+    async def scenario():
+        controller = _controller()
+        ticket = await controller.acquire('heavy')
+        rejection = await _rejection(controller)
+        ticket.release()
+        return rejection, controller.status()['heavy']
+
+    rejection, status = asyncio.run(scenario())
+    assert (rejection.status_code, rejection.reason) == (503, 'queue_timeout')
+    assert rejection.retry_after >= 1
+    assert status['in_flight'] == 0 and status['waiting'] == 0
+
+
+def test_queue_full_rejects_immediately():
+    """File pleine: rejet sans attendre le budget"""
+    async def scenario():
+        controller = _controller(queue_timeout=5)
+        running = await controller.acquire('heavy')
+        waiter = asyncio.create_task(controller.acquire('heavy'))
+        await asyncio.sleep(0)
+        rejection = await asyncio.wait_for(_rejection(controller), 1)
+        running.release()
+        (await waiter).release()
+        return rejection
+
+    rejection = asyncio.run(scenario())
+    assert (rejection.status_code, rejection.reason) == (503, 'queue_full')
+
+
+def test_waiter_admitted_when_slot_frees():
+    """Une requête en file est admise dès qu'une place se libère"""
+    async def scenario():
+        controller = _controller(queue_timeout=1)
+        running = await controller.acquire('heavy')
+        waiter = asyncio.create_task(controller.acquire('heavy'))
+        await asyncio.sleep(0.01)
+        running.release()
+        (await asyncio.wait_for(waiter, 1)).release()
+        return controller.status()['heavy']
+
+    status = asyncio.run(scenario())
+    assert status['in_flight'] == 0 and status['waiting'] == 0
+
+
+def test_per_mission_and_per_user_caps():
+    """Plafonds par mission et par utilisateur: 429, libérés avec la place"""
+    async def scenario():
+        controller = _controller(concurrency=4, per_mission=1, per_user=2)
+        first = await controller.acquire('heavy', mission_id='m1', user_id='alice')
+        same_mission = await _rejection(controller, mission_id='m1', user_id='bob')
+        second = await controller.acquire('heavy', mission_id='m2', user_id='alice')
+        same_user = await _rejection(controller, mission_id='m3', user_id='alice')
+        first.release()
+        again = await controller.acquire('heavy', mission_id='m1', user_id='bob')
+        second.release()
+        again.release()
+        return same_mission, same_user
+
+    same_mission, same_user = asyncio.run(scenario())
+    assert (same_mission.status_code, same_mission.reason) == (429, 'per_mission')
+    assert (same_user.status_code, same_user.reason) == (429, 'per_user')
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS CONTRÔLE D'ADMISSION", globals()))
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST REQUÊTES DES TABLES AI
+Insertions en lot et pages par clé de UnifiedDBService, exécutées sur SQLite
+et compilées pour PostgreSQL (tables équivalentes aux modèles AI)
+"""
+
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import JSON, Column, DateTime, Float, MetaData, String, Table, Text, Uuid, create_engine
+from sqlalchemy.dialects import postgresql
+
+from script_tests import run_script_tests
+from services import ai_queries
+
+metadata = MetaData()
+ai_suggestions = Table(
+    'ai_suggestions', metadata,
+    Column('id', Uuid, primary_key=True),
+    Column('mission_id', Uuid, nullable=False),
+    Column('workshop_id', Uuid),
+    Column('user_id', Uuid, nullable=False),
+    Column('suggestion_type', String(100), nullable=False),
+    Column('content', Text, nullable=False),
+    Column('confidence_score', Float),
+    Column('context_data', JSON),
+    Column('created_at', DateTime, default=datetime.utcnow)
+)
+agent_memory = Table(
+    'agent_memory', metadata,
+    Column('id', Uuid, primary_key=True),
+    Column('mission_id', Uuid, nullable=False),
+    Column('user_id', Uuid, nullable=False),
+    Column('agent_type', String(100), nullable=False),
+    Column('memory_type', String(100), nullable=False),
+    Column('content', JSON, nullable=False),
+    Column('relevance_score', Float),
+    Column('tags', JSON),
+    Column('meta_data', JSON),
+    Column('expires_at', DateTime),
+    Column('created_at', DateTime, default=datetime.utcnow)
+)
+
+MISSION_ID = uuid.uuid4()
+USER_ID = uuid.uuid4()
+SUGGESTION_COLUMNS = ['id', 'confidence_score', 'created_at', 'suggestion_type']
+MEMORY_COLUMNS = ['id', 'relevance_score', 'created_at', 'memory_type']
+
+
+def _engine():
+    engine = create_engine('sqlite://')
+    metadata.create_all(engine)
+    return engine
+
+
+def _insert(conn, table, rows, chunk_size=ai_queries.BULK_INSERT_CHUNK_SIZE):
+    statements = list(ai_queries.bulk_insert_statements(table, rows, chunk_size))
+    for statement in statements:
+        conn.execute(statement)
+    return statements
+
+
+def _suggestion(score, suggestion_type='asset'):
+    return ai_queries.ai_suggestion_row(
+        mission_id=MISSION_ID, user_id=USER_ID, suggestion_type=suggestion_type,
+        content=f'Suggestion {score}', confidence_score=score
+    )
+
+
+def _suggestions_page(conn, limit, cursor=None, suggestion_type=None):
+    model = ai_suggestions.c
+    stmt = ai_queries.ai_suggestions_stmt(
+        model, [model[name] for name in SUGGESTION_COLUMNS], MISSION_ID, suggestion_type, None
+    )
+    stmt = ai_queries.page_stmt(stmt, model.confidence_score, model.created_at, model.id, limit, cursor)
+    return ai_queries.keyset_page(conn.execute(stmt).all(), limit, 'confidence_score')
+
+
+def _all_pages(fetch_page):
+    seen, cursor = [], None
+    while True:
+        page = fetch_page(cursor)
+        seen.extend(page['items'])
+        cursor = page['next_cursor']
+        if not cursor:
+            return seen
+
+
+def test_bulk_insert_in_chunks():
+    """Un INSERT multi-VALUES par paquet, IDs générés côté client dans l'ordre des entrées"""
+    rows = [_suggestion(index / 10) for index in range(5)]
+    with _engine().begin() as conn:
+        statements = _insert(conn, ai_suggestions, rows, chunk_size=2)
+        stored = {row.id for row in conn.execute(ai_suggestions.select()).all()}
+
+    assert len(statements) == 3
+    assert stored == {row['id'] for row in rows}
+    assert len({row['id'] for row in rows}) == 5
+
+
+def test_bulk_insert_compiles_to_multi_values():
+    """PostgreSQL: une seule requête INSERT ... VALUES (...), (...) par paquet"""
+    rows = [
+        ai_queries.agent_memory_row(MISSION_ID, USER_ID, 'workshop1', 'analysis', {'index': index},
+                                    tags=['bulk'], expires_hours=1)
+        for index in range(3)
+    ]
+    statement, = ai_queries.bulk_insert_statements(agent_memory, rows)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith('INSERT INTO agent_memory')
+    assert sql.count('VALUES') == 1 and sql.count('), (') == 2
+    assert rows[0]['expires_at'] > datetime.utcnow()
+
+
+def test_suggestions_pages_in_key_order():
+    """Pages successives: ordre du score, NULL en dernier, aucune ligne sautée ni répétée"""
+    scores = [0.9, None, 0.5, 0.7, None, 0.5, 0.1]
+    with _engine().begin() as conn:
+        _insert(conn, ai_suggestions, [_suggestion(score) for score in scores])
+        _insert(conn, ai_suggestions, [_suggestion(0.8, 'threat')])
+        seen = _all_pages(lambda cursor: _suggestions_page(conn, 3, cursor, 'asset'))
+
+    assert [row.confidence_score for row in seen] == [0.9, 0.7, 0.5, 0.5, 0.1, None, None]
+    assert len({row.id for row in seen}) == len(scores)
+
+
+def test_suggestions_page_compiles_for_postgresql():
+    """PostgreSQL: tri et comparaison de ligne sur les expressions de l'index, LIMIT page + 1"""
+    with _engine().begin() as conn:
+        _insert(conn, ai_suggestions, [_suggestion(score) for score in (0.9, 0.5, None)])
+        cursor = _suggestions_page(conn, 1)['next_cursor']
+
+    model = ai_suggestions.c
+    stmt = ai_queries.page_stmt(
+        ai_queries.ai_suggestions_stmt(model, [model.id], MISSION_ID, 'asset', None),
+        model.confidence_score, model.created_at, model.id, 20, cursor
+    )
+    compiled = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={'render_postcompile': True})
+    sql = str(compiled)
+
+    assert 'ORDER BY coalesce(ai_suggestions.confidence_score, -1.0) DESC' in sql
+    assert '(coalesce(ai_suggestions.confidence_score, -1.0), ' in sql
+    assert 'ai_suggestions.id) < (' in sql
+    assert 'ai_suggestions.suggestion_type = %(suggestion_type_1)s' in sql
+    limit_param = sql.rsplit('LIMIT %(', 1)[1].split(')s', 1)[0]
+    assert compiled.params[limit_param] == 21
+
+
+def test_agent_memory_pages_skip_expired_entries():
+    """Mémoire d'agent: entrées expirées et autres types exclus, pages par relevance_score"""
+    rows = [
+        ai_queries.agent_memory_row(MISSION_ID, USER_ID, 'workshop1', 'analysis', {'index': index},
+                                    relevance_score=score)
+        for index, score in enumerate([0.2, None, 0.9, 0.4])
+    ]
+    rows[0]['expires_at'] = datetime.utcnow() - timedelta(hours=1)
+    rows.append(ai_queries.agent_memory_row(MISSION_ID, USER_ID, 'workshop1', 'context', {}))
+    model = agent_memory.c
+
+    def fetch_page(cursor):
+        stmt = ai_queries.agent_memory_stmt(
+            model, [model[name] for name in MEMORY_COLUMNS], MISSION_ID, 'workshop1', 'analysis'
+        )
+        stmt = ai_queries.page_stmt(stmt, model.relevance_score, model.created_at, model.id, 2, cursor)
+        return ai_queries.keyset_page(conn.execute(stmt).all(), 2, 'relevance_score')
+
+    with _engine().begin() as conn:
+        _insert(conn, agent_memory, rows)
+        seen = _all_pages(fetch_page)
+
+    assert [row.relevance_score for row in seen] == [0.9, 0.4, None]
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS REQUÊTES DES TABLES AI", globals()))
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST ANALYSE PAR LOTS
+Validation des métriques vectorisées, de la cohérence par segment et du découpage en lots
+"""
+
+import sys
+
+import numpy as np
+
+from script_tests import run_script_tests
+from services.batch_analysis import plan_encode_batches, segment_coherence, vectorized_metrics
+
+
+def test_segment_coherence_matches_pairwise():
+    """La cohérence par segment égale la similarité cosinus moyenne hors diagonale"""
+    rng = np.random.default_rng(3)
+    sizes = [4, 0, 1, 6]
+    embeddings = rng.normal(size=(sum(sizes), 16))
+
+    scores = segment_coherence(embeddings, sizes)
+
+    unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    block = unit[5:11]
+    similarity = block @ block.T
+    expected = similarity[~np.eye(6, dtype=bool)].mean()
+    assert abs(scores[3] - max(0.0, expected) * 100) < 1e-9
+    assert np.isnan(scores[1]) and np.isnan(scores[2])
+
+
+def test_vectorized_metrics():
+    """Complétude par section et longueur moyenne des descriptions"""
+    missions = [
+        {'business_values': [{'description': 'x' * 40}], 'essential_assets': [{'description': 'x' * 80}]},
+        {'business_values': [], 'dreaded_events': [{'description': ''}]}
+    ]
+    metrics = vectorized_metrics(missions)
+    assert list(metrics['completeness']) == [50.0, 25.0]
+    assert list(metrics['detail_level']) == [60.0, 0.0]
+
+
+def test_plan_encode_batches():
+    """Missions consécutives regroupées jusqu'à la limite de textes"""
+    assert plan_encode_batches([3, 3, 5, 20, 1], max_texts=8) == [[0, 1], [2], [3], [4]]
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS ANALYSE PAR LOTS", globals()))
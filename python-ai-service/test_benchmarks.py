@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST BENCHMARKS
+Validation du générateur de missions et de la comparaison des résultats
+"""
+
+import sys
+
+from benchmarks.mission_generator import MissionGenerator
+from benchmarks.runner import compare_results, percentile
+from script_tests import run_script_tests
+
+
+def test_generator_is_deterministic():
+    """Même graine, mêmes données; la taille demandée est respectée"""
+    first = MissionGenerator(seed=7).generate_for_size(100)
+    second = MissionGenerator(seed=7).generate_for_size(100)
+    assert first == second
+    assert len(MissionGenerator.flatten(first)) == 100
+
+    essential_ids = {asset['id'] for asset in first['essential_assets']}
+    assert all(event['essentialAssetId'] in essential_ids for event in first['dreaded_events'])
+    assert all(set(asset['essentialAssetIds']) <= essential_ids for asset in first['supporting_assets'])
+
+
+def test_percentile_interpolation():
+    """Percentiles par interpolation linéaire"""
+    values = [10.0, 20.0, 30.0, 40.0]
+    assert percentile(values, 50) == 25.0
+    assert percentile(values, 100) == 40.0
+    assert percentile([5.0], 95) == 5.0
+
+
+def test_compare_flags_regressions():
+    """Une hausse au-delà du seuil est signalée comme régression"""
+    def run(p50, p95):
+        return {'results': [{'target': 'generate_ml_suggestions', 'size': 100,
+                             'latency_ms': {'p50': p50, 'p95': p95}}]}
+
+    comparison = compare_results(run(10.0, 20.0), run(11.0, 30.0), threshold=0.2)
+    by_metric = {row['metric']: row for row in comparison}
+    assert not by_metric['p50']['regression']
+    assert by_metric['p95']['regression']
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS BENCHMARKS", globals()))
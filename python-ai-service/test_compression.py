@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST COMPRESSION DES RÉPONSES
+Négociation Accept-Encoding, seuil de taille, gzip/brotli et flux NDJSON vidés à chaque événement
+"""
+
+import asyncio
+import gzip
+import json
+import sys
+import zlib
+
+from script_tests import run_script_tests
+from services.compression import (
+    BROTLI_AVAILABLE, CompressionMiddleware, CompressionSettings, negotiate_encoding
+)
+
+PAYLOAD = json.dumps({'semantic_graph': [{'node': f"asset-{i}", 'score': 0.5} for i in range(200)]}).encode()
+
+
+def _run(app, accept_encoding='gzip', settings=None):
+    """Exécute le middleware autour d'une application ASGI et renvoie (en-têtes, morceaux de corps)"""
+    middleware = CompressionMiddleware(app, settings or CompressionSettings(minimum_size=1024))
+    scope = {'type': 'http', 'headers': [(b'accept-encoding', accept_encoding.encode())]}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    headers = {name.decode(): value.decode() for name, value in messages[0]['headers']}
+    return headers, [message['body'] for message in messages[1:]]
+
+
+def _json_app(body, status=200, extra_headers=()):
+    async def app(scope, receive, send):
+        headers = [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers + list(extra_headers)})
+        await send({'type': 'http.response.body', 'body': body})
+    return app
+
+
+def test_negotiation():
+    """q-values, '*' et q=0; à q égal la préférence serveur (br puis gzip) l'emporte"""
+    assert negotiate_encoding('gzip, deflate, br', ('br', 'gzip')) == 'br'
+    assert negotiate_encoding('br;q=0.5, gzip', ('br', 'gzip')) == 'gzip'
+    assert negotiate_encoding('*', ('br', 'gzip')) == 'br'
+    assert negotiate_encoding('gzip;q=0, *;q=0.1', ('gzip',)) is None
+    assert negotiate_encoding('identity', ('br', 'gzip')) is None
+    assert negotiate_encoding(None, ('gzip',)) is None
+
+
+def test_large_json_gzip():
+    """Corps au-delà du seuil: gzip, Content-Length recalculé, Vary et ETag faible"""
+    headers, bodies = _run(_json_app(PAYLOAD, extra_headers=[(b'etag', b'"abc"')]))
+    assert headers['content-encoding'] == 'gzip'
+    assert headers['vary'] == 'Accept-Encoding'
+    assert headers['etag'] == 'W/"abc"'
+    assert int(headers['content-length']) == len(bodies[0]) < len(PAYLOAD)
+    assert gzip.decompress(bodies[0]) == PAYLOAD
+
+
+def test_brotli_round_trip():
+    """brotli préféré quand le client l'accepte"""
+    if not BROTLI_AVAILABLE:
+        return
+    import brotli
+
+    headers, bodies = _run(_json_app(PAYLOAD), accept_encoding='gzip, br')
+    assert headers['content-encoding'] == 'br'
+    assert brotli.decompress(bodies[0]) == PAYLOAD
+
+
+def test_passthrough():
+    """Petit corps, 304 et client sans Accept-Encoding compatible: réponse inchangée"""
+    for app, accept_encoding in ((_json_app(b'{"ok":true}'), 'gzip'),
+                                 (_json_app(b'', status=304), 'gzip'),
+                                 (_json_app(PAYLOAD), 'identity')):
+        headers, bodies = _run(app, accept_encoding)
+        assert 'content-encoding' not in headers
+        assert 'content-length' in headers
+
+
+def test_stream_flushed_per_event():
+    """NDJSON: chaque morceau compressé est décodable dès sa réception"""
+    events = [json.dumps({'stage': stage}).encode() + b'\n' for stage in ('basic', 'ml', 'result')]
+
+    async def app(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'application/x-ndjson')]})
+        for index, event in enumerate(events):
+            await send({'type': 'http.response.body', 'body': event, 'more_body': index < len(events) - 1})
+
+    headers, bodies = _run(app)
+    assert headers['content-encoding'] == 'gzip'
+    assert 'content-length' not in headers
+
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for event, chunk in zip(events, bodies):
+        assert decoder.decompress(chunk) == event
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS COMPRESSION DES RÉPONSES", globals()))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST VARIANTES ASYNCHRONES DE LA BASE UNIFIÉE
+Sans engine asynchrone, la variante exécute la méthode synchrone hors de la boucle
+"""
+
+import asyncio
+import sys
+import threading
+
+from fastapi.testclient import TestClient
+
+from config.database import db_config, sync_fallback
+from script_tests import run_script_tests
+
+
+class _Service:
+    def lookup(self, key, limit=10):
+        return ('sync', key, limit, threading.get_ident())
+
+    @sync_fallback('lookup')
+    async def lookup_async(self, key, limit=10):
+        return ('async', key, limit, threading.get_ident())
+
+
+def test_fallback_runs_sync_method_in_thread():
+    """Engine asynchrone absent (défaut): méthode synchrone, dans un autre thread que la boucle"""
+    assert db_config.AsyncSessionLocal is None
+
+    async def scenario():
+        return await _Service().lookup_async('m1', limit=5), threading.get_ident()
+
+    (variant, key, limit, thread_id), loop_thread_id = asyncio.run(scenario())
+    assert (variant, key, limit) == ('sync', 'm1', 5)
+    assert thread_id != loop_thread_id
+
+
+def test_async_engine_used_when_initialized():
+    """Engine asynchrone initialisé: la variante asynchrone s'exécute"""
+    previous, db_config.AsyncSessionLocal = db_config.AsyncSessionLocal, object()
+    try:
+        assert asyncio.run(_Service().lookup_async('m1'))[:3] == ('async', 'm1', 10)
+    finally:
+        db_config.AsyncSessionLocal = previous
+
+
+def test_history_endpoint_without_database():
+    """Aucun engine configuré: 503 plutôt qu'une erreur interne"""
+    from main import app
+
+    with TestClient(app) as client:
+        response = client.get("/workshop1/suggestions/m1/history")
+    assert response.status_code == 503
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS VARIANTES ASYNCHRONES", globals()))
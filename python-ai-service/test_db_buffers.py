@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST TAMPONS D'ÉCRITURE BASE DE DONNÉES
+Validation des tampons en mémoire utilisés par UnifiedDBService
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from script_tests import run_script_tests
+from services.metrics_aggregator import MetricsAggregator, MetricBucket
+from services.query_cache_tier import LocalQueryCache, HitCounterBuffer
+
+
+def test_metrics_aggregation():
+    """Les valeurs sont agrégées par (metric_type, service_name, unit)"""
+    aggregator = MetricsAggregator()
+    for value in (10, 20, 30, 40):
+        aggregator.record('response_time', 'workshop1_ai', value, unit='ms')
+    aggregator.record('response_time', 'semantic_analyzer', 5, unit='ms')
+
+    rows = aggregator.drain()
+    assert len(rows) == 2
+
+    workshop_row = next(row for row in rows if row['service_name'] == 'workshop1_ai')
+    aggregation = workshop_row['context']['aggregation']
+    assert workshop_row['value'] == 25
+    assert (aggregation['count'], aggregation['sum'], aggregation['min'], aggregation['max']) == (4, 100, 10, 40)
+    assert sum(aggregation['histogram_log2'].values()) == 4
+
+    # Le tampon est vidé après drain()
+    assert aggregator.drain() == []
+
+
+def test_restore_after_failed_write():
+    """Lignes d'une écriture en échec: reprises au prochain drain(), bornées par max_unwritten_rows"""
+    aggregator = MetricsAggregator(max_unwritten_rows=2)
+    aggregator.record('response_time', 'workshop1_ai', 10, unit='ms')
+    failed = aggregator.drain()
+
+    aggregator.record('response_time', 'rag', 5, unit='ms')
+    aggregator.restore(failed)
+    assert aggregator.pending() == 2
+    assert [row['service_name'] for row in aggregator.drain()] == ['workshop1_ai', 'rag']
+
+    aggregator.restore([{'service_name': name} for name in ('a', 'b', 'c')])
+    assert [row['service_name'] for row in aggregator.drain()] == ['b', 'c']
+    assert aggregator.dropped_rows == 1
+
+
+def test_raw_sampling():
+    """Avec un taux de 1, chaque valeur est aussi conservée brute"""
+    aggregator = MetricsAggregator(raw_sample_rate=1.0, max_raw_samples=2)
+    for value in (1, 2, 3):
+        aggregator.record('usage', 'rag', value, context={'mission_id': 'm1'})
+
+    rows = aggregator.drain()
+    raw_rows = [row for row in rows if row['context'].get('sampled')]
+    assert [row['value'] for row in raw_rows] == [1, 2]
+    assert raw_rows[0]['context']['mission_id'] == 'm1'
+    assert aggregator.dropped_samples == 1
+
+
+def test_histogram_quantiles():
+    """Les quantiles approchés restent dans le bon seau"""
+    bucket = MetricBucket()
+    for value in range(1, 101):
+        bucket.add(value)
+
+    assert 32 <= bucket.quantile(0.5) <= 64
+    assert bucket.quantile(0.99) == 100
+
+
+def test_local_query_cache():
+    """Le cache local respecte expires_at et la borne LRU"""
+    cache = LocalQueryCache(max_entries=2, ttl_seconds=60)
+    cache.put('a', {'answer': 1})
+    cache.put('expired', {'answer': 2}, expires_at=datetime.utcnow() - timedelta(seconds=1))
+    assert cache.get('a') == {'answer': 1}
+    assert cache.get('expired') is None
+
+    cache.put('b', {'answer': 3})
+    cache.get('a')
+    cache.put('c', {'answer': 4})
+    assert cache.get('b') is None
+    assert len(cache) == 2
+
+    cache.invalidate('a')
+    assert cache.get('a') is None
+
+
+def test_hit_counter_buffer():
+    """Les hits sont regroupés par query_hash jusqu'au drain()"""
+    buffer = HitCounterBuffer()
+    for query_hash in ('a', 'b', 'a', 'a'):
+        buffer.record_hit(query_hash)
+    assert buffer.pending() == 2
+
+    hits = {query_hash: count for query_hash, count, _ in buffer.drain()}
+    assert hits == {'a': 3, 'b': 1}
+    assert buffer.drain() == []
+
+
+def test_hit_counter_restore():
+    """Compteurs d'une écriture en échec: additionnés aux hits reçus depuis le drain()"""
+    buffer = HitCounterBuffer()
+    buffer.record_hit('a')
+    buffer.record_hit('a')
+    failed = buffer.drain()
+
+    buffer.record_hit('a')
+    buffer.record_hit('b')
+    buffer.restore(failed)
+
+    drained = {query_hash: (count, last_accessed) for query_hash, count, last_accessed in buffer.drain()}
+    assert drained['a'][0] == 3 and drained['b'][0] == 1
+    assert drained['a'][1] >= failed[0][2]
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS TAMPONS D'ÉCRITURE", globals()))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST REQUÊTES CONDITIONNELLES
+Empreinte canonique, comparaison If-None-Match, génération de la base RAG et guidance (304)
+"""
+
+import asyncio
+import sys
+
+from script_tests import run_script_tests
+from services.etag import compute_etag, etag_matches
+
+
+def test_etag_is_canonical_and_versioned():
+    """Même contenu (ordre des clés indifférent) et mêmes versions: même ETag fort"""
+    first = compute_etag({'mission_id': 'm1', 'business_values': [{'id': 'a', 'name': 'x'}]}, 'v1')
+    same = compute_etag({'business_values': [{'name': 'x', 'id': 'a'}], 'mission_id': 'm1'}, 'v1')
+    assert first == same and first.startswith('"') and not first.startswith('W/')
+    assert compute_etag({'mission_id': 'm1'}, 'v1') != compute_etag({'mission_id': 'm1'}, 'v2')
+    assert compute_etag({'values': [1, 2]}) != compute_etag({'values': [2, 1]})
+
+
+def test_if_none_match_parsing():
+    """Liste d'ETags, joker et préfixe faible"""
+    etag = '"abc"'
+    assert etag_matches('"zzz", "abc"', etag)
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"abcd"', etag)
+    assert not etag_matches(None, etag)
+
+
+def _rag_service():
+    from services.ebios_rag_service import EbiosRAGService
+
+    service = EbiosRAGService.__new__(EbiosRAGService)
+    service.knowledge_base = []
+    service.knowledge_generation = ""
+    service.vector_index = None
+    service.query_engine = None
+    return service
+
+
+def _document(doc_id: str, title: str, content: str):
+    from services.ebios_rag_service import EbiosKnowledgeDocument
+
+    document = EbiosKnowledgeDocument()
+    document.id, document.title, document.content = doc_id, title, content
+    return document
+
+
+def test_knowledge_generation_changes_on_add():
+    """Ajouter un document change la génération de la base de connaissances"""
+    service = _rag_service()
+    asyncio.run(service.add_knowledge_document(_document('doc1', 'Guide', 'Contenu du guide')))
+    first = service.knowledge_generation
+
+    asyncio.run(service.add_knowledge_document(_document('doc2', 'Guide', 'Contenu du guide')))
+    assert first and service.knowledge_generation != first
+
+
+def test_guidance_etag_follows_knowledge_base():
+    """Guidance servie par la base de connaissances: 200, 304, puis nouvel ETag après ajout d'un document"""
+    from fastapi.testclient import TestClient
+    import main
+    from services.service_registry import READY
+    from services.workshop1_orchestrator import Workshop1Orchestrator
+
+    rag_service = _rag_service()
+    asyncio.run(rag_service.add_knowledge_document(_document(
+        'vm', 'Valeurs métier', 'Identifier et définir les valeurs métier de la mission EBIOS'
+    )))
+    orchestrator = Workshop1Orchestrator.__new__(Workshop1Orchestrator)
+    orchestrator.redis_client = None
+    orchestrator.existing_services, orchestrator.advanced_ai_services = {}, {}
+    orchestrator.rag_services = {'rag_service': rag_service}
+
+    component = main.service_registry._components['orchestrator']
+    previous = component.state, component.instance
+    component.state, component.instance = READY, orchestrator
+    try:
+        client = TestClient(main.app)
+        response = client.get('/workshop1/guidance/business-values')
+        assert response.status_code == 200, response.status_code
+        guidance = response.json()['guidance']
+        assert guidance['sources'][0]['title'] == 'Valeurs métier'
+        etag = response.headers['etag']
+
+        response = client.get('/workshop1/guidance/business-values', headers={'If-None-Match': etag})
+        assert response.status_code == 304 and response.content == b''
+
+        asyncio.run(rag_service.add_knowledge_document(_document('be', 'Biens essentiels', 'Biens')))
+        response = client.get('/workshop1/guidance/business-values', headers={'If-None-Match': etag})
+        assert response.status_code == 200 and response.headers['etag'] != etag
+
+        assert client.get('/workshop1/guidance/unknown-step').status_code == 404
+    finally:
+        component.state, component.instance = previous
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS REQUÊTES CONDITIONNELLES", globals()))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST SÉRIALISATION JSON RAPIDE
+Types numpy/datetime, encodages compacts des matrices et équivalence avec jsonable_encoder
+"""
+
+import json
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+
+from script_tests import run_script_tests
+from services.fast_json import (
+    MATRIX_FLOAT16, MATRIX_SPARSE, FastJSONResponse, decode_matrix, dumps, encode_matrix
+)
+
+
+@dataclass
+class _Entry:
+    id: str
+    created_at: datetime
+
+
+def test_native_types_match_jsonable_encoder():
+    """Même JSON que jsonable_encoder pour les types courants des résultats d'analyse"""
+    content = {
+        'timestamp': datetime(2024, 5, 1, 12, 30, 15, 250000),
+        'scores': [np.float32(0.5), np.float64(0.25), np.int64(3)],
+        'entries': [_Entry('m1', datetime(2024, 5, 1))],
+        'tags': ['é', 'ü']
+    }
+    expected = jsonable_encoder({**content, 'scores': [0.5, 0.25, 3]})
+    assert json.loads(dumps(content)) == expected
+
+
+def test_matrix_list_and_vectors():
+    """Matrices en listes par défaut, vecteurs toujours en listes"""
+    matrix = np.arange(6, dtype=np.float64).reshape(2, 3)
+    payload = json.loads(dumps({'m': matrix, 'v': np.array([1, 2])}, MATRIX_FLOAT16))
+    assert payload['v'] == [1, 2]
+    assert payload['m']['encoding'] == MATRIX_FLOAT16
+    assert json.loads(dumps({'m': matrix}))['m'] == matrix.tolist()
+
+
+def test_float16_round_trip():
+    """float16 base64: forme conservée, erreur de l'ordre de 1e-3 sur des similarités"""
+    similarity = np.random.default_rng(0).uniform(-1, 1, size=(20, 20))
+    decoded = decode_matrix(json.loads(dumps({'m': similarity}, MATRIX_FLOAT16))['m'])
+    assert decoded.shape == similarity.shape
+    assert np.abs(decoded - similarity).max() < 1e-3
+
+
+def test_sparse_threshold():
+    """Triplets creux: seules les cellules au-delà du seuil sont transmises"""
+    matrix = np.array([[1.0, 0.1, 0.0], [0.1, 1.0, 0.8], [0.0, 0.8, 1.0]])
+    encoded = encode_matrix(matrix, MATRIX_SPARSE, threshold=0.5)
+    assert len(encoded['values']) == 5
+    expected = np.where(np.abs(matrix) > 0.5, matrix, 0.0)
+    assert np.array_equal(decode_matrix(encoded), expected)
+
+
+def test_response_renders_selected_encoding():
+    """La réponse applique l'encodage demandé"""
+    response = FastJSONResponse({'m': np.eye(3)}, matrix_encoding=MATRIX_SPARSE)
+    assert response.media_type == 'application/json'
+    assert json.loads(response.body)['m']['rows'] == [0, 1, 2]
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS SÉRIALISATION JSON RAPIDE", globals()))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST TEMPS D'IMPORT
+Régression du démarrage à froid: `python -X importtime` dans un processus neuf
+- budget de temps d'import cumulé par module (IMPORT_TIME_BUDGET_MS)
+- aucune bibliothèque ML lourde importée par les chemins légers
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict
+
+from script_tests import run_script_tests
+
+SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_TIME_BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', '1500'))
+
+# Bibliothèques chargées uniquement au premier usage (modèles, orchestration LLM)
+HEAVY_MODULES = {
+    'torch', 'transformers', 'sentence_transformers', 'sklearn', 'xgboost',
+    'networkx', 'langchain', 'instructor', 'pandas', 'celery'
+}
+
+LIGHT_ENTRY_POINTS = [
+    'main',
+    'services.workshop1_orchestrator',
+    'services.semantic_analyzer',
+    'services.ml_suggestion_engine',
+    'services.ebios_rag_service',
+    'services.agent_memory_service'
+]
+
+
+def measure_imports(module: str) -> Dict[str, float]:
+    """Temps d'import cumulé (ms) de chaque module importé par `import module`"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SERVICE_DIR, capture_output=True, text=True, timeout=120
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+
+    cumulative_ms = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        cumulative_ms[name.strip()] = int(cumulative) / 1000
+    return cumulative_ms
+
+
+def test_light_paths_skip_heavy_libraries():
+    """Les modules de service n'importent aucune bibliothèque ML à l'import"""
+    for entry_point in LIGHT_ENTRY_POINTS:
+        imported = measure_imports(entry_point)
+        heavy = sorted({name.split('.')[0] for name in imported} & HEAVY_MODULES)
+        assert not heavy, f"{entry_point} importe {heavy}"
+
+
+def test_main_import_within_budget():
+    """L'import de main reste sous le budget de démarrage"""
+    elapsed_ms = measure_imports('main')['main']
+    assert elapsed_ms <= IMPORT_TIME_BUDGET_MS, (
+        f"import main: {elapsed_ms:.0f} ms > budget {IMPORT_TIME_BUDGET_MS:.0f} ms"
+    )
+
+
+def main():
+    """Exécute les tests de temps d'import et affiche les plus gros contributeurs"""
+    imported = measure_imports('main')
+    print(f"⏱️ import main: {imported['main']:.0f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)")
+    top_level = {name: ms for name, ms in imported.items() if '.' not in name and name != 'main'}
+    for name, ms in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f"   {ms:8.1f} ms  {name}")
+    print()
+    return run_script_tests("🧪 TESTS TEMPS D'IMPORT", globals())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST FILE DE TÂCHES
+Exécution, progression, annulation, limite de concurrence et reprise après redémarrage
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from script_tests import run_script_tests
+from services.job_queue import (
+    CANCELLED, QUEUED, RUNNING, SUCCEEDED, Job, JobQueue, MemoryJobStore, SQLiteJobStore
+)
+
+
+async def _wait_for_state(queue: JobQueue, job_id: str, states, timeout: float = 5.0) -> Job:
+    deadline = time.monotonic() + timeout
+    while True:
+        job = await queue.get(job_id)
+        if job.state in states or time.monotonic() > deadline:
+            return job
+        await asyncio.sleep(0.01)
+
+
+def test_job_succeeds_with_result():
+    """Résultat et progression conservés dans le stockage SQLite"""
+    async def handler(payload, job):
+        await job.report_async(0.5, "à mi-chemin")
+        return {'double': payload['value'] * 2}
+
+    async def scenario(path):
+        queue = JobQueue(store=SQLiteJobStore(path), concurrency=1, poll_interval=0.05)
+        queue.register('double', handler)
+        queue.start()
+        job = await queue.submit('double', {'value': 21})
+        done = await _wait_for_state(queue, job.id, (SUCCEEDED,))
+        await queue.stop()
+        return done
+
+    with tempfile.TemporaryDirectory() as directory:
+        done = asyncio.run(scenario(os.path.join(directory, 'jobs.db')))
+    assert done.state == SUCCEEDED, done
+    assert done.result == {'double': 42} and done.progress == 1.0
+
+
+def test_cancel_queued_and_running():
+    """Annulation immédiate en file, interruption de la coroutine en cours"""
+    started = asyncio.Event()
+
+    async def slow(payload, job):
+        started.set()
+        await asyncio.sleep(30)
+
+    async def scenario():
+        queue = JobQueue(store=MemoryJobStore(), concurrency=1, poll_interval=0.05)
+        queue.register('slow', slow)
+        queue.start()
+        running = await queue.submit('slow', {})
+        queued = await queue.submit('slow', {})
+        await asyncio.wait_for(started.wait(), 5)
+
+        cancelled_queued = await queue.cancel(queued.id)
+        await queue.cancel(running.id)
+        cancelled_running = await _wait_for_state(queue, running.id, (CANCELLED,))
+        await queue.stop()
+        return cancelled_queued, cancelled_running
+
+    cancelled_queued, cancelled_running = asyncio.run(scenario())
+    assert cancelled_queued.state == CANCELLED
+    assert cancelled_running.state == CANCELLED
+
+
+def test_concurrency_limit_and_sync_handlers_off_loop():
+    """Au plus `concurrency` tâches simultanées; gestionnaires synchrones hors du thread de la boucle"""
+    lock = threading.Lock()
+    active = {'now': 0, 'peak': 0}
+    threads = set()
+
+    def blocking(payload, job):
+        with lock:
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+            threads.add(threading.get_ident())
+        time.sleep(0.05)
+        with lock:
+            active['now'] -= 1
+        return payload['index']
+
+    async def scenario():
+        queue = JobQueue(store=MemoryJobStore(), concurrency=2, poll_interval=0.05)
+        queue.register('blocking', blocking)
+        queue.start()
+        jobs = [await queue.submit('blocking', {'index': index}) for index in range(6)]
+        done = [await _wait_for_state(queue, job.id, (SUCCEEDED,)) for job in jobs]
+        await queue.stop()
+        return done
+
+    done = asyncio.run(scenario())
+    assert [job.result for job in done] == list(range(6))
+    assert active['peak'] == 2, active
+    assert threading.main_thread().ident not in threads
+
+
+def test_sync_handler_counted_and_reports_progress():
+    """Gestionnaire synchrone en cours: compté par status(), progression écrite depuis son thread"""
+    started, release = threading.Event(), threading.Event()
+
+    def waiting(payload, job):
+        job.report(0.25, "en attente")
+        started.set()
+        release.wait(5)
+        return 'ok'
+
+    async def scenario():
+        queue = JobQueue(store=MemoryJobStore(), concurrency=1, poll_interval=0.05)
+        queue.register('waiting', waiting)
+        queue.start()
+        job = await queue.submit('waiting', {})
+        await asyncio.to_thread(started.wait, 5)
+        running, progress = queue.status()['running'], (await queue.get(job.id)).progress
+        release.set()
+        await _wait_for_state(queue, job.id, (SUCCEEDED,))
+        await queue.stop()
+        return running, progress, queue.status()['running']
+
+    running, progress, running_after = asyncio.run(scenario())
+    assert (running, progress, running_after) == (1, 0.25, 0)
+
+
+def test_lost_lease_does_not_overwrite_new_owner():
+    """Bail repris par un autre worker: ni progression, ni issue, ni renouvellement de l'ancien worker"""
+    async def overtaken(payload, job):
+        # Bail expiré puis tâche réservée par un autre worker pendant l'exécution
+        queue.store.update(job.job.id, worker_id='other-worker', lease_expires_at=time.time() + 60)
+        await job.report_async(0.5, "obsolète")
+        return 'stale'
+
+    async def scenario():
+        queue.register('overtaken', overtaken)
+        queue.start()
+        job = await queue.submit('overtaken', {})
+        deadline = time.monotonic() + 5
+        while (await queue.get(job.id)).worker_id != 'other-worker' or queue.status()['running']:
+            if time.monotonic() > deadline:
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return await queue.get(job.id)
+
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(store=SQLiteJobStore(os.path.join(directory, 'jobs.db')), concurrency=1,
+                         poll_interval=0.05)
+        job = asyncio.run(scenario())
+        queue.store.close()
+    assert job.state == RUNNING and job.worker_id == 'other-worker', job
+    assert job.result is None and job.progress == 0.0
+
+
+def test_sqlite_recovers_jobs_of_dead_worker():
+    """Une tâche 'running' dont le bail a expiré est remise en file par un nouveau processus"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'jobs.db')
+        crashed = SQLiteJobStore(path)
+        crashed.add(Job(id='job-1', kind='double', payload={'value': 1}))
+        claimed = crashed.claim('dead-worker', lease_seconds=0.01)
+        assert claimed.state == RUNNING and claimed.attempts == 1
+        crashed.close()
+
+        time.sleep(0.02)
+        restarted = SQLiteJobStore(path)
+        assert restarted.requeue_expired(time.time()) == 1
+        job = restarted.get('job-1')
+        restarted.close()
+
+    assert job.state == QUEUED and job.payload == {'value': 1}
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS FILE DE TÂCHES", globals()))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST CURSEURS DE PAGINATION
+Validation de l'encodage des curseurs keyset utilisés par UnifiedDBService
+et de la pagination lorsque le score ou la date de création sont NULL
+"""
+
+import sys
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Float, Index, MetaData, Table, Uuid, create_engine, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from script_tests import run_script_tests
+from services.keyset_cursor import encode_cursor, decode_cursor, keyset_before
+from utils.keyset import keyset_order_by
+
+metadata = MetaData()
+suggestions = Table(
+    'suggestions', metadata,
+    Column('id', Uuid, primary_key=True),
+    Column('confidence_score', Float),
+    Column('created_at', DateTime(timezone=True))
+)
+
+
+def test_cursor_round_trip():
+    """Le curseur restitue exactement la clé de tri"""
+    row_id = uuid.uuid4()
+    created_at = datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(0.875, created_at, row_id)
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (0.875, created_at, row_id)
+
+
+def test_invalid_cursor():
+    """Un curseur altéré lève ValueError"""
+    for cursor in ('not-a-cursor', encode_cursor(0.5, datetime(2025, 1, 1), uuid.uuid4())[:-4]):
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            continue
+        raise AssertionError(f"Curseur accepté: {cursor}")
+
+
+def test_cursor_with_null_key():
+    """Score et date absents sont conservés tels quels dans le curseur"""
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(None, None, row_id)) == (None, None, row_id)
+
+
+def _page(conn, limit, cursor=None):
+    stmt = select(suggestions).order_by(*keyset_order_by(
+        suggestions.c.confidence_score, suggestions.c.created_at, suggestions.c.id
+    ))
+    if cursor:
+        stmt = stmt.where(keyset_before(
+            suggestions.c.confidence_score, suggestions.c.created_at, suggestions.c.id, cursor
+        ))
+    rows = conn.execute(stmt.limit(limit + 1)).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.confidence_score, last.created_at, last.id)
+    return items, next_cursor
+
+
+def test_pagination_across_null_scores():
+    """Limite de page sur un score NULL: aucune ligne sautée ni répétée, les NULL en dernier"""
+    engine = create_engine('sqlite://')
+    metadata.create_all(engine)
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {'id': uuid.uuid4(), 'confidence_score': score, 'created_at': date}
+        for score, date in [
+            (0.9, created_at), (0.5, created_at), (None, created_at), (None, created_at),
+            (None, None), (0.5, None), (None, created_at)
+        ]
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(suggestions), rows)
+
+        # Pages de 3: la première se termine sur une date NULL, la deuxième sur un score NULL
+        seen, cursor = [], None
+        while True:
+            items, cursor = _page(conn, 3, cursor)
+            seen.extend(items)
+            if not cursor:
+                break
+
+    assert len(seen) == len(rows)
+    assert len({row.id for row in seen}) == len(rows)
+    scores = [row.confidence_score for row in seen]
+    assert scores == [0.9, 0.5, 0.5, None, None, None, None]
+    assert seen[-1].created_at is None
+
+
+def test_index_matches_sort_expressions():
+    """L'index PostgreSQL porte les mêmes expressions que le tri des requêtes"""
+    index = Index('ix_rank', *keyset_order_by(
+        suggestions.c.confidence_score, suggestions.c.created_at, suggestions.c.id
+    ))
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert "coalesce(confidence_score, -1.0) DESC" in ddl
+    assert "coalesce(created_at, '1970-01-01 00:00:00+00:00') DESC" in ddl
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS CURSEURS DE PAGINATION", globals()))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST MÉMOIRE LOCALE INDEXÉE
+Validation du niveau mémoire en processus (index, bornes, éviction LRU)
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from script_tests import run_script_tests
+from services.agent_memory_service import AgentMemoryEntry
+from services.local_memory_store import LocalMemoryStore
+
+
+def _entry(index: int, mission_id: str = "m1", agent_id: str = "a1", session_id: str = "s1",
+           memory_type: str = "context", priority: int = 1, expires_at=None) -> AgentMemoryEntry:
+    return AgentMemoryEntry(
+        id=f"{mission_id}-{agent_id}-{index}",
+        mission_id=mission_id,
+        agent_id=agent_id,
+        session_id=session_id,
+        memory_type=memory_type,
+        content={"index": index},
+        timestamp=datetime(2025, 1, 1) + timedelta(seconds=index),
+        expires_at=expires_at,
+        priority=priority
+    )
+
+
+def test_per_agent_bound():
+    """Les plus anciennes entrées d'un agent sont évincées au-delà de la borne"""
+    store = LocalMemoryStore(max_entries_per_agent=3)
+    for i in range(5):
+        store.add(_entry(i))
+
+    results = store.query("m1", agent_id="a1")
+    assert [entry.content["index"] for entry in results] == [4, 3, 2]
+    assert len(store) == 3
+    assert store.query("m1", session_id="s1", limit=10) == results
+
+
+def test_secondary_indexes():
+    """Filtrage par session et par type via les index secondaires"""
+    store = LocalMemoryStore()
+    store.add(_entry(0, session_id="s1", memory_type="context"))
+    store.add(_entry(1, session_id="s2", memory_type="analysis"))
+    store.add(_entry(2, agent_id="a2", session_id="s2", memory_type="analysis", priority=3))
+
+    by_session = store.query("m1", session_id="s2")
+    assert [entry.content["index"] for entry in by_session] == [2, 1]
+
+    by_type = store.query("m1", agent_id="a1", memory_type="analysis")
+    assert [entry.content["index"] for entry in by_type] == [1]
+
+    assert store.query("unknown") == []
+
+
+def test_global_lru_eviction():
+    """Le budget global évince la mission la moins récemment utilisée"""
+    store = LocalMemoryStore(max_total_entries=4)
+    store.add(_entry(0, mission_id="old"))
+    store.add(_entry(1, mission_id="old"))
+    store.add(_entry(2, mission_id="recent"))
+    store.add(_entry(3, mission_id="recent"))
+
+    # Lecture de "old": elle devient la plus récemment utilisée
+    store.query("old")
+    store.add(_entry(4, mission_id="new"))
+
+    assert len(store) == 4
+    assert [entry.content["index"] for entry in store.query("recent")] == [3]
+    assert len(store.query("old")) == 2
+
+
+def test_remove_expired():
+    """Les entrées expirées sont retirées des files et des index"""
+    now = datetime(2025, 6, 1)
+    store = LocalMemoryStore()
+    store.add(_entry(0, expires_at=now - timedelta(hours=1)))
+    store.add(_entry(1, expires_at=now + timedelta(hours=1)))
+    store.add(_entry(2, mission_id="m2", expires_at=now - timedelta(minutes=1)))
+
+    assert store.remove_expired(now) == 2
+    assert len(store) == 1
+    assert [entry.content["index"] for entry in store.query("m1", session_id="s1")] == [1]
+    assert store.get_stats()["missions"] == 1
+
+
+def test_expiry_skips_evicted_entries():
+    """Une entrée déjà évincée n'est pas comptée lors du balayage"""
+    now = datetime(2025, 6, 1)
+    store = LocalMemoryStore(max_entries_per_agent=1)
+    store.add(_entry(0, expires_at=now - timedelta(hours=1)))
+    store.add(_entry(1))
+
+    assert store.remove_expired(now) == 0
+    assert len(store) == 1
+
+
+def test_duplicate_id_replaces_entry():
+    """Un identifiant déjà présent remplace l'entrée partout (file, index, compteur, expiration)"""
+    now = datetime(2025, 6, 1)
+    store = LocalMemoryStore(max_entries_per_agent=2)
+    store.add(_entry(0, expires_at=now - timedelta(hours=1)))
+    replacement = _entry(0, session_id="s2", memory_type="analysis")
+    store.add(replacement)
+
+    assert len(store) == 1
+    assert store.query("m1", agent_id="a1") == [replacement]
+    assert store.query("m1", session_id="s1") == []
+    assert store.query("m1", memory_type="analysis") == [replacement]
+    assert store.remove_expired(now) == 0
+
+    # La file de l'agent ne contient qu'une occurrence: la borne évince les bonnes entrées
+    store.add(_entry(1))
+    store.add(_entry(2))
+    assert len(store) == 2
+    assert [entry.content["index"] for entry in store.query("m1", agent_id="a1")] == [2, 1]
+    assert store.evictions == 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS MÉMOIRE LOCALE INDEXÉE", globals()))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST OBSERVABILITÉ
+Validation des métriques Prometheus du service IA (dont le pool de connexions)
+"""
+
+import sys
+
+from sqlalchemy import create_engine, text
+
+from config.pool_monitor import PoolMonitor
+from script_tests import run_script_tests
+from services.observability import (
+    POOL_METRICS, PROMETHEUS_AVAILABLE, process_rss_bytes, record_cache_lookup, render_metrics, stage_timer
+)
+
+
+def test_process_rss():
+    """La mémoire résidente est mesurée, pas simulée"""
+    assert process_rss_bytes() > 1024 * 1024
+
+
+def test_stage_and_cache_metrics():
+    """Les étapes et consultations de cache apparaissent dans l'exposition"""
+    if not PROMETHEUS_AVAILABLE:
+        assert render_metrics() is None
+        return
+
+    with stage_timer('semantic'):
+        pass
+    record_cache_lookup('ai_query_cache', 'miss')
+
+    exposition = render_metrics().decode()
+    assert 'ebios_ai_orchestration_stage_duration_seconds_count{stage="semantic"}' in exposition
+    assert 'ebios_ai_cache_requests_total{cache="ai_query_cache",result="miss"}' in exposition
+
+
+def test_pool_metrics():
+    """Attente, emprunt, débordements, timeouts et requêtes lentes du pool exposés"""
+    if not PROMETHEUS_AVAILABLE:
+        return
+    from prometheus_client import REGISTRY
+
+    def sample(name):
+        return REGISTRY.get_sample_value(name) or 0.0
+
+    names = (
+        'ebios_ai_db_pool_wait_seconds_count', 'ebios_ai_db_pool_checkout_duration_seconds_count',
+        'ebios_ai_db_pool_overflow_checkouts_total', 'ebios_ai_db_pool_timeouts_total',
+        'ebios_ai_db_slow_queries_total'
+    )
+    before = {name: sample(name) for name in names}
+
+    monitor = PoolMonitor(slow_query_ms=0)
+    monitor.add_observer(POOL_METRICS)
+    monitor.add_observer(POOL_METRICS)
+    monitor.record_wait(0.002, overflow=True)
+    monitor.record_timeout(30.0)
+    engine = create_engine('sqlite://')
+    monitor.attach(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    delta = {name: sample(name) - before[name] for name in names}
+    assert delta == {
+        'ebios_ai_db_pool_wait_seconds_count': 2, 'ebios_ai_db_pool_checkout_duration_seconds_count': 1,
+        'ebios_ai_db_pool_overflow_checkouts_total': 1, 'ebios_ai_db_pool_timeouts_total': 1,
+        'ebios_ai_db_slow_queries_total': 1
+    }, delta
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS OBSERVABILITÉ", globals()))
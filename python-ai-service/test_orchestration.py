@@ -160,10 +160,10 @@ def test_integration_with_main():
     print("-" * 45)
     
     try:
-        from main import app, ADVANCED_SERVICES_AVAILABLE
+        from main import app, service_registry
         
         print(f"✅ Service principal importé")
-        print(f"✅ Services avancés disponibles: {ADVANCED_SERVICES_AVAILABLE}")
+        print(f"✅ Services chargés au démarrage: {service_registry.names()}")
         
         # Test des endpoints
         print("✅ Endpoints disponibles:")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST ORCHESTRATION PROGRESSIVE
+Ordre d'émission des étapes, fusion déterministe des enrichissements et format NDJSON/SSE
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+import services.tracing as tracing
+from script_tests import run_script_tests
+from services.workshop1_orchestrator import Workshop1Orchestrator
+
+WORKSHOP_DATA = {
+    'business_values': [{'id': 'bv1', 'name': 'Facturation', 'description': 'Émission des factures'}],
+    'essential_assets': [],
+    'supporting_assets': [],
+    'dreaded_events': []
+}
+
+
+def _orchestrator_with_stages(delays):
+    """Orchestrateur sans services lourds: chaque enrichissement attend `delays[étape]` secondes"""
+    orchestrator = Workshop1Orchestrator.__new__(Workshop1Orchestrator)
+    orchestrator.session_id = 'test'
+    orchestrator.memory_store = {}
+    orchestrator.existing_services = {}
+    orchestrator.advanced_ai_services = {'semantic_analyzer': True, 'ml_suggestion_engine': True}
+    orchestrator.rag_services = {'rag_service': True}
+    orchestrator.langchain_agent = None
+    orchestrator.redis_client = None
+
+    def stage(name, *metric):
+        async def analyze(*args):
+            existing_analysis = args[-1]
+            await asyncio.sleep(delays[name])
+            existing_analysis['suggestions'].append(f"suggestion {name}")
+            if metric:
+                existing_analysis['quality_metrics'][metric[0]] = 50.0
+            return {f"{name}_analysis": {'done': True}}
+        return analyze
+
+    orchestrator._analyze_with_semantic_ai = stage('semantic', 'semantic_coherence')
+    orchestrator._analyze_with_ml_engine = stage('ml', 'ml_confidence')
+    orchestrator._analyze_with_rag_service = stage('rag')
+    return orchestrator
+
+
+async def _collect(orchestrator):
+    return [event async for event in orchestrator.stream_workshop_analysis('mission-1', WORKSHOP_DATA)]
+
+
+def test_stages_emitted_as_completed():
+    """basic d'abord, enrichissements par ordre d'achèvement, result en dernier"""
+    orchestrator = _orchestrator_with_stages({'semantic': 0.15, 'ml': 0.0, 'rag': 0.05})
+    events = asyncio.run(_collect(orchestrator))
+
+    assert [stage for stage, _ in events] == ['basic', 'ml', 'rag', 'semantic', 'result']
+    assert events[1][1]['suggestions'] == ['suggestion ml']
+    assert events[1][1]['quality_metrics'] == {'ml_confidence': 50.0}
+
+
+def test_merge_independent_of_completion_order():
+    """Le résultat final fusionne les enrichissements dans l'ordre semantic, ml, rag"""
+    fast_semantic = _orchestrator_with_stages({'semantic': 0.0, 'ml': 0.1, 'rag': 0.05})
+    slow_semantic = _orchestrator_with_stages({'semantic': 0.1, 'ml': 0.0, 'rag': 0.05})
+
+    first = asyncio.run(fast_semantic.orchestrate_workshop_analysis('mission-1', WORKSHOP_DATA))
+    second = asyncio.run(slow_semantic.orchestrate_workshop_analysis('mission-1', WORKSHOP_DATA))
+
+    assert first.suggestions == second.suggestions
+    assert first.suggestions[-3:] == ['suggestion semantic', 'suggestion ml', 'suggestion rag']
+
+
+def test_stream_traced_under_one_root_span():
+    """Flux complet dans un span racine workshop1.orchestrate, étapes parallèles comprises"""
+    handle, path = tempfile.mkstemp(suffix='.jsonl')
+    os.close(handle)
+    previous = tracing.tracer
+    tracing.tracer = tracing.Tracer(sample_rate=1.0, file_path=path)
+    try:
+        orchestrator = _orchestrator_with_stages({'semantic': 0.0, 'ml': 0.0, 'rag': 0.0})
+        asyncio.run(_collect(orchestrator))
+        tracing.tracer.exporter.shutdown()
+    finally:
+        tracing.tracer = previous
+
+    with open(path) as trace_file:
+        lines = trace_file.read().splitlines()
+    os.remove(path)
+
+    assert len(lines) == 1
+    spans = json.loads(lines[0])['resourceSpans'][0]['scopeSpans'][0]['spans']
+    by_name = {item['name']: item for item in spans}
+    root = by_name['workshop1.orchestrate']
+    assert 'parentSpanId' not in root
+    assert {'key': 'mission_id', 'value': {'stringValue': 'mission-1'}} in root['attributes']
+    for stage in ('context', 'semantic', 'ml', 'rag', 'save'):
+        assert by_name[f'orchestrator.{stage}']['parentSpanId'] == root['spanId'], stage
+
+
+def test_stream_event_formats():
+    """NDJSON: un objet par ligne; SSE: champ event = étape"""
+    from main import _format_stream_event
+
+    event = {'stage': 'basic', 'mission_id': 'mission-1', 'elapsed_ms': 1.0, 'data': {'score': 1}}
+    line = _format_stream_event(event, sse=False)
+    assert line.endswith(b'\n') and json.loads(line) == event
+
+    message = _format_stream_event(event, sse=True)
+    assert message.startswith(b'event: basic\ndata: ') and message.endswith(b'\n\n')
+    assert json.loads(message.split(b'data: ', 1)[1]) == event
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS ORCHESTRATION PROGRESSIVE", globals()))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST INSTRUMENTATION DU POOL
+Validation des empreintes de requêtes, de la mesure des requêtes et de la recommandation de taille de pool
+"""
+
+import os
+import sys
+from unittest import mock
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from config.database import default_pool_size, pool_budget
+from config.pool_monitor import PoolMonitor, normalize_statement, statement_fingerprint
+from script_tests import run_script_tests
+
+
+def test_statement_fingerprint():
+    """Les valeurs et la taille des listes n'influencent pas l'empreinte"""
+    first = "SELECT * FROM ai_suggestions WHERE mission_id = 'a' AND id IN (%(p1)s, %(p2)s)"
+    second = "SELECT * FROM ai_suggestions WHERE mission_id = 'b' AND id IN (%(p1)s, %(p2)s, %(p3)s)"
+    assert statement_fingerprint(first) == statement_fingerprint(second)
+
+    insert = "INSERT INTO ai_metrics (a, b) VALUES (%(a_m0)s, %(b_m0)s), (%(a_m1)s, %(b_m1)s)"
+    assert normalize_statement(insert) == "INSERT INTO ai_metrics (a, b) VALUES (...)"
+
+
+def test_failed_statements_leave_no_state():
+    """Requêtes en erreur: rien ne s'accumule sur la connexion, les suivantes sont mesurées"""
+    monitor = PoolMonitor(slow_query_ms=10 ** 6)
+    engine = create_engine('sqlite://')
+    monitor.attach(engine)
+
+    with engine.connect() as conn:
+        for _ in range(3):
+            try:
+                conn.execute(text("SELECT * FROM missing_table"))
+            except OperationalError:
+                conn.rollback()
+        conn.execute(text("SELECT 1"))
+        assert not any(key.startswith('query_start') for key in conn.info)
+
+    assert monitor.query_ms.count == 1
+
+
+def test_default_pool_size():
+    """Un worker: 5 connexions comme auparavant; plusieurs workers: part du budget de l'instance"""
+    with mock.patch.dict(os.environ, {'DB_MAX_CONNECTIONS': '10', 'WEB_CONCURRENCY': '1'}):
+        assert (default_pool_size(), pool_budget()) == (5, 10)
+    with mock.patch.dict(os.environ, {'DB_MAX_CONNECTIONS': '10', 'WEB_CONCURRENCY': '4'}):
+        assert (default_pool_size(), pool_budget()) == (2, 2)
+
+
+def test_recommend_growth_on_contention():
+    """Une attente au-dessus de la cible fait grandir le pool jusqu'à la concurrence observée"""
+    monitor = PoolMonitor(wait_target_ms=5)
+    monitor._window_peak = 8
+    for _ in range(50):
+        monitor.record_wait(0.020)
+
+    recommendation = monitor.evaluate(current_size=5, min_size=2, max_size=10)
+    assert recommendation['reason'] == 'contention'
+    assert recommendation['recommended_size'] == 8
+
+
+def test_recommend_shrink_when_underused():
+    """Un pool largement inutilisé est réduit à peak + 1"""
+    monitor = PoolMonitor()
+    monitor._window_peak = 1
+    for _ in range(50):
+        monitor.record_wait(0.0001)
+
+    recommendation = monitor.evaluate(current_size=10, min_size=2, max_size=10)
+    assert recommendation['reason'] == 'underused'
+    assert recommendation['recommended_size'] == 2
+
+    # La fenêtre est réinitialisée: sans trafic, aucune recommandation
+    assert monitor.evaluate(current_size=2, min_size=2, max_size=10)['reason'] == 'stable'
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS INSTRUMENTATION DU POOL", globals()))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST PROFILAGE À LA DEMANDE
+Validation des captures CPU, wall-clock et de l'exclusivité
+"""
+
+import asyncio
+import marshal
+import sys
+
+from script_tests import run_script_tests
+from services.profiling import ProfilingService, ProfilerBusyError
+
+
+def _busy_work():
+    # Plus long que l'intervalle de bascule du GIL (5 ms): l'échantillonneur peut préempter
+    return sum(i * i for i in range(300000))
+
+
+async def _workload(duration: float):
+    loop = asyncio.get_running_loop()
+    end = loop.time() + duration
+    while loop.time() < end:
+        _busy_work()
+        await asyncio.sleep(0)
+
+
+def test_cpu_profile_is_pstats():
+    """Le profil CPU est un fichier pstats couvrant la boucle"""
+    async def scenario():
+        service = ProfilingService()
+        content, _ = await asyncio.gather(service.capture_cpu_profile(0.2), _workload(0.2))
+        return content
+
+    stats = marshal.loads(asyncio.run(scenario()))
+    assert any(function_name == '_busy_work' for (_, _, function_name) in stats)
+
+
+def test_wall_profile_collapsed_stacks():
+    """Les piles repliées se terminent par un nombre d'échantillons"""
+    async def scenario():
+        service = ProfilingService()
+        collapsed, _ = await asyncio.gather(service.capture_wall_profile(0.3, interval_ms=2), _workload(0.3))
+        return collapsed
+
+    lines = asyncio.run(scenario()).strip().splitlines()
+    assert lines
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert any('_busy_work' in line for line in lines)
+
+
+def test_single_capture_at_a_time():
+    """Une seconde capture simultanée est refusée"""
+    async def scenario():
+        service = ProfilingService()
+        first = asyncio.create_task(service.capture_allocations(0.2))
+        await asyncio.sleep(0.05)
+        try:
+            await service.capture_cpu_profile(0.1)
+        except ProfilerBusyError:
+            return await first
+        raise AssertionError("Capture concurrente acceptée")
+
+    assert asyncio.run(scenario()).startswith(b'# tracemalloc')
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS PROFILAGE À LA DEMANDE", globals()))
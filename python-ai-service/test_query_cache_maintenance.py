@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST MAINTENANCE DU CACHE DES REQUÊTES
+Purge des entrées expirées, éviction sous budget de lignes et d'octets,
+passe sautée lorsqu'un autre processus détient le verrou
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from config.database import db_config
+from script_tests import run_script_tests
+from services.query_cache_maintenance import QueryCacheMaintenance
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+@contextmanager
+def _cache_table(entries):
+    """Base SQLite temporaire branchée sur db_config, table ai_query_cache remplie"""
+    previous = db_config.engine, db_config.SessionLocal
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'cache.db')}")
+        with engine.begin() as conn:
+            conn.execute(text("""
+                CREATE TABLE ai_query_cache (
+                    id VARCHAR PRIMARY KEY, query_text TEXT, response_data TEXT,
+                    hit_count INTEGER, expires_at TIMESTAMP, last_accessed TIMESTAMP
+                )
+            """))
+            conn.execute(text("""
+                INSERT INTO ai_query_cache VALUES (:id, :query_text, :response_data, :hit_count,
+                                                   :expires_at, :last_accessed)
+            """), [
+                {
+                    'query_text': 'q', 'response_data': 'r', 'expires_at': NOW + timedelta(hours=1),
+                    'last_accessed': NOW, **entry
+                }
+                for entry in entries
+            ])
+        db_config.engine, db_config.SessionLocal = engine, sessionmaker(bind=engine)
+        try:
+            yield engine
+        finally:
+            db_config.engine, db_config.SessionLocal = previous
+            engine.dispose()
+
+
+def _remaining_ids(engine):
+    with engine.connect() as conn:
+        return {row.id for row in conn.execute(text("SELECT id FROM ai_query_cache"))}
+
+
+def test_row_budget_evicts_least_used_then_oldest():
+    """Budget de lignes: les entrées les moins consultées, puis les plus anciennes, partent en premier"""
+    entries = [
+        {'id': f'e{i}', 'hit_count': hits, 'last_accessed': NOW - timedelta(minutes=age)}
+        for i, (hits, age) in enumerate([(1, 5), (1, 50), (9, 90), (2, 10), (5, 1), (1, 20), (7, 30)])
+    ]
+    with _cache_table(entries) as engine:
+        report = QueryCacheMaintenance(max_rows=4, max_bytes=10 ** 9, batch_size=2).run()
+        assert 'error' not in report, report
+        assert report['rows_before_eviction'] == 7 and report['evicted_rows'] == 3
+        # hit_count 1 (les trois), du plus ancien au plus récent
+        assert _remaining_ids(engine) == {'e2', 'e3', 'e4', 'e6'}
+
+
+def test_byte_budget_evicts_until_under_budget():
+    """Budget d'octets: éviction par lots jusqu'à repasser sous le budget, lignes sous leur budget"""
+    entries = [
+        {'id': f'e{i}', 'response_data': 'x' * 99, 'hit_count': i, 'last_accessed': NOW}
+        for i in range(10)
+    ]
+    with _cache_table(entries) as engine:
+        # 100 octets par entrée (réponse + requête), 1000 au total
+        report = QueryCacheMaintenance(max_rows=100, max_bytes=650, batch_size=2).run()
+        assert report['bytes_before_eviction'] == 1000
+        assert report['evicted_rows'] == 4 and report['evicted_bytes'] == 400
+        assert _remaining_ids(engine) == {f'e{i}' for i in range(4, 10)}
+
+
+def test_expired_entries_are_purged_first():
+    """Entrées expirées supprimées avant le calcul des budgets"""
+    entries = [
+        {'id': 'expired', 'hit_count': 50, 'expires_at': NOW - timedelta(hours=1)},
+        {'id': 'live', 'hit_count': 1}
+    ]
+    with _cache_table(entries) as engine:
+        report = QueryCacheMaintenance(max_rows=10).run()
+        assert report['expired_deleted'] == 1 and report['evicted_rows'] == 0
+        assert _remaining_ids(engine) == {'live'}
+
+
+def test_pass_skipped_when_lock_is_held():
+    """Verrou détenu par un autre processus: aucune suppression, bilan 'skipped'"""
+    @contextmanager
+    def lock_held_elsewhere():
+        yield False
+
+    with _cache_table([{'id': f'e{i}', 'hit_count': i} for i in range(5)]) as engine:
+        maintenance = QueryCacheMaintenance(max_rows=1)
+        maintenance._exclusive_pass = lock_held_elsewhere
+        report = maintenance.run()
+        assert report['skipped'] == 'locked' and report['evicted_rows'] == 0
+        assert len(_remaining_ids(engine)) == 5
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS MAINTENANCE DU CACHE DES REQUÊTES", globals()))
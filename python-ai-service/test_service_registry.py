@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST REGISTRE DES SERVICES
+Validation du chargement ordonné en arrière-plan et de l'état par composant
+"""
+
+import asyncio
+import sys
+import time
+
+from script_tests import run_script_tests
+from services.service_registry import ServiceRegistry, ServiceNotReadyError, READY, FAILED
+
+
+def test_loads_in_priority_order():
+    """Les composants sont chargés par priorité croissante, rappels compris"""
+    order = []
+    started = []
+
+    def loader(name):
+        def load():
+            order.append(name)
+            return name.upper()
+        return load
+
+    async def scenario():
+        registry = ServiceRegistry()
+        registry.register('heavy', loader('heavy'), priority=30)
+        registry.register('light', loader('light'), priority=10, on_ready=started.append)
+        registry.start()
+        await registry.wait_ready(timeout=5)
+        return registry
+
+    registry = asyncio.run(scenario())
+    assert order == ['light', 'heavy']
+    assert started == ['LIGHT']
+    assert registry.all_ready and registry.get('heavy') == 'HEAVY'
+
+
+def test_not_ready_then_failed():
+    """Composant en chargement: Retry-After estimé; en échec: pas de Retry-After"""
+    async def scenario():
+        registry = ServiceRegistry()
+        registry.register('slow', lambda: time.sleep(0.2), priority=10, expected_seconds=3)
+        registry.register('broken', lambda: 1 / 0, priority=20, expected_seconds=4)
+        registry.start()
+        await asyncio.sleep(0.05)
+
+        try:
+            registry.get('broken')
+            raise AssertionError("Composant non chargé retourné")
+        except ServiceNotReadyError as e:
+            assert e.retry_after >= 6
+
+        await registry.wait_ready(timeout=5)
+        try:
+            registry.get('broken')
+            raise AssertionError("Composant en échec retourné")
+        except ServiceNotReadyError as e:
+            assert e.retry_after is None
+        return registry.status()
+
+    status = asyncio.run(scenario())
+    assert status['slow']['state'] == READY
+    assert status['broken']['state'] == FAILED
+    assert 'ZeroDivisionError' in status['broken']['error']
+
+
+def test_preload_before_start():
+    """Préchargement sans boucle; start() ne recharge pas mais exécute les rappels"""
+    loads = []
+    started = []
+    registry = ServiceRegistry()
+    registry.register('model', lambda: loads.append('model') or 'MODEL', priority=20, on_ready=started.append)
+    registry.register('connection', lambda: loads.append('connection') or 'CONN', priority=10, preload=False)
+
+    assert registry.preload() == ['model']
+    assert registry.is_ready('model') and not registry.is_ready('connection')
+
+    async def scenario():
+        registry.start()
+        await registry.wait_ready(timeout=5)
+
+    asyncio.run(scenario())
+    assert loads == ['model', 'connection']
+    assert started == ['MODEL']
+    assert registry.all_ready
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS REGISTRE DES SERVICES", globals()))
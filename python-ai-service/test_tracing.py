@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST TRAÇAGE
+Validation des spans imbriqués, de l'échantillonnage et de l'export JSON OTLP
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+from script_tests import run_script_tests
+from services.tracing import Tracer, annotate
+
+
+def _export_file():
+    handle, path = tempfile.mkstemp(suffix='.jsonl')
+    os.close(handle)
+    return path
+
+
+def test_nested_spans_export():
+    """Une trace échantillonnée est exportée avec ses relations parent/enfant"""
+    path = _export_file()
+    tracer = Tracer(sample_rate=1.0, file_path=path)
+
+    with tracer.span('workshop1.orchestrate', mission_id='m1'):
+        with tracer.span('orchestrator.semantic'):
+            annotate(element_count=12)
+    tracer.exporter.shutdown()
+
+    with open(path) as trace_file:
+        lines = trace_file.read().splitlines()
+    os.remove(path)
+
+    assert len(lines) == 1
+    spans = json.loads(lines[0])['resourceSpans'][0]['scopeSpans'][0]['spans']
+    root, child = sorted(spans, key=lambda item: 'parentSpanId' in item)
+    assert root['name'] == 'workshop1.orchestrate'
+    assert child['parentSpanId'] == root['spanId']
+    assert child['traceId'] == root['traceId']
+    assert {'key': 'element_count', 'value': {'intValue': '12'}} in child['attributes']
+
+
+def test_unsampled_trace_is_not_exported():
+    """Sans échantillonnage, aucun span n'est enregistré"""
+    path = _export_file()
+    tracer = Tracer(sample_rate=1e-12, file_path=path)
+
+    with tracer.span('workshop1.orchestrate') as root:
+        with tracer.span('orchestrator.rag') as child:
+            assert not root.recording and not child.recording
+    tracer.exporter.shutdown()
+
+    assert os.path.getsize(path) == 0
+    os.remove(path)
+
+
+def test_export_from_forked_worker():
+    """Worker forké après l'import (python serve.py): ses traces sont exportées par son propre thread"""
+    if not hasattr(os, 'fork'):
+        return
+    path = _export_file()
+    tracer = Tracer(sample_rate=1.0, file_path=path)
+    with tracer.span('master.warmup'):
+        pass
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            with tracer.span('worker.request'):
+                pass
+            tracer.exporter.shutdown()
+        finally:
+            os._exit(tracer.exporter.dropped)
+    _, status = os.waitpid(pid, 0)
+    tracer.exporter.shutdown()
+
+    with open(path) as trace_file:
+        names = {
+            json.loads(line)['resourceSpans'][0]['scopeSpans'][0]['spans'][0]['name']
+            for line in trace_file.read().splitlines()
+        }
+    os.remove(path)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert names == {'master.warmup', 'worker.request'}, names
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS TRAÇAGE", globals()))
@@ -123,7 +123,60 @@ class UnifiedDBTester:
             suggestion_type='asset'
         )
         
-        return len(suggestions) > 0 and suggestions[0].confidence_score == 0.9
+        # Les résultats sont détachés de la session: sérialisables sans requête supplémentaire
+        return (len(suggestions) > 0 and
+                suggestions[0].confidence_score == 0.9 and
+                suggestions[0].to_dict()['mission_id'] == self.test_mission_id)
+    
+    def test_bulk_inserts(self):
+        """Test des insertions en lot (suggestions et mémoires)"""
+        suggestion_ids = unified_db.create_ai_suggestions_bulk([
+            {
+                'mission_id': self.test_mission_id,
+                'user_id': self.test_user_id,
+                'suggestion_type': 'bulk_asset',
+                'content': f'Actif suggéré {index}',
+                'confidence_score': 0.5 + index / 100
+            }
+            for index in range(30)
+        ])
+        
+        memory_ids = unified_db.store_agent_memories_bulk([
+            {
+                'mission_id': self.test_mission_id,
+                'user_id': self.test_user_id,
+                'agent_type': 'workshop1',
+                'memory_type': 'bulk_analysis',
+                'content': {'index': index}
+            }
+            for index in range(5)
+        ])
+        
+        suggestions = unified_db.get_ai_suggestions(
+            mission_id=self.test_mission_id,
+            suggestion_type='bulk_asset',
+            limit=50
+        )
+        
+        return len(suggestion_ids) == 30 and len(memory_ids) == 5 and len(suggestions) == 30
+    
+    def test_keyset_pagination(self):
+        """Test de la pagination par curseur des suggestions"""
+        seen = []
+        cursor = None
+        while True:
+            page = unified_db.get_ai_suggestions_page(
+                mission_id=self.test_mission_id,
+                suggestion_type='bulk_asset',
+                limit=7,
+                cursor=cursor
+            )
+            seen.extend(suggestion.id for suggestion in page['items'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        
+        return len(seen) == 30 and len(set(seen)) == 30
     
     def test_query_cache(self):
         """Test du cache de requêtes"""
@@ -212,6 +265,8 @@ class UnifiedDBTester:
         self.run_test("Création session AI", self.test_ai_session_creation)
         self.run_test("Stockage mémoire agent", self.test_agent_memory_storage)
         self.run_test("Suggestions AI", self.test_ai_suggestions)
+        self.run_test("Insertions en lot", self.test_bulk_inserts)
+        self.run_test("Pagination par curseur", self.test_keyset_pagination)
         self.run_test("Cache de requêtes", self.test_query_cache)
         self.run_test("Enregistrement métriques", self.test_metrics_recording)
         self.run_test("Cohérence des données", self.test_data_consistency)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+🧪 TEST JOURNAL DES INTERACTIONS
+Ajout incrémental, pagination par séquence, migration des tables existantes
+et attribution des séquences entre sauvegardes concurrentes
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+
+from script_tests import run_script_tests
+from services.agent_memory_service import AgentMemoryService, UserContext
+
+
+def _service(db_path: str) -> AgentMemoryService:
+    service = AgentMemoryService({'database': {'url': f"sqlite:///{db_path}"}})
+    service.redis_client = None
+    return service
+
+
+def _context(interactions) -> UserContext:
+    return UserContext(
+        user_id='u1', mission_id='m1', preferences={}, interaction_history=list(interactions),
+        learning_progress={}, last_activity=datetime(2025, 1, 1)
+    )
+
+
+def _sequences(page):
+    return [item['sequence'] for item in page['interactions']]
+
+
+def test_incremental_append_and_cursor_paging():
+    """Seules les nouvelles interactions sont journalisées; le curseur parcourt tout le journal"""
+    with tempfile.TemporaryDirectory() as directory:
+        service = _service(os.path.join(directory, 'memory.db'))
+        context = _context({'step': i} for i in range(3))
+        assert asyncio.run(service.store_user_context(context))
+
+        context.interaction_history += [{'step': 3}, {'step': 4}]
+        assert asyncio.run(service.store_user_context(context))
+        assert context.interaction_count == 5
+
+        first = asyncio.run(service.get_interaction_history('u1', 'm1', limit=2))
+        assert _sequences(first) == [4, 3] and first['next_cursor'] == 3
+        second = asyncio.run(service.get_interaction_history('u1', 'm1', before_sequence=3, limit=2))
+        assert _sequences(second) == [2, 1]
+        last = asyncio.run(service.get_interaction_history('u1', 'm1', before_sequence=1, limit=2))
+        assert _sequences(last) == [0] and last['next_cursor'] is None
+        assert last['interactions'][0]['interaction'] == {'step': 0}
+
+
+def test_concurrent_saves_get_distinct_sequences():
+    """Deux processus qui chargent le même contexte puis sauvegardent: aucune séquence dupliquée"""
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'memory.db')
+        first, second = _service(db_path), _service(db_path)
+        assert asyncio.run(first.store_user_context(_context([{'from': 'a'}, {'from': 'a'}])))
+        assert asyncio.run(second.store_user_context(_context([{'from': 'b'}])))
+
+        page = asyncio.run(first.get_interaction_history('u1', 'm1'))
+        assert _sequences(page) == [2, 1, 0]
+        assert page['interactions'][0]['interaction'] == {'from': 'b'}
+
+
+def test_sequence_conflict_is_retried():
+    """Séquence attribuée entre la lecture et l'écriture: la contrainte unique déclenche un nouvel essai"""
+    with tempfile.TemporaryDirectory() as directory:
+        service = _service(os.path.join(directory, 'memory.db'))
+        assert asyncio.run(service.store_user_context(_context([{'step': 0}])))
+
+        # Premier essai avec la séquence lue avant l'écriture concurrente
+        next_sequence = service._next_interaction_sequence
+        stale_reads = [0]
+        service._next_interaction_sequence = lambda *args: stale_reads.pop() if stale_reads else next_sequence(*args)
+        context = _context([{'step': 'late'}])
+        assert asyncio.run(service.store_user_context(context))
+        assert context.interaction_count == 2
+        assert _sequences(asyncio.run(service.get_interaction_history('u1', 'm1'))) == [1, 0]
+
+
+def test_existing_tables_are_migrated():
+    """Base antérieure: colonne interaction_count ajoutée, journal créé avec son index unique"""
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'memory.db')
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript("""
+                CREATE TABLE user_context (
+                    id VARCHAR PRIMARY KEY, user_id VARCHAR NOT NULL, mission_id VARCHAR NOT NULL,
+                    preferences TEXT NOT NULL, interaction_history TEXT NOT NULL,
+                    learning_progress TEXT NOT NULL, last_activity DATETIME NOT NULL,
+                    session_count INTEGER, total_time_spent INTEGER
+                );
+                INSERT INTO user_context VALUES
+                    ('u1_m1', 'u1', 'm1', '{}', '[{"step": 0}, {"step": 1}]', '{}', '2025-01-01 00:00:00', 1, 0);
+            """)
+
+        service = _service(db_path)
+        with sqlite3.connect(db_path) as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(user_context)")}
+            indexes = {row[1]: row[2] for row in conn.execute("PRAGMA index_list(user_interaction_log)")}
+        assert 'interaction_count' in columns
+        assert indexes.get('uq_user_interaction_log_sequence') == 1
+
+        # Ligne antérieure au journal: tout l'historique est migré à la première sauvegarde
+        context = asyncio.run(service.retrieve_user_context('u1', 'm1'))
+        assert asyncio.run(service.store_user_context(context))
+        assert _sequences(asyncio.run(service.get_interaction_history('u1', 'm1'))) == [1, 0]
+
+
+if __name__ == "__main__":
+    sys.exit(run_script_tests("🧪 TESTS JOURNAL DES INTERACTIONS", globals()))
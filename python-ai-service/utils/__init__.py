@@ -0,0 +1,4 @@
+"""
+🧰 UTILITAIRES PARTAGÉS
+Modules sans dépendance vers les services ni les modèles (importables par toutes les couches)
+"""
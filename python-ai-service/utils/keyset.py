@@ -0,0 +1,34 @@
+"""
+🔢 CLÉ DE TRI DES PAGINATIONS PAR CLÉ (KEYSET)
+Expressions (score, created_at, id) où les valeurs NULL sont classées après toutes les autres,
+partagées par les index composites des modèles et les requêtes paginées
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Float, func, literal
+
+# Valeurs de substitution des NULL: inférieures à tout score (0..1) et à toute date de création
+NULL_SCORE = -1.0
+NULL_CREATED_AT = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def keyset_key(score, created_at, row_id) -> tuple:
+    """
+    Clé de tri (coalesce(score, -1), coalesce(created_at, epoch), id)
+    Les substituts sont rendus en littéraux pour que PostgreSQL reconnaisse
+    les expressions des index composites
+    """
+    return (
+        func.coalesce(score, literal(NULL_SCORE, Float, literal_execute=True)),
+        func.coalesce(created_at, literal(NULL_CREATED_AT, DateTime(timezone=True), literal_execute=True)),
+        row_id
+    )
+
+
+def keyset_order_by(score, created_at, row_id) -> list:
+    """Tri décroissant sur la clé: les NULL arrivent en fin de liste"""
+    return [column.desc() for column in keyset_key(score, created_at, row_id)]
+
+
+__all__ = ['NULL_SCORE', 'NULL_CREATED_AT', 'keyset_key', 'keyset_order_by']
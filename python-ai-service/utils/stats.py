@@ -0,0 +1,66 @@
+"""
+📐 AGRÉGATS STATISTIQUES
+Compteur, somme, extrêmes et histogramme logarithmique d'une série de valeurs
+(métriques AI agrégées, instrumentation du pool de connexions)
+"""
+
+import math
+from typing import Any, Dict
+
+
+class MetricBucket:
+    """Agrégat d'une série de métriques sur un intervalle"""
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum', 'histogram')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        # Histogramme logarithmique creux: exposant base 2 -> nombre de valeurs
+        self.histogram: Dict[int, int] = {}
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+        exponent = self.bucket_exponent(value)
+        self.histogram[exponent] = self.histogram.get(exponent, 0) + 1
+
+    @staticmethod
+    def bucket_exponent(value: float) -> int:
+        """Exposant du seau: la valeur est <= 2**exposant (0 et négatifs regroupés)"""
+        if value <= 0:
+            return -1075  # sous le plus petit flottant positif
+        return math.ceil(math.log2(value))
+
+    def quantile(self, q: float) -> float:
+        """Quantile approché (borne supérieure du seau)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for exponent in sorted(self.histogram):
+            seen += self.histogram[exponent]
+            if seen >= rank:
+                return min(self.maximum, 2.0 ** exponent) if exponent > -1075 else 0.0
+        return self.maximum
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "histogram_log2": {str(k): v for k, v in sorted(self.histogram.items())}
+        }
+
+
+__all__ = ['MetricBucket']